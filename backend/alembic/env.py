@@ -1,5 +1,6 @@
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+import logging
 import os
 import sys
 from logging.config import fileConfig
@@ -81,10 +82,36 @@ def run_migrations_online() -> None:
             connection=connection, target_metadata=target_metadata
         )
 
+        if _already_at_destination():
+            logging.getLogger("alembic.env").info(
+                "Database already at requested revision; skipping migrations"
+            )
+            return
+
         with context.begin_transaction():
             context.run_migrations()
 
 
+def _already_at_destination() -> bool:
+    """Fast path: the database is already at the requested revision(s).
+
+    Most boots run ``alembic upgrade heads`` against an up-to-date schema;
+    skip the migration transaction and revision walk in that case. Commands
+    without a concrete destination (``current``, ``base``, relative steps)
+    always take the normal path.
+    """
+    try:
+        destination = context.get_revision_argument()
+    except Exception:
+        return False
+    if not destination:
+        return False
+    if isinstance(destination, str):
+        destination = (destination,)
+    current = context.get_context().get_current_heads()
+    return bool(current) and set(current) == set(destination)
+
+
 if context.is_offline_mode():
     run_migrations_offline()
 else:
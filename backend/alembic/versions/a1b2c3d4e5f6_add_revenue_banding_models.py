@@ -18,6 +18,16 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _execute_ddl_batch(statements: Sequence[str]) -> None:
+    """Submit a group of DDL statements in a single round trip where supported."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(";\n".join(statements))
+    else:
+        # sqlite3 only accepts one statement per execute() call
+        for statement in statements:
+            op.execute(statement)
+
+
 def upgrade() -> None:
     """Upgrade schema: create teams, team_revenue_history, revenue_band_configs."""
     # teams
@@ -32,8 +42,6 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('name', name='uq_teams_name'),
     )
-    op.create_index(op.f('ix_teams_id'), 'teams', ['id'], unique=False)
-    op.create_index(op.f('ix_teams_name'), 'teams', ['name'], unique=False)
 
     # revenue_band_configs
     op.create_table(
@@ -46,8 +54,6 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('name', name='uq_revenue_band_configs_name'),
     )
-    op.create_index(op.f('ix_revenue_band_configs_id'), 'revenue_band_configs', ['id'], unique=False)
-    op.create_index(op.f('ix_revenue_band_configs_name'), 'revenue_band_configs', ['name'], unique=False)
 
     # team_revenue_history
     op.create_table(
@@ -64,24 +70,22 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('team_id', 'fiscal_year', name='uq_team_year'),
     )
-    op.create_index(op.f('ix_team_revenue_history_id'), 'team_revenue_history', ['id'], unique=False)
-    op.create_index('ix_trh_team_year', 'team_revenue_history', ['team_id', 'fiscal_year'], unique=False)
-    op.create_index('ix_trh_team_id', 'team_revenue_history', ['team_id'], unique=False)
+
+    # Indexes for all three tables are shipped together rather than one
+    # round trip per CREATE INDEX. Primary keys are already indexed, and
+    # ix_trh_team_year serves team_id-only lookups as its leftmost prefix.
+    _execute_ddl_batch([
+        "CREATE INDEX ix_teams_name ON teams (name)",
+        "CREATE INDEX ix_revenue_band_configs_name ON revenue_band_configs (name)",
+        "CREATE INDEX ix_trh_team_year ON team_revenue_history (team_id, fiscal_year)",
+    ])
 
 
 def downgrade() -> None:
     """Downgrade schema: drop revenue banding tables."""
-    op.drop_index('ix_trh_team_id', table_name='team_revenue_history')
-    op.drop_index('ix_trh_team_year', table_name='team_revenue_history')
-    op.drop_index(op.f('ix_team_revenue_history_id'), table_name='team_revenue_history')
+    # Dropping a table drops its indexes along with it.
     op.drop_table('team_revenue_history')
-
-    op.drop_index(op.f('ix_revenue_band_configs_name'), table_name='revenue_band_configs')
-    op.drop_index(op.f('ix_revenue_band_configs_id'), table_name='revenue_band_configs')
     op.drop_table('revenue_band_configs')
-
-    op.drop_index(op.f('ix_teams_name'), table_name='teams')
-    op.drop_index(op.f('ix_teams_id'), table_name='teams')
     op.drop_table('teams')
 
 
@@ -7,7 +7,8 @@ Create Date: 2025-01-14 12:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable, DropTable
 
 
 # revision identifiers, used by Alembic.
@@ -16,24 +17,37 @@ down_revision = 'ee71111c2f79'
 branch_labels = None
 depends_on = None
 
+# Fixed-width identifiers: native 16-byte uuid on PostgreSQL, VARCHAR(36)
+# elsewhere. Keeps primary/foreign key indexes compact.
+GUID = sa.String(length=36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
 
-def upgrade() -> None:
-    # Create tenants table
-    op.create_table('tenants',
-    sa.Column('id', sa.String(), nullable=False),
+# Binary JSONB on PostgreSQL (no reparse on read, GIN-indexable); plain JSON
+# elsewhere.
+JSONVariant = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def _build_metadata(is_postgresql: bool) -> sa.MetaData:
+    """Describe the platform tables on a private MetaData for this revision.
+
+    Primary keys are indexed implicitly, so no separate ix_<table>_id
+    indexes are declared. PostgreSQL does not index foreign keys on its own,
+    so every FK column used in joins or cascades gets one.
+    """
+    metadata = sa.MetaData()
+
+    sa.Table('tenants', metadata,
+    sa.Column('id', GUID, nullable=False),
     sa.Column('name', sa.String(), nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.Column('updated_at', sa.DateTime(), nullable=True),
     sa.Column('is_active', sa.Boolean(), nullable=False),
-    sa.Column('tenant_metadata', JSON(), nullable=False),
+    sa.Column('tenant_metadata', JSONVariant, nullable=False),
     sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_tenants_id'), 'tenants', ['id'], unique=False)
 
-    # Create users table
-    op.create_table('users',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
+    sa.Table('users', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
     sa.Column('email', sa.String(), nullable=False),
     sa.Column('display_name', sa.String(), nullable=True),
     sa.Column('role', sa.String(), nullable=False),
@@ -41,137 +55,137 @@ def upgrade() -> None:
     sa.Column('updated_at', sa.DateTime(), nullable=True),
     sa.Column('is_active', sa.Boolean(), nullable=False),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_users_email', 'email'),
+    sa.Index('ix_users_tenant_id', 'tenant_id')
     )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'], unique=False)
-
-    # Create input_catalog table
-    op.create_table('input_catalog',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
+
+    sa.Table('input_catalog', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
     sa.Column('key', sa.String(), nullable=False),
     sa.Column('label', sa.String(), nullable=False),
     sa.Column('dtype', sa.String(), nullable=False),
     sa.Column('required', sa.Boolean(), nullable=False),
-    sa.Column('default_value', JSON(), nullable=True),
-    sa.Column('validation', JSON(), nullable=False),
+    sa.Column('default_value', JSONVariant, nullable=True),
+    sa.Column('validation', JSONVariant, nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_input_catalog_tenant_id', 'tenant_id')
     )
-    op.create_index(op.f('ix_input_catalog_id'), 'input_catalog', ['id'], unique=False)
-    op.create_index(op.f('ix_input_catalog_tenant_id'), 'input_catalog', ['tenant_id'], unique=False)
 
-    # Create bonus_plans table
-    op.create_table('bonus_plans',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
+    sa.Table('bonus_plans', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
     sa.Column('name', sa.String(), nullable=False),
     sa.Column('version', sa.Integer(), nullable=False),
     sa.Column('status', sa.String(), nullable=False),
     sa.Column('effective_from', sa.DateTime(), nullable=True),
     sa.Column('effective_to', sa.DateTime(), nullable=True),
     sa.Column('notes', sa.Text(), nullable=True),
-    sa.Column('plan_metadata', JSON(), nullable=False),
-    sa.Column('created_by', sa.String(), nullable=True),
+    sa.Column('plan_metadata', JSONVariant, nullable=False),
+    sa.Column('created_by', GUID, nullable=True),
     sa.Column('created_at', sa.DateTime(), nullable=False),
-    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_by', GUID, nullable=True),
     sa.Column('locked_at', sa.DateTime(), nullable=True),
     sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
     sa.ForeignKeyConstraint(['locked_by'], ['users.id'], ),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_bonus_plans_tenant_id', 'tenant_id'),
+    sa.Index('ix_bonus_plans_created_by', 'created_by'),
+    sa.Index('ix_bonus_plans_locked_by', 'locked_by'),
+    # Partial index: plan listings only ever page through non-archived plans
+    sa.Index('ix_bonus_plans_live', 'tenant_id', 'created_at',
+             postgresql_where=sa.text("status <> 'archived'"),
+             sqlite_where=sa.text("status <> 'archived'"))
     )
-    op.create_index(op.f('ix_bonus_plans_id'), 'bonus_plans', ['id'], unique=False)
-    op.create_index(op.f('ix_bonus_plans_tenant_id'), 'bonus_plans', ['tenant_id'], unique=False)
-
-    # Create platform_uploads table
-    op.create_table('platform_uploads',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
-    sa.Column('created_by', sa.String(), nullable=True),
+
+    sa.Table('platform_uploads', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
+    sa.Column('created_by', GUID, nullable=True),
     sa.Column('filename', sa.String(), nullable=False),
     sa.Column('status', sa.String(), nullable=False),
     sa.Column('file_size', sa.Integer(), nullable=True),
-    sa.Column('upload_metadata', JSON(), nullable=False),
+    sa.Column('upload_metadata', JSONVariant, nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_platform_uploads_tenant_id', 'tenant_id'),
+    sa.Index('ix_platform_uploads_created_by', 'created_by')
     )
-    op.create_index(op.f('ix_platform_uploads_id'), 'platform_uploads', ['id'], unique=False)
-    op.create_index(op.f('ix_platform_uploads_tenant_id'), 'platform_uploads', ['tenant_id'], unique=False)
-
-    # Create plan_inputs table
-    op.create_table('plan_inputs',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('plan_id', sa.String(), nullable=False),
-    sa.Column('input_id', sa.String(), nullable=False),
+
+    sa.Table('plan_inputs', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('plan_id', GUID, nullable=False),
+    sa.Column('input_id', GUID, nullable=False),
     sa.Column('required', sa.Boolean(), nullable=False),
-    sa.Column('source_mapping', JSON(), nullable=False),
+    sa.Column('source_mapping', JSONVariant, nullable=False),
     sa.ForeignKeyConstraint(['input_id'], ['input_catalog.id'], ),
     sa.ForeignKeyConstraint(['plan_id'], ['bonus_plans.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_plan_inputs_plan_id', 'plan_id'),
+    sa.Index('ix_plan_inputs_input_id', 'input_id')
     )
-    op.create_index(op.f('ix_plan_inputs_id'), 'plan_inputs', ['id'], unique=False)
-    op.create_index(op.f('ix_plan_inputs_plan_id'), 'plan_inputs', ['plan_id'], unique=False)
 
-    # Create plan_steps table
-    op.create_table('plan_steps',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('plan_id', sa.String(), nullable=False),
+    sa.Table('plan_steps', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('plan_id', GUID, nullable=False),
     sa.Column('step_order', sa.Integer(), nullable=False),
     sa.Column('name', sa.String(), nullable=False),
     sa.Column('expr', sa.Text(), nullable=False),
     sa.Column('condition_expr', sa.Text(), nullable=True),
-    sa.Column('outputs', JSON(), nullable=False),
+    sa.Column('outputs', JSONVariant, nullable=False),
     sa.Column('notes', sa.Text(), nullable=True),
     sa.ForeignKeyConstraint(['plan_id'], ['bonus_plans.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_plan_steps_plan_id', 'plan_id')
     )
-    op.create_index(op.f('ix_plan_steps_id'), 'plan_steps', ['id'], unique=False)
-    op.create_index(op.f('ix_plan_steps_plan_id'), 'plan_steps', ['plan_id'], unique=False)
 
-    # Create bonus_pools table
-    op.create_table('bonus_pools',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('plan_id', sa.String(), nullable=False),
+    sa.Table('bonus_pools', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('plan_id', GUID, nullable=False),
     sa.Column('currency', sa.String(length=3), nullable=False),
     sa.Column('amount', sa.Numeric(precision=38, scale=10), nullable=False),
-    sa.Column('allocation_rules', JSON(), nullable=False),
+    sa.Column('allocation_rules', JSONVariant, nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.ForeignKeyConstraint(['plan_id'], ['bonus_plans.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_bonus_pools_plan_id', 'plan_id')
     )
-    op.create_index(op.f('ix_bonus_pools_id'), 'bonus_pools', ['id'], unique=False)
-    op.create_index(op.f('ix_bonus_pools_plan_id'), 'bonus_pools', ['plan_id'], unique=False)
-
-    # Create employee_rows table
-    op.create_table('employee_rows',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
-    sa.Column('upload_id', sa.String(), nullable=False),
+
+    # employee_rows is a staging table: rows are re-derivable from the upload,
+    # so on PostgreSQL it is UNLOGGED and skips WAL during bulk ingest. A crash
+    # truncates it and affected uploads must be re-submitted. platform_uploads
+    # stays logged because plan_runs (a permanent table) references it.
+    employee_rows = sa.Table('employee_rows', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
+    sa.Column('upload_id', GUID, nullable=False),
     sa.Column('employee_ref', sa.String(), nullable=False),
-    sa.Column('raw', JSON(), nullable=False),
+    sa.Column('raw', JSONVariant, nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
     sa.ForeignKeyConstraint(['upload_id'], ['platform_uploads.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_employee_rows_tenant_id', 'tenant_id'),
+    sa.Index('ix_employee_rows_upload_id', 'upload_id'),
+    prefixes=['UNLOGGED'] if is_postgresql else []
     )
-    op.create_index(op.f('ix_employee_rows_id'), 'employee_rows', ['id'], unique=False)
-    op.create_index(op.f('ix_employee_rows_tenant_id'), 'employee_rows', ['tenant_id'], unique=False)
-    op.create_index(op.f('ix_employee_rows_upload_id'), 'employee_rows', ['upload_id'], unique=False)
-
-    # Create plan_runs table
-    op.create_table('plan_runs',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
-    sa.Column('plan_id', sa.String(), nullable=False),
-    sa.Column('upload_id', sa.String(), nullable=True),
+    if is_postgresql:
+        # Containment queries such as raw @> '{"dept": "X"}' use this index
+        sa.Index('ix_employee_rows_raw_gin', employee_rows.c.raw, postgresql_using='gin')
+
+    sa.Table('plan_runs', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('tenant_id', GUID, nullable=False),
+    sa.Column('plan_id', GUID, nullable=False),
+    sa.Column('upload_id', GUID, nullable=True),
     sa.Column('scenario_name', sa.String(), nullable=True),
-    sa.Column('approvals_state', JSON(), nullable=False),
+    sa.Column('approvals_state', JSONVariant, nullable=False),
     sa.Column('snapshot_hash', sa.String(), nullable=False),
     sa.Column('started_at', sa.DateTime(), nullable=False),
     sa.Column('finished_at', sa.DateTime(), nullable=True),
@@ -179,65 +193,96 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['plan_id'], ['bonus_plans.id'], ),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
     sa.ForeignKeyConstraint(['upload_id'], ['platform_uploads.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_plan_runs_plan_id', 'plan_id'),
+    sa.Index('ix_plan_runs_tenant_id', 'tenant_id'),
+    sa.Index('ix_plan_runs_upload_id', 'upload_id'),
+    # Partial indexes for the dashboard/reporting status filters
+    sa.Index('ix_plan_runs_active', 'tenant_id', 'started_at',
+             postgresql_where=sa.text("status = 'running'"),
+             sqlite_where=sa.text("status = 'running'")),
+    sa.Index('ix_plan_runs_completed', 'tenant_id', 'finished_at',
+             postgresql_where=sa.text("status = 'completed'"),
+             sqlite_where=sa.text("status = 'completed'"))
     )
-    op.create_index(op.f('ix_plan_runs_id'), 'plan_runs', ['id'], unique=False)
-    op.create_index(op.f('ix_plan_runs_plan_id'), 'plan_runs', ['plan_id'], unique=False)
-    op.create_index(op.f('ix_plan_runs_tenant_id'), 'plan_runs', ['tenant_id'], unique=False)
 
-    # Create audit_events table
-    op.create_table('audit_events',
+    sa.Table('audit_events', metadata,
     sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('tenant_id', sa.String(), nullable=False),
-    sa.Column('actor_user_id', sa.String(), nullable=True),
+    sa.Column('tenant_id', GUID, nullable=False),
+    sa.Column('actor_user_id', GUID, nullable=True),
     sa.Column('action', sa.String(), nullable=False),
     sa.Column('entity', sa.String(), nullable=False),
     sa.Column('entity_id', sa.String(), nullable=False),
-    sa.Column('before', JSON(), nullable=True),
-    sa.Column('after', JSON(), nullable=True),
+    sa.Column('before', JSONVariant, nullable=True),
+    sa.Column('after', JSONVariant, nullable=True),
     sa.Column('at', sa.DateTime(), nullable=False),
     sa.Column('signature', sa.String(), nullable=True),
     sa.ForeignKeyConstraint(['actor_user_id'], ['users.id'], ),
     sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    sa.Index('ix_audit_events_tenant_id', 'tenant_id'),
+    sa.Index('ix_audit_events_actor_user_id', 'actor_user_id')
     )
-    op.create_index(op.f('ix_audit_events_tenant_id'), 'audit_events', ['tenant_id'], unique=False)
 
-    # Create run_step_results table
-    op.create_table('run_step_results',
-    sa.Column('id', sa.String(), nullable=False),
-    sa.Column('run_id', sa.String(), nullable=False),
+    sa.Table('run_step_results', metadata,
+    sa.Column('id', GUID, nullable=False),
+    sa.Column('run_id', GUID, nullable=False),
     sa.Column('employee_ref', sa.String(), nullable=False),
     sa.Column('step_name', sa.String(), nullable=False),
-    sa.Column('value', JSON(), nullable=False),
+    sa.Column('value', JSONVariant, nullable=False),
     sa.Column('created_at', sa.DateTime(), nullable=False),
     sa.ForeignKeyConstraint(['run_id'], ['plan_runs.id'], ),
-    sa.PrimaryKeyConstraint('id')
+    sa.PrimaryKeyConstraint('id'),
+    # Covering index: per-run reports read employee_ref/step_name straight from
+    # the index (PG11+ INCLUDE); other dialects ignore the option
+    sa.Index('ix_run_step_results_run_id', 'run_id',
+             postgresql_include=['employee_ref', 'step_name'])
     )
-    op.create_index(op.f('ix_run_step_results_id'), 'run_step_results', ['id'], unique=False)
-    op.create_index(op.f('ix_run_step_results_run_id'), 'run_step_results', ['run_id'], unique=False)
 
-    # Create run_totals table
-    op.create_table('run_totals',
-    sa.Column('run_id', sa.String(), nullable=False),
-    sa.Column('totals', JSON(), nullable=False),
+    sa.Table('run_totals', metadata,
+    sa.Column('run_id', GUID, nullable=False),
+    sa.Column('totals', JSONVariant, nullable=False),
     sa.ForeignKeyConstraint(['run_id'], ['plan_runs.id'], ),
     sa.PrimaryKeyConstraint('run_id')
     )
 
+    return metadata
+
+
+def _execute_ddl_batch(statements: list) -> None:
+    """Submit compiled DDL in a single round trip where supported."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(";\n".join(statements))
+    else:
+        # sqlite3 only accepts one statement per execute() call
+        for statement in statements:
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    # All tables and indexes are compiled from one dependency-sorted MetaData
+    # and sent together, instead of one op.create_table/op.create_index call
+    # (and round trip) each. Compiling to strings rather than calling
+    # metadata.create_all() keeps `alembic upgrade --sql` working.
+    dialect = op.get_context().dialect
+    metadata = _build_metadata(dialect.name == 'postgresql')
+
+    statements = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+    for table in metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)).strip())
+
+    _execute_ddl_batch(statements)
+
 
 def downgrade() -> None:
-    # Drop tables in reverse order to handle foreign key constraints
-    op.drop_table('run_totals')
-    op.drop_table('run_step_results')
-    op.drop_table('audit_events')
-    op.drop_table('plan_runs')
-    op.drop_table('employee_rows')
-    op.drop_table('bonus_pools')
-    op.drop_table('plan_steps')
-    op.drop_table('plan_inputs')
-    op.drop_table('platform_uploads')
-    op.drop_table('bonus_plans')
-    op.drop_table('input_catalog')
-    op.drop_table('users')
-    op.drop_table('tenants')
\ No newline at end of file
+    # Drop tables in reverse dependency order to handle foreign key
+    # constraints; indexes go with their tables
+    dialect = op.get_context().dialect
+    metadata = _build_metadata(dialect.name == 'postgresql')
+    _execute_ddl_batch([
+        str(DropTable(table).compile(dialect=dialect)).strip()
+        for table in reversed(metadata.sorted_tables)
+    ])
@@ -0,0 +1,97 @@
+"""Denormalize tenant_id onto plan and run child tables for RLS
+
+Revision ID: h3c4d5e6f7a8
+Revises: g2b3c4d5e6f7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'h3c4d5e6f7a8'
+down_revision = 'g2b3c4d5e6f7'
+branch_labels = None
+depends_on = None
+
+GUID = sa.String(length=36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
+
+# (child table, parent table, child column referencing the parent's id)
+CHILD_TABLES = [
+    ('plan_inputs', 'bonus_plans', 'plan_id'),
+    ('plan_steps', 'bonus_plans', 'plan_id'),
+    ('bonus_pools', 'bonus_plans', 'plan_id'),
+    ('run_step_results', 'plan_runs', 'run_id'),
+]
+
+TENANT_PREDICATE = "tenant_id = current_tenant()"
+
+
+def _create_index_online(index_name: str, table: str, columns: list) -> None:
+    """Build an index without blocking writes on PostgreSQL.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction, so it is issued
+    from an autocommit block, which commits the migration's transaction so
+    far; call it only after all transactional work. Other dialects and --sql
+    runs use a plain index.
+    """
+    context = op.get_context()
+    if context.dialect.name == 'postgresql' and not context.as_sql:
+        with context.autocommit_block():
+            op.create_index(index_name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index(index_name, table, columns, unique=False)
+
+
+def upgrade() -> None:
+    """Copy tenant_id down from the parent row and switch RLS to an equality check."""
+    for table, parent, parent_fk in CHILD_TABLES:
+        op.add_column(table, sa.Column('tenant_id', GUID, nullable=True))
+        op.execute(
+            f"UPDATE {table} SET tenant_id = "
+            f"(SELECT {parent}.tenant_id FROM {parent} WHERE {parent}.id = {table}.{parent_fk})"
+        )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('tenant_id', existing_type=GUID, nullable=False)
+            batch_op.create_foreign_key(f'fk_{table}_tenant_id', 'tenants', ['tenant_id'], ['id'])
+
+    if op.get_context().dialect.name == 'postgresql':
+        # Replace the per-row subquery against the parent table with a plain
+        # equality the planner can push into an index scan
+        statements = []
+        for table, _, _ in CHILD_TABLES:
+            statements.append(f"DROP POLICY IF EXISTS tenant_isolation ON {table}")
+            statements.append(
+                f"CREATE POLICY tenant_isolation ON {table} FOR ALL USING ({TENANT_PREDICATE})"
+            )
+        op.execute(";\n".join(statements))
+
+    # Indexes come last: on PostgreSQL the autocommit block commits the
+    # column, foreign key and policy work above, so nothing transactional
+    # may follow it. These tables already hold data (run_step_results grows
+    # with every run), so avoid holding a write lock while the indexes build;
+    # IF NOT EXISTS lets a rerun pick up after a failed build.
+    for table, _, _ in CHILD_TABLES:
+        _create_index_online(f'ix_{table}_tenant_id', table, ['tenant_id'])
+
+
+def downgrade() -> None:
+    """Restore the parent-subquery RLS policies and drop the tenant_id columns."""
+    if op.get_context().dialect.name == 'postgresql':
+        statements = []
+        for table, parent, parent_fk in CHILD_TABLES:
+            statements.append(f"DROP POLICY IF EXISTS tenant_isolation ON {table}")
+            statements.append(
+                f"CREATE POLICY tenant_isolation ON {table} FOR ALL "
+                f"USING ({parent_fk} IN (SELECT id FROM {parent} WHERE {TENANT_PREDICATE}))"
+            )
+        op.execute(";\n".join(statements))
+
+    for table, _, _ in reversed(CHILD_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_tenant_id')
+            batch_op.drop_constraint(f'fk_{table}_tenant_id', type_='foreignkey')
+            batch_op.drop_column('tenant_id')
@@ -0,0 +1,80 @@
+"""Audit bonus_plans inserts and updates with statement-level triggers
+
+Revision ID: i4d5e6f7a8b9
+Revises: h3c4d5e6f7a8
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'i4d5e6f7a8b9'
+down_revision = 'h3c4d5e6f7a8'
+branch_labels = None
+depends_on = None
+
+
+# One INSERT ... SELECT per statement over the transition tables, instead of
+# one audit row written from application code per mutation. The acting user
+# comes from the transaction-local app.current_user_id setting. An update that
+# moves a plan into 'locked' is recorded as plan.lock, any other as plan.update.
+AUDIT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION audit_bonus_plan_changes() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO audit_events (tenant_id, actor_user_id, action, entity, entity_id, "before", "after", "at")
+            SELECT n.tenant_id,
+                   NULLIF(current_setting('app.current_user_id', true), '')::uuid,
+                   'plan.create', 'bonus_plan', n.id::text, NULL,
+                   jsonb_build_object('name', n.name, 'version', n.version, 'status', n.status),
+                   now()
+            FROM new_rows n;
+        ELSE
+            INSERT INTO audit_events (tenant_id, actor_user_id, action, entity, entity_id, "before", "after", "at")
+            SELECT n.tenant_id,
+                   NULLIF(current_setting('app.current_user_id', true), '')::uuid,
+                   CASE WHEN n.status = 'locked' AND o.status IS DISTINCT FROM 'locked'
+                        THEN 'plan.lock' ELSE 'plan.update' END,
+                   'bonus_plan', n.id::text,
+                   jsonb_build_object('name', o.name, 'status', o.status,
+                                      'effective_from', o.effective_from, 'effective_to', o.effective_to,
+                                      'notes', o.notes, 'plan_metadata', o.plan_metadata,
+                                      'locked_by', o.locked_by),
+                   jsonb_build_object('name', n.name, 'status', n.status,
+                                      'effective_from', n.effective_from, 'effective_to', n.effective_to,
+                                      'notes', n.notes, 'plan_metadata', n.plan_metadata,
+                                      'locked_by', n.locked_by),
+                   now()
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Create the audit trigger function and attach it to bonus_plans."""
+    # Transition tables are PostgreSQL-only; SQLite keeps application-side audit
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(";\n".join([
+            AUDIT_FUNCTION,
+            "CREATE TRIGGER bonus_plans_audit_insert AFTER INSERT ON bonus_plans "
+            "REFERENCING NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION audit_bonus_plan_changes()",
+            "CREATE TRIGGER bonus_plans_audit_update AFTER UPDATE ON bonus_plans "
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION audit_bonus_plan_changes()",
+        ]))
+
+
+def downgrade() -> None:
+    """Drop the bonus_plans audit triggers and their function."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(";\n".join([
+            "DROP TRIGGER IF EXISTS bonus_plans_audit_update ON bonus_plans",
+            "DROP TRIGGER IF EXISTS bonus_plans_audit_insert ON bonus_plans",
+            "DROP FUNCTION IF EXISTS audit_bonus_plan_changes()",
+        ]))
@@ -0,0 +1,38 @@
+"""Store bonus_pools.amount as integer micro-units
+
+Revision ID: j5e6f7a8b9c0
+Revises: i4d5e6f7a8b9
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'j5e6f7a8b9c0'
+down_revision = 'i4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+# Pool amounts are held as millionths of the pool's currency unit: a plain
+# 8-byte integer instead of variable-length NUMERIC, so sums are integer adds
+MICROS_PER_UNIT = 1_000_000
+
+
+def upgrade() -> None:
+    """Replace amount NUMERIC(38,10) with amount_micros BIGINT, converting existing rows."""
+    op.add_column('bonus_pools', sa.Column('amount_micros', sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE bonus_pools SET amount_micros = ROUND(amount * {MICROS_PER_UNIT})")
+    with op.batch_alter_table('bonus_pools') as batch_op:
+        batch_op.alter_column('amount_micros', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_column('amount')
+
+
+def downgrade() -> None:
+    """Restore amount NUMERIC(38,10) from amount_micros."""
+    op.add_column('bonus_pools', sa.Column('amount', sa.Numeric(precision=38, scale=10), nullable=True))
+    op.execute(f"UPDATE bonus_pools SET amount = amount_micros / {MICROS_PER_UNIT}.0")
+    with op.batch_alter_table('bonus_pools') as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Numeric(precision=38, scale=10), nullable=False)
+        batch_op.drop_column('amount_micros')
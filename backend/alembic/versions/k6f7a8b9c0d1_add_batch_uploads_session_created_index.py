@@ -0,0 +1,30 @@
+"""Index batch_uploads on (session_id, created_at DESC)
+
+Revision ID: k6f7a8b9c0d1
+Revises: j5e6f7a8b9c0
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'k6f7a8b9c0d1'
+down_revision = 'j5e6f7a8b9c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the composite index behind the newest-first per-session upload listing."""
+    op.create_index(
+        'ix_batch_uploads_session_created',
+        'batch_uploads',
+        ['session_id', sa.text('created_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-session upload listing index."""
+    op.drop_index('ix_batch_uploads_session_created', table_name='batch_uploads')
@@ -0,0 +1,25 @@
+"""Index sessions.expires_at
+
+Revision ID: l7a8b9c0d1e2
+Revises: k6f7a8b9c0d1
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'l7a8b9c0d1e2'
+down_revision = 'k6f7a8b9c0d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the index behind expired-session cleanup and active-session lookups."""
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Drop the sessions expiry index."""
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
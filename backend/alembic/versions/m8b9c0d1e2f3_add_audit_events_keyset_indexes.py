@@ -0,0 +1,37 @@
+"""Index audit_events for keyset pagination by entity and by actor
+
+Revision ID: m8b9c0d1e2f3
+Revises: l7a8b9c0d1e2
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'm8b9c0d1e2f3'
+down_revision = 'l7a8b9c0d1e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the composite indexes behind newest-first audit trail pages."""
+    # t5c6d7e8f9a0 recreates both on the partitioned audit_events table
+    op.create_index(
+        'ix_audit_events_entity_at',
+        'audit_events',
+        ['tenant_id', 'entity', 'entity_id', sa.text('at DESC'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_audit_events_actor_at',
+        'audit_events',
+        ['tenant_id', 'actor_user_id', sa.text('at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Drop the audit trail pagination indexes."""
+    op.drop_index('ix_audit_events_actor_at', table_name='audit_events')
+    op.drop_index('ix_audit_events_entity_at', table_name='audit_events')
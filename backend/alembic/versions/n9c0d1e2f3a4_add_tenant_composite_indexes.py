@@ -0,0 +1,36 @@
+"""Add composite tenant-scoped indexes for the platform DAL lookups
+
+Revision ID: n9c0d1e2f3a4
+Revises: m8b9c0d1e2f3
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'n9c0d1e2f3a4'
+down_revision = 'm8b9c0d1e2f3'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns); every DAL lookup filters on tenant_id plus these
+INDEXES = [
+    ('ix_users_tenant_email', 'users', ['tenant_id', 'email']),
+    ('ix_input_catalog_tenant_key', 'input_catalog', ['tenant_id', 'key']),
+    ('ix_bonus_plan_tenant_name_ver', 'bonus_plans', ['tenant_id', 'name', 'version']),
+    ('ix_plan_run_tenant_started', 'plan_runs', ['tenant_id', 'started_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Create the composite tenant indexes."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Drop the composite tenant indexes."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,29 @@
+"""Index plan_runs on (tenant_id, plan_id, started_at, id)
+
+Revision ID: o0d1e2f3a4b5
+Revises: n9c0d1e2f3a4
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'o0d1e2f3a4b5'
+down_revision = 'n9c0d1e2f3a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the index behind newest-first run pages for one plan."""
+    op.create_index(
+        'ix_plan_run_tenant_plan_started',
+        'plan_runs',
+        ['tenant_id', 'plan_id', 'started_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-plan run listing index."""
+    op.drop_index('ix_plan_run_tenant_plan_started', table_name='plan_runs')
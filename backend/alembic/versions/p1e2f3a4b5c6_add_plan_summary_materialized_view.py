@@ -0,0 +1,47 @@
+"""Add the mv_plan_summary materialized view for plan list counts
+
+Revision ID: p1e2f3a4b5c6
+Revises: o0d1e2f3a4b5
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'p1e2f3a4b5c6'
+down_revision = 'o0d1e2f3a4b5'
+branch_labels = None
+depends_on = None
+
+
+# One row per plan. Correlated subqueries rather than joins, so the step,
+# input and run counts do not multiply each other. The unique index on
+# plan_id is what REFRESH ... CONCURRENTLY requires.
+PLAN_SUMMARY_VIEW = """
+    CREATE MATERIALIZED VIEW mv_plan_summary AS
+    SELECT p.tenant_id,
+           p.id AS plan_id,
+           (SELECT count(*) FROM plan_steps s WHERE s.plan_id = p.id) AS step_count,
+           (SELECT count(*) FROM plan_inputs i WHERE i.plan_id = p.id) AS input_count,
+           (SELECT count(*) FROM plan_runs r WHERE r.plan_id = p.id) AS run_count,
+           (SELECT max(r.started_at) FROM plan_runs r WHERE r.plan_id = p.id) AS last_run_at
+    FROM bonus_plans p
+"""
+
+
+def upgrade() -> None:
+    """Create the plan summary view and its indexes."""
+    # Materialized views are PostgreSQL-only; SQLite computes the summary inline
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(";\n".join([
+            PLAN_SUMMARY_VIEW,
+            "CREATE UNIQUE INDEX ix_mv_plan_summary_plan_id ON mv_plan_summary (plan_id)",
+            "CREATE INDEX ix_mv_plan_summary_tenant_id ON mv_plan_summary (tenant_id)",
+        ]))
+
+
+def downgrade() -> None:
+    """Drop the plan summary view."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_plan_summary")
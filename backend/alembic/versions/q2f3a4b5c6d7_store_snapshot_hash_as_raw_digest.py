@@ -0,0 +1,59 @@
+"""Store plan_runs.snapshot_hash as a raw 32-byte SHA-256 digest
+
+Revision ID: q2f3a4b5c6d7
+Revises: p1e2f3a4b5c6
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'q2f3a4b5c6d7'
+down_revision = 'p1e2f3a4b5c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Convert snapshot_hash from 64-character hex text to BYTEA/BLOB."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE plan_runs ALTER COLUMN snapshot_hash TYPE bytea "
+            "USING decode(snapshot_hash, 'hex')"
+        )
+        return
+
+    # SQLite keeps the stored text through the table rebuild, so the values
+    # are decoded row by row afterwards (its unhex() needs SQLite 3.41)
+    _convert_rows(bytes.fromhex)
+    with op.batch_alter_table('plan_runs') as batch_op:
+        batch_op.alter_column('snapshot_hash', existing_type=sa.String(),
+                              type_=sa.LargeBinary(length=32), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Convert snapshot_hash back to 64-character hex text."""
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE plan_runs ALTER COLUMN snapshot_hash TYPE varchar "
+            "USING encode(snapshot_hash, 'hex')"
+        )
+        return
+
+    _convert_rows(bytes.hex)
+    with op.batch_alter_table('plan_runs') as batch_op:
+        batch_op.alter_column('snapshot_hash', existing_type=sa.LargeBinary(length=32),
+                              type_=sa.String(), existing_nullable=False)
+
+
+def _convert_rows(convert) -> None:
+    """Rewrite every stored snapshot_hash with convert (hex <-> digest)."""
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, snapshot_hash FROM plan_runs")).fetchall()
+    if rows:
+        connection.execute(
+            sa.text("UPDATE plan_runs SET snapshot_hash = :snapshot_hash WHERE id = :id"),
+            [{'id': row.id, 'snapshot_hash': convert(row.snapshot_hash)} for row in rows],
+        )
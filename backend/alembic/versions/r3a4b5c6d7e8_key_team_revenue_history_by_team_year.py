@@ -0,0 +1,65 @@
+"""Key team_revenue_history by (team_id, fiscal_year)
+
+Revision ID: r3a4b5c6d7e8
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 18:30:00.000000
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'r3a4b5c6d7e8'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+# Indexes the natural primary key makes redundant. ix_trh_team_id and
+# ix_team_revenue_history_id only exist on databases created before the
+# revenue banding migration stopped creating them.
+REDUNDANT_INDEXES = ['ix_trh_team_year', 'ix_trh_team_id', 'ix_team_revenue_history_id']
+
+
+def upgrade() -> None:
+    """Replace the surrogate id key with the natural (team_id, fiscal_year) primary key.
+
+    The pair is already unique (uq_team_year), so the primary key becomes the
+    table's only B-tree and still serves team_id-only lookups as its leftmost
+    prefix. On SQLite the rebuilt table is WITHOUT ROWID.
+    """
+    for index_name in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    with op.batch_alter_table('team_revenue_history',
+                              table_kwargs={'sqlite_with_rowid': False}) as batch_op:
+        batch_op.drop_constraint('uq_team_year', type_='unique')
+        # Dropping the column drops the primary key defined on it
+        batch_op.drop_column('id')
+        batch_op.create_primary_key('team_revenue_history_pkey', ['team_id', 'fiscal_year'])
+
+
+def downgrade() -> None:
+    """Restore the surrogate id primary key, the uq_team_year constraint and ix_trh_team_year."""
+    op.add_column('team_revenue_history', sa.Column('id', sa.String(), nullable=True))
+    connection = op.get_bind()
+    keys = connection.execute(
+        sa.text("SELECT team_id, fiscal_year FROM team_revenue_history")
+    ).fetchall()
+    if keys:
+        connection.execute(
+            sa.text("UPDATE team_revenue_history SET id = :id "
+                    "WHERE team_id = :team_id AND fiscal_year = :fiscal_year"),
+            [{'id': str(uuid.uuid4()), 'team_id': key.team_id, 'fiscal_year': key.fiscal_year}
+             for key in keys],
+        )
+
+    with op.batch_alter_table('team_revenue_history',
+                              table_kwargs={'sqlite_with_rowid': True}) as batch_op:
+        batch_op.drop_constraint('team_revenue_history_pkey', type_='primary')
+        batch_op.alter_column('id', existing_type=sa.String(), nullable=False)
+        batch_op.create_primary_key('team_revenue_history_pkey', ['id'])
+        batch_op.create_unique_constraint('uq_team_year', ['team_id', 'fiscal_year'])
+    op.create_index('ix_trh_team_year', 'team_revenue_history', ['team_id', 'fiscal_year'], unique=False)
@@ -0,0 +1,44 @@
+"""Make team_revenue_history.is_adjusted NOT NULL with a boolean default
+
+Revision ID: s4b5c6d7e8f9
+Revises: r3a4b5c6d7e8
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 's4b5c6d7e8f9'
+down_revision = 'r3a4b5c6d7e8'
+branch_labels = None
+depends_on = None
+
+team_revenue_history = sa.table('team_revenue_history', sa.column('is_adjusted', sa.Boolean()))
+
+
+def upgrade() -> None:
+    """Backfill NULLs as false, then make is_adjusted NOT NULL DEFAULT false.
+
+    sa.false() renders a real boolean default on PostgreSQL, where the
+    previous '0' is not a boolean literal. The SQLite rebuild keeps the
+    table WITHOUT ROWID.
+    """
+    op.execute(
+        team_revenue_history.update()
+        .where(team_revenue_history.c.is_adjusted.is_(None))
+        .values(is_adjusted=False)
+    )
+    with op.batch_alter_table('team_revenue_history',
+                              table_kwargs={'sqlite_with_rowid': False}) as batch_op:
+        batch_op.alter_column('is_adjusted', existing_type=sa.Boolean(),
+                              nullable=False, server_default=sa.false())
+
+
+def downgrade() -> None:
+    """Make is_adjusted nullable again with its previous default."""
+    with op.batch_alter_table('team_revenue_history',
+                              table_kwargs={'sqlite_with_rowid': False}) as batch_op:
+        batch_op.alter_column('is_adjusted', existing_type=sa.Boolean(),
+                              nullable=True, server_default=sa.text('0'))
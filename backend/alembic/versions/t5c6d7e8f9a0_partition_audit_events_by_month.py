@@ -0,0 +1,125 @@
+"""Use BIGINT identity for audit_events.id and range-partition it by month on at
+
+Revision ID: t5c6d7e8f9a0
+Revises: q2f3a4b5c6d7
+Create Date: 2026-10-16 19:30:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 't5c6d7e8f9a0'
+down_revision = 'q2f3a4b5c6d7'
+branch_labels = None
+depends_on = None
+
+# Fixed monthly partitions, so every run of this revision emits the same DDL:
+# January 2025 (the platform tables' first revision) through December 2027.
+# Earlier rows land in audit_events_default; later months are created ahead
+# of time by the create_audit_partitions beat task, which also moves any
+# matching rows out of the default partition.
+FIRST_PARTITION_MONTH = date(2025, 1, 1)
+PARTITION_MONTHS = 36
+
+# Indexes rebuilt on the new table (from f1a2b3c4d5e6 and m8b9c0d1e2f3); on a
+# partitioned parent each one cascades to every partition
+INDEXES = [
+    "CREATE INDEX ix_audit_events_tenant_id ON audit_events (tenant_id)",
+    "CREATE INDEX ix_audit_events_actor_user_id ON audit_events (actor_user_id)",
+    "CREATE INDEX ix_audit_events_entity_at ON audit_events "
+    "(tenant_id, entity, entity_id, \"at\" DESC, id DESC)",
+    "CREATE INDEX ix_audit_events_actor_at ON audit_events "
+    "(tenant_id, actor_user_id, \"at\" DESC, id DESC)",
+]
+
+RLS_STATEMENTS = [
+    "ALTER TABLE audit_events ENABLE ROW LEVEL SECURITY",
+    "CREATE POLICY tenant_isolation ON audit_events FOR ALL USING (tenant_id = current_tenant())",
+]
+
+COLUMNS = 'id, tenant_id, actor_user_id, action, entity, entity_id, "before", "after", "at", signature'
+
+
+def _partition_statements() -> list:
+    """CREATE TABLE ... PARTITION OF statements for the fixed months, plus a catch-all."""
+    statements = []
+    start = FIRST_PARTITION_MONTH
+    for _ in range(PARTITION_MONTHS):
+        end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        statements.append(
+            f"CREATE TABLE audit_events_{start:%Y}m{start:%m} PARTITION OF audit_events "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    statements.append("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+    return statements
+
+
+def _set_next_id() -> str:
+    """Continue the id sequence after the copied rows."""
+    return (
+        "SELECT setval(pg_get_serial_sequence('audit_events', 'id'), "
+        "COALESCE(MAX(id), 0) + 1, false) FROM audit_events"
+    )
+
+
+def upgrade() -> None:
+    """Rebuild audit_events as a monthly range-partitioned table with a BIGINT identity key.
+
+    PostgreSQL cannot partition an existing table in place, so the rows are
+    copied into a new partitioned table. Its primary key must include the
+    partition column, so it becomes (id, at). SQLite keeps its rowid-backed
+    integer key and is left unchanged.
+    """
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute(";\n".join([
+        # Free the names the new table, its key and its sequence will take
+        "ALTER TABLE audit_events RENAME TO audit_events_unpartitioned",
+        "ALTER INDEX audit_events_pkey RENAME TO audit_events_unpartitioned_pkey",
+        "ALTER SEQUENCE IF EXISTS audit_events_id_seq RENAME TO audit_events_unpartitioned_id_seq",
+        # LIKE copies the column types and NOT NULLs as they exist in this database
+        "CREATE TABLE audit_events (LIKE audit_events_unpartitioned) PARTITION BY RANGE (\"at\")",
+        "ALTER TABLE audit_events ALTER COLUMN id TYPE BIGINT",
+        "ALTER TABLE audit_events ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY",
+        "ALTER TABLE audit_events ADD PRIMARY KEY (id, \"at\")",
+        "ALTER TABLE audit_events ADD FOREIGN KEY (tenant_id) REFERENCES tenants (id)",
+        "ALTER TABLE audit_events ADD FOREIGN KEY (actor_user_id) REFERENCES users (id)",
+        *_partition_statements(),
+        f"INSERT INTO audit_events ({COLUMNS}) OVERRIDING SYSTEM VALUE "
+        f"SELECT {COLUMNS} FROM audit_events_unpartitioned",
+        _set_next_id(),
+        # Drops the old indexes, policy and sequence along with the table
+        "DROP TABLE audit_events_unpartitioned",
+        *INDEXES,
+        *RLS_STATEMENTS,
+    ]))
+
+
+def downgrade() -> None:
+    """Copy audit_events back into a single unpartitioned table with a serial integer key."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute(";\n".join([
+        "ALTER TABLE audit_events RENAME TO audit_events_partitioned",
+        "ALTER INDEX audit_events_pkey RENAME TO audit_events_partitioned_pkey",
+        "CREATE TABLE audit_events (LIKE audit_events_partitioned)",
+        "ALTER TABLE audit_events ALTER COLUMN id DROP IDENTITY IF EXISTS",
+        "ALTER TABLE audit_events ALTER COLUMN id TYPE INTEGER",
+        "CREATE SEQUENCE audit_events_id_seq OWNED BY audit_events.id",
+        "ALTER TABLE audit_events ALTER COLUMN id SET DEFAULT nextval('audit_events_id_seq')",
+        "ALTER TABLE audit_events ADD PRIMARY KEY (id)",
+        "ALTER TABLE audit_events ADD FOREIGN KEY (tenant_id) REFERENCES tenants (id)",
+        "ALTER TABLE audit_events ADD FOREIGN KEY (actor_user_id) REFERENCES users (id)",
+        f"INSERT INTO audit_events ({COLUMNS}) SELECT {COLUMNS} FROM audit_events_partitioned",
+        _set_next_id(),
+        # Drops every partition with it
+        "DROP TABLE audit_events_partitioned",
+        *INDEXES,
+        *RLS_STATEMENTS,
+    ]))
@@ -0,0 +1,160 @@
+"""
+Compiled numeric kernel for the core bonus formula.
+
+The arithmetic of CalculationEngine.calculate_final_bonus lives here as a
+single Numba-compiled function over plain floats, so a per-employee
+calculation is one native call instead of a chain of Python classmethods.
+Optional values are passed as NaN and ``cap_applied`` is returned as an
+integer code (see CAP_CODES).
+
+fastmath is deliberately left off: it would let LLVM reassociate the
+arithmetic and assume NaN never occurs, and results must match the
+reference rounding to the cent.
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+# cap_applied integer codes returned by _compute
+CAP_NONE = 0
+CAP_BASE_SALARY = 1
+CAP_MRT = 2
+CAP_CODES = {CAP_NONE: None, CAP_BASE_SALARY: "3x_base", CAP_MRT: "mrt"}
+
+BASE_SALARY_CAP_MULTIPLIER = 3.0
+
+
+@njit(cache=True)
+def _round_currency(amount):
+    """Round half away from zero to cents (same as CalculationEngine._round_currency)."""
+    if amount != amount:  # NaN
+        return amount
+    sign = 1.0
+    if amount < 0:
+        sign = -1.0
+        amount = -amount
+    cents = math.floor(amount * 100)
+    if amount >= (cents + 0.5) / 100:
+        cents += 1
+    return sign * (cents / 100)
+
+
+@njit(cache=True)
+def _capped_amounts(base_salary, target_bonus_pct, investment_weight, investment_score_multiplier,
+                    qualitative_weight, qual_score_multiplier, raf, is_mrt, mrt_cap_pct):
+    """
+    Steps 1-6 on unrounded floats.
+
+    Returns (target, weighted_performance, pre_raf, initial, base_cap,
+    mrt_cap, capped, cap_code); mrt_cap is NaN when not applicable.
+    """
+    target = base_salary * target_bonus_pct
+    weighted_performance = (
+        investment_weight * investment_score_multiplier +
+        qualitative_weight * qual_score_multiplier
+    )
+    pre_raf = target * weighted_performance
+    initial = pre_raf * raf
+
+    base_cap = base_salary * BASE_SALARY_CAP_MULTIPLIER
+    has_mrt_cap = is_mrt and mrt_cap_pct == mrt_cap_pct
+    mrt_cap = base_salary * mrt_cap_pct if has_mrt_cap else math.nan
+
+    # Most restrictive cap (ties go to the 3x base cap), selected without
+    # re-comparing the capped amount against each cap
+    base_cap_binds = not has_mrt_cap or base_cap <= mrt_cap
+    effective_cap = base_cap if base_cap_binds else mrt_cap
+    capped = initial
+    cap_code = CAP_NONE
+    if initial > effective_cap:
+        capped = effective_cap
+        cap_code = CAP_BASE_SALARY if base_cap_binds else CAP_MRT
+
+    return target, weighted_performance, pre_raf, initial, base_cap, mrt_cap, capped, cap_code
+
+
+@njit(cache=True)
+def _compute(base_salary, target_bonus_pct, investment_weight, investment_score_multiplier,
+             qualitative_weight, qual_score_multiplier, raf, is_mrt, mrt_cap_pct):
+    """
+    Steps 1-6 of calculate_final_bonus.
+
+    The chain runs on unrounded floats and each reported amount is rounded to
+    cents exactly once, so rounding error never compounds between steps. The
+    bonus pool limit (step 7) depends on batch totals rather than on the
+    employee, so the caller applies it to capped_amount.
+
+    Returns (target_bonus, weighted_performance, pre_raf_bonus, initial_bonus,
+    base_salary_cap, mrt_cap, capped_bonus, cap_code, capped_amount), where
+    mrt_cap is NaN when not applicable and capped_amount is capped_bonus
+    before rounding.
+    """
+    (target, weighted_performance, pre_raf, initial,
+     base_cap, mrt_cap, capped, cap_code) = _capped_amounts(
+        base_salary, target_bonus_pct, investment_weight, investment_score_multiplier,
+        qualitative_weight, qual_score_multiplier, raf, is_mrt, mrt_cap_pct)
+
+    return (_round_currency(target), weighted_performance, _round_currency(pre_raf),
+            _round_currency(initial), _round_currency(base_cap), _round_currency(mrt_cap),
+            _round_currency(capped), cap_code, capped)
+
+
+@njit(parallel=True, cache=True)
+def _compute_batch(base_salary, target_bonus_pct, investment_weight, investment_score_multiplier,
+                   qualitative_weight, qual_score_multiplier, raf, is_mrt, mrt_cap_pct):
+    """
+    Steps 1-6 over contiguous 1-D arrays, one row per employee.
+
+    Rows are independent, so the loop runs under prange across all cores
+    with the GIL released. The pool limit is a single factor for the whole
+    batch and is applied by the caller to the unrounded capped amounts.
+
+    Returns arrays (target_bonus, weighted_performance, pre_raf_bonus,
+    initial_bonus, base_salary_cap, mrt_cap, capped_amount, capped_bonus,
+    cap_code), where capped_amount is capped_bonus before rounding.
+    """
+    n = base_salary.shape[0]
+    target_bonus = np.empty(n)
+    weighted_performance = np.empty(n)
+    pre_raf_bonus = np.empty(n)
+    initial_bonus = np.empty(n)
+    base_salary_cap = np.empty(n)
+    mrt_cap = np.empty(n)
+    capped_amount = np.empty(n)
+    capped_bonus = np.empty(n)
+    cap_code = np.empty(n, dtype=np.int8)
+    for i in prange(n):
+        (target, weighted_performance[i], pre_raf, initial,
+         base_cap, mrt, capped, cap_code[i]) = _capped_amounts(
+            base_salary[i], target_bonus_pct[i], investment_weight[i], investment_score_multiplier[i],
+            qualitative_weight[i], qual_score_multiplier[i], raf[i], is_mrt[i], mrt_cap_pct[i])
+        target_bonus[i] = _round_currency(target)
+        pre_raf_bonus[i] = _round_currency(pre_raf)
+        initial_bonus[i] = _round_currency(initial)
+        base_salary_cap[i] = _round_currency(base_cap)
+        mrt_cap[i] = _round_currency(mrt)
+        capped_amount[i] = capped
+        capped_bonus[i] = _round_currency(capped)
+    return (target_bonus, weighted_performance, pre_raf_bonus, initial_bonus,
+            base_salary_cap, mrt_cap, capped_amount, capped_bonus, cap_code)
+
+
+@njit(parallel=True, cache=True)
+def _round_currency_batch(amounts):
+    """_round_currency over a contiguous 1-D array."""
+    n = amounts.shape[0]
+    rounded = np.empty(n)
+    for i in prange(n):
+        rounded[i] = _round_currency(amounts[i])
+    return rounded
+
+
+# Compile (or load from the on-disk cache) at import so the first request
+# does not pay the JIT latency
+_compute(1.0, 0.1, 0.5, 1.0, 0.5, 1.0, 1.0, True, 1.0)
+_ones = np.ones(1)
+_compute_batch(_ones, _ones, _ones, _ones, _ones, _ones, _ones, np.ones(1, dtype=np.bool_), _ones)
+_round_currency_batch(_ones)
+del _ones
@@ -13,15 +13,50 @@ Key Components:
 - Cap application logic (3x Base Salary and MRT Cap)
 """
 
-from typing import Dict, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any
 from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+import functools
 import logging
+import math
+
+import numpy as np
+import pandas as pd
+
+from .calc_kernel import BASE_SALARY_CAP_MULTIPLIER, CAP_CODES, _compute, _compute_batch, _round_currency_batch
 
 logger = logging.getLogger(__name__)
 
+# cap_applied label per kernel cap code, for fancy-indexing a code array
+_CAP_LABELS = np.array([CAP_CODES[code] for code in sorted(CAP_CODES)], dtype=object)
 
-@dataclass
+
+@functools.lru_cache(maxsize=4096)
+def _cached_compute(
+    base_salary: float,
+    target_bonus_pct: float,
+    investment_weight: float,
+    investment_score_multiplier: float,
+    qualitative_weight: float,
+    qual_score_multiplier: float,
+    raf: float,
+    is_mrt: bool,
+    mrt_cap_pct: Optional[float]
+) -> tuple:
+    """
+    Memoized _compute keyed on the per-employee inputs.
+    
+    Employees in the same grade band often share every input, so repeats
+    skip the kernel call. The pool limit is not part of the key. mrt_cap_pct
+    stays None rather than NaN in the key because NaN never compares equal.
+    """
+    return _compute(
+        base_salary, target_bonus_pct, investment_weight, investment_score_multiplier,
+        qualitative_weight, qual_score_multiplier, raf, is_mrt,
+        math.nan if mrt_cap_pct is None else mrt_cap_pct
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class CalculationInputs:
     """Input parameters for bonus calculation."""
     base_salary: float
@@ -39,7 +74,7 @@ class CalculationInputs:
     total_calculated_bonuses: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CalculationResult:
     """Result of bonus calculation with all intermediate steps."""
     target_bonus: float
@@ -50,11 +85,69 @@ class CalculationResult:
     mrt_cap: Optional[float]
     final_bonus: float
     cap_applied: Optional[str]
-    calculation_steps: Dict[str, float]
     # Bonus pool scaling information
     pool_scaling_applied: bool = False
     pool_scaling_factor: Optional[float] = None
     pre_scaling_bonus: Optional[float] = None
+    # Kept so calculation_steps can be rebuilt on demand
+    inputs: Optional[CalculationInputs] = None
+    capped_bonus: Optional[float] = None
+    total_bonus_pool: Optional[float] = None
+    total_calculated_bonuses: Optional[float] = None
+    
+    @property
+    def calculation_steps(self) -> Optional[Dict[str, float]]:
+        """
+        Audit trail of inputs and intermediate amounts, built on access.
+        
+        Most results are never audited, so the dict is not stored; None when
+        the result was built without its inputs.
+        """
+        inputs = self.inputs
+        if inputs is None:
+            return None
+        
+        calculation_steps = {
+            "base_salary": inputs.base_salary,
+            "target_bonus_pct": inputs.target_bonus_pct,
+            "investment_weight": inputs.investment_weight,
+            "investment_score_multiplier": inputs.investment_score_multiplier,
+            "qualitative_weight": inputs.qualitative_weight,
+            "qual_score_multiplier": inputs.qual_score_multiplier,
+            "raf": inputs.raf,
+            "target_bonus": self.target_bonus,
+            "weighted_performance": self.weighted_performance,
+            "pre_raf_bonus": self.pre_raf_bonus,
+            "initial_bonus": self.initial_bonus,
+            "capped_bonus": self.capped_bonus,
+            "final_bonus": self.final_bonus
+        }
+        
+        # Add pool scaling info to calculation steps if applied
+        if self.pool_scaling_applied:
+            calculation_steps["pool_scaling_factor"] = self.pool_scaling_factor
+            if self.total_bonus_pool is not None:
+                calculation_steps["total_bonus_pool"] = self.total_bonus_pool
+            if self.total_calculated_bonuses is not None:
+                calculation_steps["total_calculated_bonuses"] = self.total_calculated_bonuses
+        return calculation_steps
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the reported amounts and the calculation_steps audit trail"""
+        return {
+            "target_bonus": self.target_bonus,
+            "weighted_performance": self.weighted_performance,
+            "pre_raf_bonus": self.pre_raf_bonus,
+            "initial_bonus": self.initial_bonus,
+            "base_salary_cap": self.base_salary_cap,
+            "mrt_cap": self.mrt_cap,
+            "final_bonus": self.final_bonus,
+            "cap_applied": self.cap_applied,
+            "calculation_steps": self.calculation_steps,
+            "pool_scaling_applied": self.pool_scaling_applied,
+            "pool_scaling_factor": self.pool_scaling_factor,
+            "pre_scaling_bonus": self.pre_scaling_bonus,
+        }
 
 
 class ValidationError(Exception):
@@ -62,11 +155,179 @@ class ValidationError(Exception):
     pass
 
 
+def _round_currency(amount: float) -> float:
+    """
+    Round amount to 2 decimal places, half away from zero.
+    
+    Float-only equivalent of Decimal(str(amount)).quantize(Decimal('0.01'),
+    ROUND_HALF_UP): the half-cent threshold is compared in the original
+    units, so 1.005 rounds up while 28718.234999999997 rounds down.
+    """
+    if amount != amount:  # NaN
+        return amount
+    if amount < 0:
+        return -_round_currency(-amount)
+    cents = math.floor(amount * 100)
+    if amount >= (cents + 0.5) / 100:
+        cents += 1
+    return cents / 100
+
+
+def _calculate_target_bonus(base_salary: float, target_bonus_pct: float) -> float:
+    """
+    Calculate target bonus amount.
+    
+    Args:
+        base_salary: Employee's base salary
+        target_bonus_pct: Target bonus percentage (0-1)
+        
+    Returns:
+        Target bonus amount (unrounded; only reported amounts are rounded)
+    """
+    return base_salary * target_bonus_pct
+
+
+def _calculate_weighted_performance(
+    investment_weight: float,
+    investment_score_multiplier: float,
+    qualitative_weight: float,
+    qual_score_multiplier: float
+) -> float:
+    """
+    Calculate weighted performance score.
+    
+    Args:
+        investment_weight: Weight for investment component (0-1)
+        investment_score_multiplier: Investment score multiplier
+        qualitative_weight: Weight for qualitative component (0-1)
+        qual_score_multiplier: Qualitative score multiplier
+        
+    Returns:
+        Weighted performance score
+    """
+    return (
+        investment_weight * investment_score_multiplier +
+        qualitative_weight * qual_score_multiplier
+    )
+
+
+def _calculate_pre_raf_bonus(target_bonus: float, weighted_performance: float) -> float:
+    """
+    Calculate bonus amount before RAF application.
+    
+    Args:
+        target_bonus: Target bonus amount
+        weighted_performance: Weighted performance score
+        
+    Returns:
+        Pre-RAF bonus amount (unrounded)
+    """
+    return target_bonus * weighted_performance
+
+
+def _apply_raf(pre_raf_bonus: float, raf: float) -> float:
+    """
+    Apply Risk Adjustment Factor (RAF) to bonus.
+    
+    Args:
+        pre_raf_bonus: Bonus amount before RAF
+        raf: Risk Adjustment Factor
+        
+    Returns:
+        Bonus amount after RAF application (unrounded)
+    """
+    return pre_raf_bonus * raf
+
+
+def _calculate_caps(
+    base_salary: float,
+    is_mrt: bool = False,
+    mrt_cap_pct: Optional[float] = None
+) -> tuple[float, Optional[float]]:
+    """
+    Calculate applicable caps.
+    
+    Args:
+        base_salary: Employee's base salary
+        is_mrt: Whether employee is Material Risk Taker
+        mrt_cap_pct: MRT cap percentage (required if is_mrt is True)
+        
+    Returns:
+        Tuple of (base_salary_cap, mrt_cap), unrounded so the cap
+        comparison is made on exact amounts
+    """
+    base_salary_cap = base_salary * BASE_SALARY_CAP_MULTIPLIER
+    
+    mrt_cap = None
+    if is_mrt and mrt_cap_pct is not None:
+        mrt_cap = base_salary * mrt_cap_pct
+        
+    return base_salary_cap, mrt_cap
+
+
+def _apply_bonus_pool_limit(
+    bonus: float,
+    use_bonus_pool_limit: bool = False,
+    total_bonus_pool: Optional[float] = None,
+    total_calculated_bonuses: Optional[float] = None
+) -> tuple[float, bool, Optional[float]]:
+    """
+    Apply bonus pool limit scaling if needed.
+    
+    Args:
+        bonus: Bonus amount to potentially scale
+        use_bonus_pool_limit: Whether to apply bonus pool limit
+        total_bonus_pool: Total bonus pool amount
+        total_calculated_bonuses: Sum of all calculated bonuses before scaling
+        
+    Returns:
+        Tuple of (scaled_bonus, scaling_applied, scaling_factor)
+    """
+    # If bonus pool limit is not enabled or missing required values, return original bonus
+    if not use_bonus_pool_limit or total_bonus_pool is None or total_calculated_bonuses is None or total_calculated_bonuses <= 0:
+        return bonus, False, None
+    
+    # Calculate scaling factor
+    scaling_factor = min(1.0, total_bonus_pool / total_calculated_bonuses)
+    
+    # If scaling factor is 1 or greater, no scaling needed
+    if scaling_factor >= 1.0:
+        return bonus, False, None
+    
+    # Apply scaling factor to bonus
+    return _round_currency(bonus * scaling_factor), True, scaling_factor
+
+
+def _apply_caps(
+    initial_bonus: float,
+    base_salary_cap: float,
+    mrt_cap: Optional[float] = None
+) -> tuple[float, Optional[str]]:
+    """
+    Apply caps to bonus amount.
+    
+    Args:
+        initial_bonus: Bonus amount before caps
+        base_salary_cap: 3x base salary cap
+        mrt_cap: MRT cap (if applicable)
+        
+    Returns:
+        Tuple of (final_bonus, cap_applied); only final_bonus is rounded
+    """
+    # Most restrictive cap; ties go to the 3x base cap
+    base_cap_binds = mrt_cap is None or base_salary_cap <= mrt_cap
+    effective_cap = base_salary_cap if base_cap_binds else mrt_cap
+    
+    if initial_bonus <= effective_cap:
+        return _round_currency(initial_bonus), None
+    return _round_currency(effective_cap), "3x_base" if base_cap_binds else "mrt"
+
+
 class CalculationEngine:
     """Core calculation engine for bonus calculations."""
     
     # Constants
-    BASE_SALARY_CAP_MULTIPLIER = 3.0
+    BASE_SALARY_CAP_MULTIPLIER = BASE_SALARY_CAP_MULTIPLIER
     PRECISION_DECIMAL_PLACES = 2
     
     @staticmethod
@@ -110,281 +371,338 @@ class CalculationEngine:
             raise ValidationError("MRT cap percentage must be positive when is_mrt is True")
     
     @staticmethod
-    def _round_currency(amount: float) -> float:
-        """Round amount to 2 decimal places using banker's rounding."""
-        decimal_amount = Decimal(str(amount))
-        rounded = decimal_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        return float(rounded)
-    
-    @classmethod
-    def calculate_target_bonus(cls, base_salary: float, target_bonus_pct: float) -> float:
+    def validate_inputs_batch(arrays: Dict[str, np.ndarray]) -> None:
         """
-        Calculate target bonus amount.
+        Validate a whole batch of inputs with one NumPy reduction per rule.
         
-        Args:
-            base_salary: Employee's base salary
-            target_bonus_pct: Target bonus percentage (0-1)
-            
-        Returns:
-            Target bonus amount
-        """
-        target_bonus = base_salary * target_bonus_pct
-        return cls._round_currency(target_bonus)
-    
-    @classmethod
-    def calculate_weighted_performance(
-        cls,
-        investment_weight: float,
-        investment_score_multiplier: float,
-        qualitative_weight: float,
-        qual_score_multiplier: float
-    ) -> float:
-        """
-        Calculate weighted performance score.
+        Applies the same rules as validate_inputs, but over the column arrays
+        produced by inputs_to_arrays.
         
         Args:
-            investment_weight: Weight for investment component (0-1)
-            investment_score_multiplier: Investment score multiplier
-            qualitative_weight: Weight for qualitative component (0-1)
-            qual_score_multiplier: Qualitative score multiplier
+            arrays: Column arrays as produced by inputs_to_arrays
             
-        Returns:
-            Weighted performance score
+        Raises:
+            ValidationError: On the first failing rule, naming up to five
+                offending row indices
         """
-        weighted_performance = (
-            investment_weight * investment_score_multiplier +
-            qualitative_weight * qual_score_multiplier
+        investment_weight = arrays["investment_weight"]
+        qualitative_weight = arrays["qualitative_weight"]
+        mrt_cap_pct = arrays["mrt_cap_pct"]
+        
+        # (message, mask of rows breaking the rule); NaN compares like the scalar checks
+        checks = (
+            ("Base salary must be positive", arrays["base_salary"] <= 0),
+            ("Target bonus percentage must be non-negative", arrays["target_bonus_pct"] < 0),
+            ("Investment weight must be between 0 and 1",
+             ~((0 <= investment_weight) & (investment_weight <= 1))),
+            ("Qualitative weight must be between 0 and 1",
+             ~((0 <= qualitative_weight) & (qualitative_weight <= 1))),
+            ("Investment and qualitative weights must sum to 1.0",
+             np.abs(investment_weight + qualitative_weight - 1.0) > 0.001),
+            ("Investment score multiplier must be non-negative", arrays["investment_score_multiplier"] < 0),
+            ("Qualitative score multiplier must be non-negative", arrays["qual_score_multiplier"] < 0),
+            ("RAF must be non-negative", arrays["raf"] < 0),
+            ("MRT cap percentage must be positive when is_mrt is True",
+             arrays["is_mrt"] & (np.isnan(mrt_cap_pct) | (mrt_cap_pct <= 0))),
         )
-        return weighted_performance
+        for message, invalid in checks:
+            if invalid.any():
+                rows = np.flatnonzero(invalid)[:5].tolist()
+                raise ValidationError(f"{message} (rows {rows})")
+    
+    # The formula helpers are plain module functions (no descriptor lookup
+    # on internal calls); these delegates keep the public API unchanged
+    _round_currency = staticmethod(_round_currency)
+    calculate_target_bonus = staticmethod(_calculate_target_bonus)
+    calculate_weighted_performance = staticmethod(_calculate_weighted_performance)
+    calculate_pre_raf_bonus = staticmethod(_calculate_pre_raf_bonus)
+    apply_raf = staticmethod(_apply_raf)
+    calculate_caps = staticmethod(_calculate_caps)
+    apply_bonus_pool_limit = staticmethod(_apply_bonus_pool_limit)
+    apply_caps = staticmethod(_apply_caps)
     
     @classmethod
-    def calculate_pre_raf_bonus(cls, target_bonus: float, weighted_performance: float) -> float:
+    def calculate_final_bonus(cls, inputs: CalculationInputs) -> CalculationResult:
         """
-        Calculate bonus amount before RAF application.
+        Calculate the final bonus with all intermediate steps.
         
         Args:
-            target_bonus: Target bonus amount
-            weighted_performance: Weighted performance score
+            inputs: CalculationInputs object with all required parameters
             
         Returns:
-            Pre-RAF bonus amount
+            CalculationResult object with final bonus and all intermediate calculations
+            
+        Raises:
+            ValidationError: If input validation fails
         """
-        pre_raf_bonus = target_bonus * weighted_performance
-        return cls._round_currency(pre_raf_bonus)
+        # Validate inputs
+        cls.validate_inputs(inputs)
+        
+        # Steps 1-6 (target, weighted performance, pre-RAF, RAF, caps,
+        # cap selection) run as one compiled call, memoized per input tuple
+        (target_bonus, weighted_performance, pre_raf_bonus, initial_bonus,
+         base_salary_cap, mrt_cap, capped_bonus, cap_code,
+         capped_amount) = _cached_compute(
+            float(inputs.base_salary),
+            float(inputs.target_bonus_pct),
+            float(inputs.investment_weight),
+            float(inputs.investment_score_multiplier),
+            float(inputs.qualitative_weight),
+            float(inputs.qual_score_multiplier),
+            float(inputs.raf),
+            bool(inputs.is_mrt),
+            None if inputs.mrt_cap_pct is None else float(inputs.mrt_cap_pct)
+        )
+        
+        # Step 7: bonus pool limit, outside the cache
+        final_bonus = capped_bonus
+        scaled_bonus, pool_scaling_applied, pool_scaling_factor = _apply_bonus_pool_limit(
+            capped_amount,
+            inputs.use_bonus_pool_limit,
+            inputs.total_bonus_pool,
+            inputs.total_calculated_bonuses
+        )
+        if pool_scaling_applied:
+            final_bonus = scaled_bonus
+        
+        return CalculationResult(
+            target_bonus=target_bonus,
+            weighted_performance=weighted_performance,
+            pre_raf_bonus=pre_raf_bonus,
+            initial_bonus=initial_bonus,
+            base_salary_cap=base_salary_cap,
+            mrt_cap=None if mrt_cap != mrt_cap else mrt_cap,
+            final_bonus=final_bonus,
+            cap_applied=CAP_CODES[cap_code],
+            pool_scaling_applied=pool_scaling_applied,
+            pool_scaling_factor=pool_scaling_factor,
+            pre_scaling_bonus=capped_bonus if pool_scaling_applied else None,
+            inputs=inputs,
+            capped_bonus=capped_bonus,
+            total_bonus_pool=inputs.total_bonus_pool,
+            total_calculated_bonuses=inputs.total_calculated_bonuses
+        )
     
-    @classmethod
-    def apply_raf(cls, pre_raf_bonus: float, raf: float) -> float:
+    @staticmethod
+    def clear_result_cache() -> None:
+        """Drop every memoized per-employee result used by calculate_final_bonus"""
+        _cached_compute.cache_clear()
+
+    @staticmethod
+    def inputs_to_arrays(inputs_list: List[CalculationInputs]) -> Dict[str, np.ndarray]:
         """
-        Apply Risk Adjustment Factor (RAF) to bonus.
-        
-        Args:
-            pre_raf_bonus: Bonus amount before RAF
-            raf: Risk Adjustment Factor
-            
-        Returns:
-            Bonus amount after RAF application
+        Pack a list of CalculationInputs into the column arrays used by
+        calculate_final_bonus_batch. A missing MRT cap percentage becomes NaN.
         """
-        initial_bonus = pre_raf_bonus * raf
-        return cls._round_currency(initial_bonus)
+        return {
+            "base_salary": np.array([i.base_salary for i in inputs_list], dtype=np.float64),
+            "target_bonus_pct": np.array([i.target_bonus_pct for i in inputs_list], dtype=np.float64),
+            "investment_weight": np.array([i.investment_weight for i in inputs_list], dtype=np.float64),
+            "investment_score_multiplier": np.array([i.investment_score_multiplier for i in inputs_list], dtype=np.float64),
+            "qualitative_weight": np.array([i.qualitative_weight for i in inputs_list], dtype=np.float64),
+            "qual_score_multiplier": np.array([i.qual_score_multiplier for i in inputs_list], dtype=np.float64),
+            "raf": np.array([i.raf for i in inputs_list], dtype=np.float64),
+            "is_mrt": np.array([i.is_mrt for i in inputs_list], dtype=bool),
+            "mrt_cap_pct": np.array(
+                [np.nan if i.mrt_cap_pct is None else i.mrt_cap_pct for i in inputs_list], dtype=np.float64
+            ),
+        }
     
     @classmethod
-    def calculate_caps(
+    def calculate_final_bonus_batch(
         cls,
-        base_salary: float,
-        is_mrt: bool = False,
-        mrt_cap_pct: Optional[float] = None
-    ) -> tuple[float, Optional[float]]:
+        arrays: Dict[str, np.ndarray],
+        use_bonus_pool_limit: bool = False,
+        total_bonus_pool: Optional[float] = None,
+        total_calculated_bonuses: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
         """
-        Calculate applicable caps.
+        Calculate final bonuses for a whole batch with element-wise array ops.
+        
+        Mirrors calculate_final_bonus step for step (including rounding), but
+        over 1-D arrays: steps 1-6 run in the compiled kernel's prange loop
+        across all cores, and step 7 is a single scaling factor for the whole
+        batch applied by apply_bonus_pool_limit_batch.
+        Inputs are expected to have been validated already.
         
         Args:
-            base_salary: Employee's base salary
-            is_mrt: Whether employee is Material Risk Taker
-            mrt_cap_pct: MRT cap percentage (required if is_mrt is True)
+            arrays: Column arrays as produced by inputs_to_arrays
+            use_bonus_pool_limit: Whether to apply bonus pool limit
+            total_bonus_pool: Total bonus pool amount
+            total_calculated_bonuses: Pre-scaling total to scale against
+                (defaults to the sum of this batch's capped bonuses)
             
         Returns:
-            Tuple of (base_salary_cap, mrt_cap)
+            Dict of result arrays: target_bonus, weighted_performance,
+            pre_raf_bonus, initial_bonus, base_salary_cap, mrt_cap (NaN when
+            not applicable), capped_amount (capped_bonus before rounding),
+            capped_bonus, final_bonus, cap_applied (object array of
+            "3x_base"/"mrt"/None), and pool_scaling_factor (NaN when no
+            scaling was applied)
         """
-        base_salary_cap = cls._round_currency(base_salary * cls.BASE_SALARY_CAP_MULTIPLIER)
+        # Steps run row-parallel in the compiled kernel; it needs contiguous
+        # float64/bool columns
+        columns = [
+            np.ascontiguousarray(arrays[name], dtype=np.float64)
+            for name in ("base_salary", "target_bonus_pct", "investment_weight",
+                         "investment_score_multiplier", "qualitative_weight",
+                         "qual_score_multiplier", "raf")
+        ]
+        columns.append(np.ascontiguousarray(arrays["is_mrt"], dtype=np.bool_))
+        columns.append(np.ascontiguousarray(arrays["mrt_cap_pct"], dtype=np.float64))
         
-        mrt_cap = None
-        if is_mrt and mrt_cap_pct is not None:
-            mrt_cap = cls._round_currency(base_salary * mrt_cap_pct)
-            
-        return base_salary_cap, mrt_cap
+        (target_bonus, weighted_performance, pre_raf_bonus, initial_bonus,
+         base_salary_cap, mrt_cap, capped_amount, capped_bonus,
+         cap_codes) = _compute_batch(*columns)
+        
+        batch = {
+            "target_bonus": target_bonus,
+            "weighted_performance": weighted_performance,
+            "pre_raf_bonus": pre_raf_bonus,
+            "initial_bonus": initial_bonus,
+            "base_salary_cap": base_salary_cap,
+            "mrt_cap": mrt_cap,
+            "capped_amount": capped_amount,
+            "capped_bonus": capped_bonus,
+            "final_bonus": capped_bonus,
+            "cap_applied": _CAP_LABELS[cap_codes],
+            "pool_scaling_factor": np.full(capped_bonus.shape[0], np.nan),
+        }
+        if use_bonus_pool_limit:
+            cls.apply_bonus_pool_limit_batch(batch, total_bonus_pool, total_calculated_bonuses)
+        return batch
     
     @classmethod
-    def apply_bonus_pool_limit(
+    def apply_bonus_pool_limit_batch(
         cls,
-        bonus: float,
-        use_bonus_pool_limit: bool = False,
-        total_bonus_pool: Optional[float] = None,
+        batch: Dict[str, np.ndarray],
+        total_bonus_pool: Optional[float],
         total_calculated_bonuses: Optional[float] = None
-    ) -> tuple[float, bool, Optional[float]]:
+    ) -> Optional[float]:
         """
-        Apply bonus pool limit scaling if needed.
+        Apply the bonus pool limit to a calculate_final_bonus_batch result in place.
+        
+        The scaling factor min(1, pool / total) is the same for every row, so
+        it is computed once and multiplied into the unrounded capped amounts
+        in one array expression; final_bonus is rounded to cents once.
         
         Args:
-            bonus: Bonus amount to potentially scale
-            use_bonus_pool_limit: Whether to apply bonus pool limit
+            batch: Result of calculate_final_bonus_batch
             total_bonus_pool: Total bonus pool amount
-            total_calculated_bonuses: Sum of all calculated bonuses before scaling
+            total_calculated_bonuses: Pre-scaling total to scale against
+                (defaults to the sum of the batch's capped bonuses)
             
         Returns:
-            Tuple of (scaled_bonus, scaling_applied, scaling_factor)
+            The scaling factor applied, or None when no scaling was needed
         """
-        # If bonus pool limit is not enabled or missing required values, return original bonus
-        if not use_bonus_pool_limit or total_bonus_pool is None or total_calculated_bonuses is None or total_calculated_bonuses <= 0:
-            return bonus, False, None
+        if total_calculated_bonuses is None:
+            total_calculated_bonuses = float(batch["capped_bonus"].sum())
+        if total_bonus_pool is None or total_calculated_bonuses <= 0:
+            return None
         
-        # Calculate scaling factor
         scaling_factor = min(1.0, total_bonus_pool / total_calculated_bonuses)
-        
-        # If scaling factor is 1 or greater, no scaling needed
         if scaling_factor >= 1.0:
-            return bonus, False, None
-        
-        # Apply scaling factor to bonus
-        scaled_bonus = cls._round_currency(bonus * scaling_factor)
+            return None
         
-        return scaled_bonus, True, scaling_factor
+        batch["final_bonus"] = _round_currency_batch(batch["capped_amount"] * scaling_factor)
+        batch["pool_scaling_factor"] = np.full(batch["final_bonus"].shape[0], scaling_factor)
+        return scaling_factor
     
     @classmethod
-    def apply_caps(
+    def calculate_final_bonus_dataframe(
         cls,
-        initial_bonus: float,
-        base_salary_cap: float,
-        mrt_cap: Optional[float] = None
-    ) -> tuple[float, Optional[str]]:
+        df: pd.DataFrame,
+        use_bonus_pool_limit: bool = False,
+        total_bonus_pool: Optional[float] = None,
+        total_calculated_bonuses: Optional[float] = None
+    ) -> pd.DataFrame:
         """
-        Apply caps to bonus amount.
+        Calculate final bonuses for a DataFrame of employees without row iteration.
         
-        Args:
-            initial_bonus: Bonus amount before caps
-            base_salary_cap: 3x base salary cap
-            mrt_cap: MRT cap (if applicable)
-            
-        Returns:
-            Tuple of (final_bonus, cap_applied)
-        """
-        # Determine which cap applies
-        applicable_caps = [base_salary_cap]
-        if mrt_cap is not None:
-            applicable_caps.append(mrt_cap)
-        
-        # Apply the most restrictive cap
-        effective_cap = min(applicable_caps)
-        final_bonus = min(initial_bonus, effective_cap)
-        
-        # Determine which cap was applied (if any)
-        cap_applied = None
-        if final_bonus < initial_bonus:
-            if final_bonus == base_salary_cap and (mrt_cap is None or base_salary_cap <= mrt_cap):
-                cap_applied = "3x_base"
-            elif mrt_cap is not None and final_bonus == mrt_cap:
-                cap_applied = "mrt"
-        
-        return cls._round_currency(final_bonus), cap_applied
-    
-    @classmethod
-    def calculate_final_bonus(cls, inputs: CalculationInputs) -> CalculationResult:
-        """
-        Calculate the final bonus with all intermediate steps.
+        Input columns are read as NumPy buffers (no copy when already float64
+        or bool) and passed straight to calculate_final_bonus_batch. A pyarrow
+        Table (or anything else with to_pandas) is converted first.
         
         Args:
-            inputs: CalculationInputs object with all required parameters
+            df: One row per employee, with columns named as the
+                CalculationInputs fields base_salary through raf, plus
+                optional is_mrt (default False) and mrt_cap_pct (default NaN)
+            use_bonus_pool_limit: Whether to apply bonus pool limit
+            total_bonus_pool: Total bonus pool amount
+            total_calculated_bonuses: Pre-scaling total to scale against
+                (defaults to the sum of the batch's capped bonuses)
             
         Returns:
-            CalculationResult object with final bonus and all intermediate calculations
+            A new DataFrame: df plus the calculate_final_bonus_batch result
+            columns
             
         Raises:
-            ValidationError: If input validation fails
+            ValidationError: If any row fails validation
         """
-        # Validate inputs
-        cls.validate_inputs(inputs)
+        if not isinstance(df, pd.DataFrame):
+            df = df.to_pandas()
         
-        try:
-            # Step 1: Calculate target bonus
-            target_bonus = cls.calculate_target_bonus(
-                inputs.base_salary, 
-                inputs.target_bonus_pct
-            )
-            
-            # Step 2: Calculate weighted performance
-            weighted_performance = cls.calculate_weighted_performance(
-                inputs.investment_weight,
-                inputs.investment_score_multiplier,
-                inputs.qualitative_weight,
-                inputs.qual_score_multiplier
-            )
-            
-            # Step 3: Calculate pre-RAF bonus
-            pre_raf_bonus = cls.calculate_pre_raf_bonus(target_bonus, weighted_performance)
-            
-            # Step 4: Apply RAF
-            initial_bonus = cls.apply_raf(pre_raf_bonus, inputs.raf)
-            
-            # Step 5: Calculate caps
-            base_salary_cap, mrt_cap = cls.calculate_caps(
-                inputs.base_salary,
-                inputs.is_mrt,
-                inputs.mrt_cap_pct
-            )
-            
-            # Step 6: Apply caps
-            capped_bonus, cap_applied = cls.apply_caps(initial_bonus, base_salary_cap, mrt_cap)
-            
-            # Step 7: Apply bonus pool limit if enabled
-            final_bonus, pool_scaling_applied, pool_scaling_factor = cls.apply_bonus_pool_limit(
-                capped_bonus,
-                inputs.use_bonus_pool_limit,
-                inputs.total_bonus_pool,
-                inputs.total_calculated_bonuses
-            )
-            
-            # Create calculation steps for audit trail
-            calculation_steps = {
-                "base_salary": inputs.base_salary,
-                "target_bonus_pct": inputs.target_bonus_pct,
-                "investment_weight": inputs.investment_weight,
-                "investment_score_multiplier": inputs.investment_score_multiplier,
-                "qualitative_weight": inputs.qualitative_weight,
-                "qual_score_multiplier": inputs.qual_score_multiplier,
-                "raf": inputs.raf,
-                "target_bonus": target_bonus,
-                "weighted_performance": weighted_performance,
-                "pre_raf_bonus": pre_raf_bonus,
-                "initial_bonus": initial_bonus,
-                "capped_bonus": capped_bonus,
-                "final_bonus": final_bonus
-            }
-            
-            # Add pool scaling info to calculation steps if applied
-            if pool_scaling_applied and pool_scaling_factor is not None:
-                calculation_steps["pool_scaling_factor"] = pool_scaling_factor
-                if inputs.total_bonus_pool is not None:
-                    calculation_steps["total_bonus_pool"] = inputs.total_bonus_pool
-                if inputs.total_calculated_bonuses is not None:
-                    calculation_steps["total_calculated_bonuses"] = inputs.total_calculated_bonuses
-            
-            return CalculationResult(
-                target_bonus=target_bonus,
-                weighted_performance=weighted_performance,
-                pre_raf_bonus=pre_raf_bonus,
-                initial_bonus=initial_bonus,
-                base_salary_cap=base_salary_cap,
-                mrt_cap=mrt_cap,
-                final_bonus=final_bonus,
-                cap_applied=cap_applied,
-                pool_scaling_applied=pool_scaling_applied,
-                pool_scaling_factor=pool_scaling_factor,
-                pre_scaling_bonus=capped_bonus if pool_scaling_applied else None,
-                calculation_steps=calculation_steps
-            )
-            
-        except Exception as e:
-            logger.error(f"Calculation error: {str(e)}")
-            raise ValidationError(f"Calculation failed: {str(e)}")
+        arrays = {
+            name: df[name].to_numpy(np.float64, copy=False)
+            for name in ("base_salary", "target_bonus_pct", "investment_weight",
+                         "investment_score_multiplier", "qualitative_weight",
+                         "qual_score_multiplier", "raf")
+        }
+        arrays["is_mrt"] = (
+            df["is_mrt"].to_numpy(np.bool_, copy=False) if "is_mrt" in df
+            else np.zeros(len(df), dtype=np.bool_)
+        )
+        arrays["mrt_cap_pct"] = (
+            df["mrt_cap_pct"].to_numpy(np.float64, copy=False, na_value=np.nan) if "mrt_cap_pct" in df
+            else np.full(len(df), np.nan)
+        )
+        cls.validate_inputs_batch(arrays)
+        
+        batch = cls.calculate_final_bonus_batch(
+            arrays, use_bonus_pool_limit, total_bonus_pool, total_calculated_bonuses
+        )
+        del batch["capped_amount"]
+        return df.assign(**batch)
+    
+    @staticmethod
+    def batch_result_at(
+        inputs: CalculationInputs,
+        batch: Dict[str, np.ndarray],
+        index: int,
+        total_bonus_pool: Optional[float] = None,
+        total_calculated_bonuses: Optional[float] = None
+    ) -> CalculationResult:
+        """
+        Build the CalculationResult for one row of a calculate_final_bonus_batch
+        result.
+        """
+        target_bonus = float(batch["target_bonus"][index])
+        weighted_performance = float(batch["weighted_performance"][index])
+        pre_raf_bonus = float(batch["pre_raf_bonus"][index])
+        initial_bonus = float(batch["initial_bonus"][index])
+        capped_bonus = float(batch["capped_bonus"][index])
+        final_bonus = float(batch["final_bonus"][index])
+        mrt_cap = float(batch["mrt_cap"][index])
+        scaling_factor = float(batch["pool_scaling_factor"][index])
+        pool_scaling_applied = not np.isnan(scaling_factor)
+        
+        return CalculationResult(
+            target_bonus=target_bonus,
+            weighted_performance=weighted_performance,
+            pre_raf_bonus=pre_raf_bonus,
+            initial_bonus=initial_bonus,
+            base_salary_cap=float(batch["base_salary_cap"][index]),
+            mrt_cap=None if np.isnan(mrt_cap) else mrt_cap,
+            final_bonus=final_bonus,
+            cap_applied=batch["cap_applied"][index],
+            pool_scaling_applied=pool_scaling_applied,
+            pool_scaling_factor=scaling_factor if pool_scaling_applied else None,
+            pre_scaling_bonus=capped_bonus if pool_scaling_applied else None,
+            inputs=inputs,
+            capped_bonus=capped_bonus,
+            total_bonus_pool=total_bonus_pool,
+            total_calculated_bonuses=total_calculated_bonuses
+        )
 
     @classmethod
     def determine_salary_range(cls, salary: float) -> str:
@@ -1,16 +1,28 @@
-from typing import Generic, TypeVar, Type, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+import copy
+import functools
+from typing import Any, Generic, TypeVar, Type, Optional, List, Dict, Tuple
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import and_, or_, inspect, tuple_
 from ..database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+@functools.lru_cache(maxsize=None)
+def _mapped_columns(model: Type[Base]) -> frozenset:
+    """Mapped column attribute names of a model, computed once per model"""
+    return frozenset(attr.key for attr in inspect(model).mapper.column_attrs)
+
 class BaseDAL(Generic[ModelType]):
     """Base Data Access Layer class with common CRUD operations"""
     
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
+        # Records already loaded by this DAL, keyed by ID; a DAL lives for one
+        # request, so this only saves repeat SELECTs within that request
+        self._cache: Dict[str, ModelType] = {}
+        # Mapped column attributes that update() is allowed to set
+        self._columns = _mapped_columns(model)
     
     def create(self, obj_in: dict) -> ModelType:
         """Create a new record"""
@@ -18,31 +30,88 @@ class BaseDAL(Generic[ModelType]):
         self.db.add(db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self._cache[db_obj.id] = db_obj
         return db_obj
     
+    def bulk_create(self, rows: List[dict]) -> None:
+        """Insert many records in one executemany, skipping per-object unit-of-work"""
+        if rows:
+            self.db.bulk_insert_mappings(self.model, rows)
+            self.db.commit()
+    
     def get(self, id: str) -> Optional[ModelType]:
-        """Get a record by ID"""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        """Get a record by ID, from the identity cache when already loaded"""
+        db_obj = self._cache.get(id)
+        if db_obj is None:
+            db_obj = self.db.query(self.model).filter(self.model.id == id).first()
+            if db_obj is not None:
+                self._cache[id] = db_obj
+        return db_obj
+    
+    def invalidate(self, id: str) -> None:
+        """Drop one record from the identity cache"""
+        self._cache.pop(id, None)
+    
+    def clear_cache(self) -> None:
+        """Drop every record from the identity cache"""
+        self._cache.clear()
     
     def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get multiple records with pagination"""
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
-    def update(self, db_obj: ModelType, obj_in: dict) -> ModelType:
-        """Update an existing record"""
+    def _page(self, query, sort_column, limit: Optional[int] = 100,
+              cursor: Optional[Tuple[Any, Any]] = None) -> List[ModelType]:
+        """
+        Fetch one keyset page of query, ordered by (sort_column, id) descending.
+        
+        cursor is the (sort value, id) of the last row of the previous page;
+        seeking past it keeps later pages as cheap as the first, unlike OFFSET.
+        """
+        if cursor is not None:
+            query = query.filter(tuple_(sort_column, self.model.id) < tuple(cursor))
+        query = query.order_by(sort_column.desc(), self.model.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def _assign(self, db_obj: ModelType, obj_in: dict) -> None:
+        """Set the mapped columns present in obj_in on db_obj, without committing"""
         for field, value in obj_in.items():
-            if hasattr(db_obj, field):
+            if field in self._columns:
                 setattr(db_obj, field, value)
+    
+    def _snapshot(self, db_obj: ModelType) -> Dict[str, Any]:
+        """Column values of db_obj, detached from any session"""
+        return copy.deepcopy({column: getattr(db_obj, column) for column in self._columns})
+    
+    def _attach(self, snapshot: Dict[str, Any]) -> ModelType:
+        """Rebuild a record from a snapshot and add it to this session without a SELECT"""
+        db_obj = self.model(**copy.deepcopy(snapshot))
+        make_transient_to_detached(db_obj)
+        return self.db.merge(db_obj, load=False)
+    
+    def update(self, db_obj: ModelType, obj_in: dict) -> ModelType:
+        """Update an existing record"""
+        self._assign(db_obj, obj_in)
         self.db.commit()
         self.db.refresh(db_obj)
+        self._cache[db_obj.id] = db_obj
         return db_obj
     
+    def bulk_update(self, rows: List[dict]) -> None:
+        """Update many records by primary key; each dict must include the id"""
+        if rows:
+            self.db.bulk_update_mappings(self.model, rows)
+            self.db.commit()
+    
     def delete(self, id: str) -> bool:
         """Delete a record by ID"""
         db_obj = self.get(id)
         if db_obj:
             self.db.delete(db_obj)
             self.db.commit()
+            self.invalidate(id)
             return True
         return False
     
@@ -1,13 +1,23 @@
-from typing import Optional, List
+import time
+from typing import Optional, List, Dict, Iterator
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from .base import BaseDAL
-from ..models import BatchUpload
+from ..models import BatchUpload, EmployeeData
+
+# Batched progress updates are written every this many processed rows...
+PROGRESS_FLUSH_ROWS = 500
+# ...or once this many seconds have passed since the last write
+PROGRESS_FLUSH_SECONDS = 5.0
 
 class BatchUploadDAL(BaseDAL[BatchUpload]):
     """Data Access Layer for BatchUpload operations"""
     
     def __init__(self, db: Session):
         super().__init__(BatchUpload, db)
+        self._pending_progress: Dict[str, dict] = {}
+        self._flushed_rows: Dict[str, int] = {}
+        self._last_progress_flush = time.monotonic()
     
     def create_batch_upload(self, session_id: str, filename: str, 
                           original_filename: str, file_size: int) -> BatchUpload:
@@ -27,29 +37,75 @@ class BatchUploadDAL(BaseDAL[BatchUpload]):
             BatchUpload.session_id == session_id
         ).order_by(BatchUpload.created_at.desc()).all()
     
+    def iter_by_session(self, session_id: str, chunk: int = 200) -> Iterator[BatchUpload]:
+        """Stream a session's batch uploads newest first, fetching chunk rows at a time"""
+        return self.db.query(BatchUpload).filter(
+            BatchUpload.session_id == session_id
+        ).order_by(BatchUpload.created_at.desc()).yield_per(chunk)
+    
+    def _update_returning(self, upload_id: str, update_data: dict) -> Optional[BatchUpload]:
+        """
+        Apply update_data with one UPDATE ... RETURNING and return the row,
+        instead of a SELECT, an UPDATE and a refresh SELECT. Needs
+        PostgreSQL or SQLite >= 3.35.
+        """
+        stmt = (
+            update(BatchUpload)
+            .where(BatchUpload.id == upload_id)
+            .values(**update_data)
+            .returning(BatchUpload)
+        )
+        upload = self.db.execute(stmt).scalar_one_or_none()
+        self.db.commit()
+        if upload is not None:
+            self._cache[upload_id] = upload
+        return upload
+    
     def update_status(self, upload_id: str, status: str, 
                      error_message: Optional[str] = None) -> Optional[BatchUpload]:
         """Update batch upload status"""
-        upload = self.get(upload_id)
-        if upload:
-            update_data = {"status": status}
-            if error_message:
-                update_data["error_message"] = error_message
-            return self.update(upload, update_data)
-        return None
+        update_data = {"status": status}
+        if error_message:
+            update_data["error_message"] = error_message
+        return self._update_returning(upload_id, update_data)
     
     def update_progress(self, upload_id: str, total_rows: int, 
                        processed_rows: int, failed_rows: int = 0) -> Optional[BatchUpload]:
         """Update batch upload progress"""
-        upload = self.get(upload_id)
-        if upload:
-            update_data = {
-                "total_rows": total_rows,
-                "processed_rows": processed_rows,
-                "failed_rows": failed_rows
-            }
-            return self.update(upload, update_data)
-        return None
+        update_data = {
+            "total_rows": total_rows,
+            "processed_rows": processed_rows,
+            "failed_rows": failed_rows
+        }
+        return self._update_returning(upload_id, update_data)
+    
+    def update_progress_batched(self, upload_id: str, total_rows: int,
+                                processed_rows: int, failed_rows: int = 0,
+                                force: bool = False) -> None:
+        """
+        Queue a progress update and write queued updates only every
+        PROGRESS_FLUSH_ROWS rows or PROGRESS_FLUSH_SECONDS (or when forced)
+        """
+        self._pending_progress[upload_id] = {
+            "id": upload_id,
+            "total_rows": total_rows,
+            "processed_rows": processed_rows,
+            "failed_rows": failed_rows
+        }
+        if (force
+                or processed_rows - self._flushed_rows.get(upload_id, 0) >= PROGRESS_FLUSH_ROWS
+                or time.monotonic() - self._last_progress_flush >= PROGRESS_FLUSH_SECONDS):
+            self.flush_progress()
+    
+    def flush_progress(self) -> None:
+        """Write all queued progress updates in one bulk UPDATE"""
+        if not self._pending_progress:
+            return
+        self.bulk_update(list(self._pending_progress.values()))
+        for upload_id, row in self._pending_progress.items():
+            self._flushed_rows[upload_id] = row["processed_rows"]
+        self._pending_progress.clear()
+        self._last_progress_flush = time.monotonic()
     
     def get_by_status(self, status: str) -> List[BatchUpload]:
         """Get batch uploads by status"""
@@ -71,8 +127,11 @@ class BatchUploadDAL(BaseDAL[BatchUpload]):
         
     def update_calculation_parameters(self, upload_id: str, parameters: dict) -> Optional[BatchUpload]:
         """Update calculation parameters for a batch upload"""
-        upload = self.get(upload_id)
-        if upload:
-            update_data = {"calculation_parameters": parameters}
-            return self.update(upload, update_data)
-        return None
+        return self._update_returning(upload_id, {"calculation_parameters": parameters})
+
+
+class EmployeeDataDAL(BaseDAL[EmployeeData]):
+    """Data Access Layer for the employee rows parsed from a batch upload"""
+    
+    def __init__(self, db: Session):
+        super().__init__(EmployeeData, db)
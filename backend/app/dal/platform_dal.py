@@ -2,9 +2,16 @@
 Data Access Layer for Platform Transformation Models
 Provides tenant-aware database operations for the new multi-tenant platform.
 """
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, object_session, selectinload
+from sqlalchemy import and_, bindparam, column, event, func, select, table, text, update
+from redis.exceptions import RedisError
 
 from .base import BaseDAL
 from ..models import (
@@ -12,32 +19,85 @@ from ..models import (
     BonusPool, PlatformUpload, EmployeeRow, PlanRun, RunStepResult, 
     RunTotals, AuditEvent
 )
+from ..database import DATABASE_URL, engine
+from ..redis_client import get_redis, get_tenant_key
+
+logger = logging.getLogger(__name__)
+
+# Tenants are read on nearly every request but rarely change, so lookups are
+# cached in-process as column snapshots for this many seconds
+TENANT_CACHE_TTL = 300.0
+
+# Cache key -> (expires_at, snapshot or list of snapshots)
+_tenant_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+@event.listens_for(Tenant, "after_insert")
+@event.listens_for(Tenant, "after_update")
+@event.listens_for(Tenant, "after_delete")
+def _invalidate_tenant_cache(mapper, connection, target) -> None:
+    """Drop every cached tenant lookup on any tenant write."""
+    _tenant_cache.clear()
 
 
 class TenantDAL(BaseDAL[Tenant]):
     """Data Access Layer for Tenant operations."""
     
     def __init__(self, db: Session):
-        super().__init__(db, Tenant)
+        super().__init__(Tenant, db)
     
     def get_by_name(self, name: str) -> Optional[Tenant]:
-        """Get tenant by name."""
-        return self.db.query(self.model).filter(self.model.name == name).first()
+        """Get tenant by name, from the tenant cache when fresh."""
+        key = f"tenant:name:{name}"
+        snapshot = self._cached(key)
+        if snapshot is not None:
+            return self._attach(snapshot)
+        
+        tenant = self.db.query(self.model).filter(self.model.name == name).first()
+        if tenant is not None:
+            self._store(key, self._snapshot(tenant))
+        return tenant
     
     def get_active_tenants(self) -> List[Tenant]:
-        """Get all active tenants."""
-        return self.db.query(self.model).filter(self.model.is_active == True).all()
-    
-    def create_with_default_user(self, name: str, admin_email: str, admin_name: str = None) -> tuple[Tenant, User]:
-        """Create a new tenant with a default admin user."""
-        # Create tenant
-        tenant = self.create({
-            'name': name,
-            'is_active': True,
-            'tenant_metadata': {'created_by': admin_email}
-        })
-        
-        # Create admin user
+        """Get all active tenants, from the tenant cache when fresh."""
+        key = "tenant:active:list"
+        snapshots = self._cached(key)
+        if snapshots is not None:
+            return [self._attach(snapshot) for snapshot in snapshots]
+        
+        tenants = self.db.query(self.model).filter(self.model.is_active == True).all()
+        self._store(key, [self._snapshot(tenant) for tenant in tenants])
+        return tenants
+    
+    @staticmethod
+    def _cached(key: str) -> Any:
+        """Cached value for key, or None when missing or expired."""
+        entry = _tenant_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    @staticmethod
+    def _store(key: str, value: Any) -> None:
+        _tenant_cache[key] = (time.monotonic() + TENANT_CACHE_TTL, value)
+    
+    def create_with_default_user(self, name: str, admin_email: str, admin_name: str = None,
+                                 commit: bool = True) -> tuple[Tenant, User]:
+        """
+        Create a new tenant with a default admin user in one transaction.
+        
+        The tenant is only flushed (to assign its id), so it never becomes
+        visible without its admin. Pass commit=False to leave the commit to
+        the caller's unit of work.
+        """
+        tenant = self.model(
+            name=name,
+            is_active=True,
+            tenant_metadata={'created_by': admin_email}
+        )
+        self.db.add(tenant)
+        self.db.flush()
+        
         user = User(
             tenant_id=tenant.id,
             email=admin_email,
@@ -46,17 +106,31 @@ class TenantDAL(BaseDAL[Tenant]):
             is_active=True
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         
         return tenant, user
 
 
+# Per-request single-row lookups, built once at import with named bind
+# parameters so each call only binds values (as in session_dal)
+_USER_BY_EMAIL = select(User).where(
+    User.email == bindparam("email"),
+    User.tenant_id == bindparam("tenant_id")
+)
+_INPUT_BY_KEY = select(InputCatalog).where(
+    InputCatalog.key == bindparam("key"),
+    InputCatalog.tenant_id == bindparam("tenant_id")
+)
+
+
 class UserDAL(BaseDAL[User]):
     """Data Access Layer for User operations."""
     
     def __init__(self, db: Session, tenant_id: str = None):
-        super().__init__(db, User)
+        super().__init__(User, db)
         self.tenant_id = tenant_id
     
     def get_by_email(self, email: str, tenant_id: str = None) -> Optional[User]:
@@ -65,9 +139,9 @@ class UserDAL(BaseDAL[User]):
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(
-            and_(self.model.email == email, self.model.tenant_id == tid)
-        ).first()
+        return self.db.execute(
+            _USER_BY_EMAIL, {"email": email, "tenant_id": tid}
+        ).scalars().first()
     
     def get_by_tenant(self, tenant_id: str = None) -> List[User]:
         """Get all users for a tenant."""
@@ -88,11 +162,34 @@ class UserDAL(BaseDAL[User]):
         ).all()
 
 
+# The input catalog is read on every plan run and input validation but rarely
+# written, so each tenant's catalog is cached in Redis (when available) as JSON
+# column snapshots for this many seconds
+INPUT_CATALOG_CACHE_TTL = 300
+
+
+def _input_catalog_key(tenant_id: str) -> str:
+    return get_tenant_key(tenant_id, "input_catalog")
+
+
+@event.listens_for(InputCatalog, "after_insert")
+@event.listens_for(InputCatalog, "after_update")
+@event.listens_for(InputCatalog, "after_delete")
+def _invalidate_input_catalog_cache(mapper, connection, target) -> None:
+    """Drop the cached catalog of the written input's tenant."""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            redis.delete(_input_catalog_key(target.tenant_id))
+        except RedisError as e:
+            logger.warning("Failed to invalidate input catalog cache: %s", e)
+
+
 class InputCatalogDAL(BaseDAL[InputCatalog]):
     """Data Access Layer for Input Catalog operations."""
     
     def __init__(self, db: Session, tenant_id: str = None):
-        super().__init__(db, InputCatalog)
+        super().__init__(InputCatalog, db)
         self.tenant_id = tenant_id
     
     def get_by_key(self, key: str, tenant_id: str = None) -> Optional[InputCatalog]:
@@ -101,38 +198,204 @@ class InputCatalogDAL(BaseDAL[InputCatalog]):
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(
-            and_(self.model.key == key, self.model.tenant_id == tid)
-        ).first()
+        return self.db.execute(
+            _INPUT_BY_KEY, {"key": key, "tenant_id": tid}
+        ).scalars().first()
     
     def get_by_tenant(self, tenant_id: str = None) -> List[InputCatalog]:
-        """Get all input definitions for a tenant."""
+        """Get all input definitions for a tenant, from the catalog cache when fresh."""
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(self.model.tenant_id == tid).all()
+        snapshots = self._cached_catalog(tid)
+        if snapshots is not None:
+            return [self._attach(snapshot) for snapshot in snapshots]
+        
+        inputs = self.db.query(self.model).filter(self.model.tenant_id == tid).all()
+        self._store_catalog(tid, inputs)
+        return inputs
     
     def get_required_inputs(self, tenant_id: str = None) -> List[InputCatalog]:
-        """Get required input definitions for a tenant."""
-        tid = tenant_id or self.tenant_id
-        if not tid:
-            raise ValueError("tenant_id is required")
+        """Get required input definitions for a tenant (served from the cached catalog)."""
+        return [input_def for input_def in self.get_by_tenant(tenant_id) if input_def.required]
+    
+    @staticmethod
+    def _cached_catalog(tenant_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached catalog snapshots for tenant_id, or None on a miss or without Redis."""
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            cached = redis.get(_input_catalog_key(tenant_id))
+        except RedisError as e:
+            logger.warning("Failed to read input catalog cache: %s", e)
+            return None
+        if cached is None:
+            return None
         
-        return self.db.query(self.model).filter(
-            and_(self.model.tenant_id == tid, self.model.required == True)
-        ).all()
+        snapshots = json.loads(cached)
+        for snapshot in snapshots:
+            if snapshot.get("created_at"):
+                snapshot["created_at"] = datetime.fromisoformat(snapshot["created_at"])
+        return snapshots
+    
+    def _store_catalog(self, tenant_id: str, inputs: List[InputCatalog]) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        payload = json.dumps(
+            [{column: getattr(input_def, column) for column in self._columns} for input_def in inputs],
+            default=lambda value: value.isoformat(),  # datetimes are the only non-JSON columns
+        )
+        try:
+            redis.setex(_input_catalog_key(tenant_id), INPUT_CATALOG_CACHE_TTL, payload)
+        except RedisError as e:
+            logger.warning("Failed to write input catalog cache: %s", e)
+
+
+# Plan list summaries (step/input/run counts and last run) are read from the
+# mv_plan_summary materialized view on PostgreSQL (revision p1e2f3a4b5c6);
+# SQLite computes them inline. Commits that wrote any of the aggregated
+# tables queue one background REFRESH ... CONCURRENTLY, so the counts trail
+# writes briefly while the plan rows themselves are always current.
+PLAN_SUMMARY_VIEW = not DATABASE_URL.startswith("sqlite")
+
+_plan_summary = table(
+    "mv_plan_summary",
+    column("plan_id"), column("step_count"), column("input_count"),
+    column("run_count"), column("last_run_at"),
+)
+_plan_summary_refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan-summary")
+# Set while a refresh is queued but not yet started; later commits ride on it
+_plan_summary_queued = threading.Event()
+
+
+def _mark_plan_summary_stale(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["plan_summary_stale"] = True
+
+
+def _schedule_plan_summary_refresh(session) -> None:
+    """Queue a view refresh after a commit that changed plans, steps, inputs or runs."""
+    if session.info.pop("plan_summary_stale", False) and not _plan_summary_queued.is_set():
+        _plan_summary_queued.set()
+        _plan_summary_refresher.submit(_refresh_plan_summary)
+
+
+def _refresh_plan_summary() -> None:
+    _plan_summary_queued.clear()  # commits from here on queue another refresh
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_plan_summary"))
+    except Exception as e:
+        logger.warning("Failed to refresh mv_plan_summary: %s", e)
+
+
+if PLAN_SUMMARY_VIEW:
+    for _model in (BonusPlan, PlanStep, PlanInput, PlanRun):
+        for _event in ("after_insert", "after_update", "after_delete"):
+            event.listen(_model, _event, _mark_plan_summary_stale)
+    event.listen(Session, "after_commit", _schedule_plan_summary_refresh)
+
+
+# Fields of the full plan document returned by BonusPlanDAL.get_plan_full
+_PLAN_FIELDS = ("id", "tenant_id", "name", "version", "status", "effective_from", "effective_to",
+                "notes", "plan_metadata", "created_by", "created_at", "locked_by", "locked_at")
+_STEP_FIELDS = ("id", "plan_id", "step_order", "name", "expr", "condition_expr", "outputs", "notes")
+_INPUT_FIELDS = ("id", "plan_id", "input_id", "required", "source_mapping")
+_INPUT_DEFINITION_FIELDS = ("key", "label", "dtype", "required", "default_value", "validation")
+
+
+def _jsonb_fields(alias: str, fields: Tuple[str, ...]) -> str:
+    return ", ".join(f"'{field}', {alias}.{field}" for field in fields)
+
+
+# PostgreSQL builds the whole plan document (plan, ordered steps, inputs with
+# their catalog definitions) server-side in one statement
+_PLAN_FULL = text(f"""
+    SELECT jsonb_build_object(
+        {_jsonb_fields("p", _PLAN_FIELDS)},
+        'steps', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object({_jsonb_fields("s", _STEP_FIELDS)}) ORDER BY s.step_order)
+            FROM plan_steps s WHERE s.plan_id = p.id
+        ), '[]'::jsonb),
+        'inputs', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                {_jsonb_fields("i", _INPUT_FIELDS)},
+                'input_definition', jsonb_build_object({_jsonb_fields("c", _INPUT_DEFINITION_FIELDS)})
+            ))
+            FROM plan_inputs i JOIN input_catalog c ON c.id = i.input_id
+            WHERE i.plan_id = p.id
+        ), '[]'::jsonb)
+    )
+    FROM bonus_plans p
+    WHERE p.id = :plan_id AND p.tenant_id = :tenant_id
+""")
+
+
+def _fields(obj, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    return {field: getattr(obj, field) for field in fields}
 
 
 class BonusPlanDAL(BaseDAL[BonusPlan]):
     """Data Access Layer for Bonus Plan operations."""
     
     def __init__(self, db: Session, tenant_id: str = None):
-        super().__init__(db, BonusPlan)
+        super().__init__(BonusPlan, db)
         self.tenant_id = tenant_id
     
-    def get_by_tenant(self, tenant_id: str = None, status: str = None) -> List[BonusPlan]:
-        """Get bonus plans for a tenant, optionally filtered by status."""
+    def get_by_tenant(self, tenant_id: str = None, status: str = None,
+                      include_steps: bool = False, include_inputs: bool = False) -> List[BonusPlan]:
+        """
+        Get bonus plans for a tenant, optionally filtered by status.
+        
+        include_steps / include_inputs eager-load plan_steps and plan_inputs
+        (with their input definitions) in one extra SELECT per relationship,
+        instead of one per plan when a caller walks them.
+        """
+        return self._tenant_query(tenant_id, status, include_steps, include_inputs).all()
+    
+    def get_by_tenant_with_summary(self, tenant_id: str = None, status: str = None,
+                                   include_steps: bool = False,
+                                   include_inputs: bool = False) -> List[Tuple[BonusPlan, Dict[str, Any]]]:
+        """
+        Like get_by_tenant, paired with each plan's step/input/run counts and
+        last run time, read in the same query (from mv_plan_summary on PostgreSQL).
+        """
+        if PLAN_SUMMARY_VIEW:
+            summary_columns = (
+                _plan_summary.c.step_count, _plan_summary.c.input_count,
+                _plan_summary.c.run_count, _plan_summary.c.last_run_at,
+            )
+        else:
+            plan_id = self.model.id
+            summary_columns = (
+                select(func.count(PlanStep.id)).where(PlanStep.plan_id == plan_id).scalar_subquery(),
+                select(func.count(PlanInput.id)).where(PlanInput.plan_id == plan_id).scalar_subquery(),
+                select(func.count(PlanRun.id)).where(PlanRun.plan_id == plan_id).scalar_subquery(),
+                select(func.max(PlanRun.started_at)).where(PlanRun.plan_id == plan_id).scalar_subquery(),
+            )
+        
+        query = self._tenant_query(tenant_id, status, include_steps, include_inputs)
+        query = query.add_columns(*summary_columns)
+        if PLAN_SUMMARY_VIEW:
+            # Outer join: plans created since the last refresh have no row yet
+            query = query.outerjoin(_plan_summary, _plan_summary.c.plan_id == self.model.id)
+        
+        return [
+            (plan, {
+                'step_count': step_count or 0,
+                'input_count': input_count or 0,
+                'run_count': run_count or 0,
+                'last_run_at': last_run_at,
+            })
+            for plan, step_count, input_count, run_count, last_run_at in query.all()
+        ]
+    
+    def _tenant_query(self, tenant_id: Optional[str], status: Optional[str],
+                      include_steps: bool, include_inputs: bool):
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
@@ -140,8 +403,51 @@ class BonusPlanDAL(BaseDAL[BonusPlan]):
         query = self.db.query(self.model).filter(self.model.tenant_id == tid)
         if status:
             query = query.filter(self.model.status == status)
+        if include_steps:
+            query = query.options(selectinload(self.model.plan_steps))
+        if include_inputs:
+            query = query.options(
+                selectinload(self.model.plan_inputs).selectinload(PlanInput.input_definition)
+            )
         
-        return query.order_by(self.model.created_at.desc()).all()
+        return query.order_by(self.model.created_at.desc())
+    
+    def get_plan_full(self, plan_id: str, tenant_id: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a plan with its steps (in step order) and inputs (with their
+        input definitions) as one plain dict, ready for the API layer.
+        
+        On PostgreSQL the document is assembled with jsonb aggregation in a
+        single round trip (datetimes arrive as ISO strings); elsewhere the
+        plan is loaded with its relationships eager-loaded.
+        """
+        tid = tenant_id or self.tenant_id
+        if not tid:
+            raise ValueError("tenant_id is required")
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            return self.db.execute(_PLAN_FULL, {"plan_id": plan_id, "tenant_id": tid}).scalar_one_or_none()
+        
+        plan = self.db.query(self.model).filter(
+            self.model.id == plan_id, self.model.tenant_id == tid
+        ).options(
+            selectinload(self.model.plan_steps),
+            selectinload(self.model.plan_inputs).selectinload(PlanInput.input_definition)
+        ).first()
+        if plan is None:
+            return None
+        
+        plan_data = _fields(plan, _PLAN_FIELDS)
+        plan_data['steps'] = [
+            _fields(step, _STEP_FIELDS)
+            for step in sorted(plan.plan_steps, key=lambda step: step.step_order)
+        ]
+        plan_data['inputs'] = [
+            {**_fields(plan_input, _INPUT_FIELDS),
+             'input_definition': _fields(plan_input.input_definition, _INPUT_DEFINITION_FIELDS)}
+            for plan_input in plan.plan_inputs
+        ]
+        return plan_data
     
     def get_by_name_and_version(self, name: str, version: int, tenant_id: str = None) -> Optional[BonusPlan]:
         """Get specific plan version."""
@@ -168,28 +474,37 @@ class BonusPlanDAL(BaseDAL[BonusPlan]):
         ).order_by(self.model.version.desc()).first()
     
     def lock_plan(self, plan_id: str, locked_by: str) -> bool:
-        """Lock a plan to prevent further modifications."""
-        plan = self.get_by_id(plan_id)
-        if not plan or plan.status != 'draft':
-            return False
-        
-        plan.status = 'locked'
-        plan.locked_by = locked_by
-        plan.locked_at = self.db.execute("SELECT datetime('now')").scalar()
+        """
+        Lock a plan to prevent further modifications.
         
+        One UPDATE guarded on status = 'draft', so the check and the lock are
+        atomic; returns False when the plan is missing or not a draft.
+        """
+        result = self.db.execute(
+            update(self.model)
+            .where(and_(self.model.id == plan_id, self.model.status == 'draft'))
+            .values(status='locked', locked_by=locked_by, locked_at=datetime.utcnow())
+        )
         self.db.commit()
-        return True
+        self.invalidate(plan_id)
+        return result.rowcount == 1
 
 
 class PlanRunDAL(BaseDAL[PlanRun]):
     """Data Access Layer for Plan Run operations."""
     
     def __init__(self, db: Session, tenant_id: str = None):
-        super().__init__(db, PlanRun)
+        super().__init__(PlanRun, db)
         self.tenant_id = tenant_id
     
-    def get_by_tenant(self, tenant_id: str = None, status: str = None) -> List[PlanRun]:
-        """Get plan runs for a tenant, optionally filtered by status."""
+    def get_by_tenant(self, tenant_id: str = None, status: str = None, limit: int = 100,
+                      cursor: Optional[Tuple[datetime, str]] = None) -> List[PlanRun]:
+        """
+        Get a page of plan runs for a tenant, newest first, optionally filtered by status.
+        
+        Pass the (started_at, id) of the last run of the previous page as
+        cursor to fetch the next one.
+        """
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
@@ -198,17 +513,34 @@ class PlanRunDAL(BaseDAL[PlanRun]):
         if status:
             query = query.filter(self.model.status == status)
         
-        return query.order_by(self.model.started_at.desc()).all()
+        # Run listings show the one-row totals; step_results stay lazy since
+        # they hold a row per employee per step
+        return self._page(query.options(selectinload(self.model.totals)),
+                          self.model.started_at, limit, cursor)
     
-    def get_by_plan(self, plan_id: str, tenant_id: str = None) -> List[PlanRun]:
-        """Get all runs for a specific plan."""
+    def get_by_plan(self, plan_id: str, tenant_id: str = None, limit: int = 100,
+                    cursor: Optional[Tuple[datetime, str]] = None) -> List[PlanRun]:
+        """Get a page of runs for a specific plan, newest first (see get_by_tenant)."""
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(
-            and__(self.model.plan_id == plan_id, self.model.tenant_id == tid)
-        ).order_by(self.model.started_at.desc()).all()
+        query = self.db.query(self.model).filter(
+            self.model.plan_id == plan_id, self.model.tenant_id == tid
+        ).options(selectinload(self.model.totals))
+        return self._page(query, self.model.started_at, limit, cursor)
+    
+    def iter_by_tenant(self, tenant_id: str = None, status: str = None,
+                       chunk: int = 1000) -> Iterator[PlanRun]:
+        """Stream all of a tenant's plan runs newest first, fetching chunk rows at a time."""
+        tid = tenant_id or self.tenant_id
+        if not tid:
+            raise ValueError("tenant_id is required")
+        
+        query = self.db.query(self.model).filter(self.model.tenant_id == tid)
+        if status:
+            query = query.filter(self.model.status == status)
+        return query.order_by(self.model.started_at.desc(), self.model.id.desc()).yield_per(chunk)
     
     def update_status(self, run_id: str, status: str, finished_at = None) -> bool:
         """Update run status."""
@@ -228,52 +560,104 @@ class AuditEventDAL(BaseDAL[AuditEvent]):
     """Data Access Layer for Audit Event operations."""
     
     def __init__(self, db: Session, tenant_id: str = None):
-        super().__init__(db, AuditEvent)
+        super().__init__(AuditEvent, db)
         self.tenant_id = tenant_id
     
     def log_event(self, action: str, entity: str, entity_id: str, 
                   actor_user_id: str = None, before: Dict[str, Any] = None, 
-                  after: Dict[str, Any] = None, tenant_id: str = None) -> AuditEvent:
-        """Log an audit event."""
+                  after: Dict[str, Any] = None, tenant_id: str = None,
+                  commit: bool = True) -> AuditEvent:
+        """
+        Log an audit event.
+        
+        Pass commit=False to only flush the event, so it is committed with the
+        caller's unit of work instead of in its own transaction. Either way the
+        row is not re-read after the write.
+        """
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
         
-        event = self.create({
-            'tenant_id': tid,
-            'actor_user_id': actor_user_id,
-            'action': action,
-            'entity': entity,
-            'entity_id': entity_id,
-            'before': before,
-            'after': after
-        })
+        event = self.model(
+            tenant_id=tid,
+            actor_user_id=actor_user_id,
+            action=action,
+            entity=entity,
+            entity_id=entity_id,
+            before=before,
+            after=after
+        )
+        self.db.add(event)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         
         return event
     
-    def get_by_entity(self, entity: str, entity_id: str, tenant_id: str = None) -> List[AuditEvent]:
-        """Get audit trail for a specific entity."""
+    def get_by_entity(self, entity: str, entity_id: str, tenant_id: str = None,
+                      limit: Optional[int] = 100,
+                      cursor: Optional[Tuple[datetime, int]] = None) -> List[AuditEvent]:
+        """
+        Get a page of the audit trail for a specific entity, newest first.
+        
+        Pass the (at, id) of the last event of the previous page as cursor to
+        fetch the next one; limit=None returns the rest of the trail.
+        """
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(
+        query = self.db.query(self.model).filter(
             and_(
                 self.model.entity == entity,
                 self.model.entity_id == entity_id,
                 self.model.tenant_id == tid
             )
-        ).order_by(self.model.at.desc()).all()
+        )
+        return self._page(query, self.model.at, limit, cursor)
     
-    def get_by_actor(self, actor_user_id: str, tenant_id: str = None) -> List[AuditEvent]:
-        """Get audit trail for a specific actor."""
+    def get_by_actor(self, actor_user_id: str, tenant_id: str = None,
+                     limit: Optional[int] = 100,
+                     cursor: Optional[Tuple[datetime, int]] = None) -> List[AuditEvent]:
+        """Get a page of the audit trail for a specific actor (see get_by_entity)."""
         tid = tenant_id or self.tenant_id
         if not tid:
             raise ValueError("tenant_id is required")
         
-        return self.db.query(self.model).filter(
+        query = self.db.query(self.model).filter(
             and_(
                 self.model.actor_user_id == actor_user_id,
                 self.model.tenant_id == tid
             )
-        ).order_by(self.model.at.desc()).all()
\ No newline at end of file
+        )
+        return self._page(query, self.model.at, limit, cursor)
+    
+    def iter_by_entity(self, entity: str, entity_id: str, tenant_id: str = None,
+                       chunk: int = 1000) -> Iterator[AuditEvent]:
+        """
+        Stream an entity's whole audit trail newest first, fetching chunk rows
+        at a time (a server-side cursor on PostgreSQL), for exports that
+        would not fit in memory as a list.
+        """
+        tid = tenant_id or self.tenant_id
+        if not tid:
+            raise ValueError("tenant_id is required")
+        
+        return self.db.query(self.model).filter(
+            self.model.entity == entity,
+            self.model.entity_id == entity_id,
+            self.model.tenant_id == tid
+        ).order_by(self.model.at.desc(), self.model.id.desc()).yield_per(chunk)
+    
+    def iter_by_actor(self, actor_user_id: str, tenant_id: str = None,
+                      chunk: int = 1000) -> Iterator[AuditEvent]:
+        """Stream an actor's whole audit trail newest first (see iter_by_entity)."""
+        tid = tenant_id or self.tenant_id
+        if not tid:
+            raise ValueError("tenant_id is required")
+        
+        return self.db.query(self.model).filter(
+            self.model.actor_user_id == actor_user_id,
+            self.model.tenant_id == tid
+        ).order_by(self.model.at.desc(), self.model.id.desc()).yield_per(chunk)
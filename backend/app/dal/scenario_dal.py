@@ -8,8 +8,9 @@ including CRUD operations, auditing, and scenario management functionality.
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
+import uuid
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, exists, insert, literal, select
 
 from .base import BaseDAL
 from ..models import BatchScenario, ScenarioAuditLog, BatchCalculationResult
@@ -24,24 +25,34 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
     def __init__(self, db: Session):
         super().__init__(BatchScenario, db)
     
-    def create_with_audit(self, obj_in: BatchScenarioCreate) -> BatchScenario:
+    def create_with_audit(self, obj_in: BatchScenarioCreate, commit: bool = True) -> BatchScenario:
         """
         Create a new scenario with audit logging.
         
+        The scenario and its audit row are written in one transaction.
+        
         Args:
             obj_in: Scenario creation data
+            commit: Whether to commit; pass False to leave the commit to the
+                caller's unit of work
             
         Returns:
             Created scenario
         """
-        # Convert Pydantic model to dict for BaseDAL.create
         scenario_data = obj_in.model_dump()
-        scenario = self.create(scenario_data)
+        scenario = self.model(**scenario_data)
+        self.db.add(scenario)
+        self.db.flush()  # assigns scenario.id for the audit row
+        self._cache[scenario.id] = scenario
+        
         self._create_audit_log(
             scenario_id=scenario.id,
             action="created",
             new_values=scenario_data
         )
+        
+        if commit:
+            self.db.commit()
         return scenario
     
     def update(self, id: str, obj_in: BatchScenarioUpdate) -> Optional[BatchScenario]:
@@ -65,7 +76,8 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
         # Use base class update method
         return super().update(db_obj, update_data)
     
-    def update_with_audit(self, id: str, obj_in: BatchScenarioUpdate, old_scenario: Optional[BatchScenario] = None) -> Optional[BatchScenario]:
+    def update_with_audit(self, id: str, obj_in: BatchScenarioUpdate, old_scenario: Optional[BatchScenario] = None,
+                          commit: bool = True) -> Optional[BatchScenario]:
         """
         Update a scenario with audit logging.
         
@@ -73,6 +85,8 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             id: Scenario ID
             obj_in: Update data
             old_scenario: Optional existing scenario (to avoid extra query)
+            commit: Whether to commit; pass False to leave the commit to the
+                caller's unit of work
             
         Returns:
             Updated scenario or None if not found
@@ -90,34 +104,38 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             "parameters": old_scenario.parameters
         }
         
-        updated_scenario = self.update(id, obj_in)
-        
-        if updated_scenario:
-            # Only log changes that actually occurred
-            new_values = {}
-            if obj_in.name is not None and obj_in.name != old_scenario.name:
-                new_values["name"] = obj_in.name
-            if obj_in.description is not None and obj_in.description != old_scenario.description:
-                new_values["description"] = obj_in.description
-            if obj_in.parameters is not None and obj_in.parameters != old_scenario.parameters:
-                new_values["parameters"] = obj_in.parameters
-            
-            if new_values:  # Only log if there were actual changes
-                self._create_audit_log(
-                    scenario_id=id,
-                    action="updated",
-                    old_values=old_values,
-                    new_values=new_values
-                )
-        
-        return updated_scenario
+        # Only log changes that actually occurred (compared against the
+        # snapshot, since old_scenario is the object being updated)
+        new_values = {}
+        if obj_in.name is not None and obj_in.name != old_values["name"]:
+            new_values["name"] = obj_in.name
+        if obj_in.description is not None and obj_in.description != old_values["description"]:
+            new_values["description"] = obj_in.description
+        if obj_in.parameters is not None and obj_in.parameters != old_values["parameters"]:
+            new_values["parameters"] = obj_in.parameters
+        
+        # Update and audit row share one commit
+        self._assign(old_scenario, obj_in.model_dump(exclude_unset=True))
+        if new_values:  # Only log if there were actual changes
+            self._create_audit_log(
+                scenario_id=id,
+                action="updated",
+                old_values=old_values,
+                new_values=new_values
+            )
+        if commit:
+            self.db.commit()
+        
+        return old_scenario
     
-    def delete_with_audit(self, id: str) -> bool:
+    def delete_with_audit(self, id: str, commit: bool = True) -> bool:
         """
         Delete a scenario with audit logging.
         
         Args:
             id: Scenario ID
+            commit: Whether to commit; pass False to leave the commit to the
+                caller's unit of work
             
         Returns:
             True if deleted, False if not found
@@ -139,7 +157,16 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             old_values=old_values
         )
         
-        return self.delete(id)
+        # Audit row and delete share one commit; flush first so the delete
+        # cascade sees the new audit row as it did when it was committed
+        self.db.flush()
+        self.db.delete(scenario)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        self.invalidate(id)
+        return True
     
     def get_by_session(self, session_id: str, limit: Optional[int] = None) -> List[BatchScenario]:
         """
@@ -190,14 +217,10 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             query = query.filter(self.model.created_at >= created_after)
         
         if has_calculations is not None:
-            if has_calculations:
-                query = query.join(BatchCalculationResult).filter(
-                    BatchCalculationResult.scenario_id == self.model.id
-                )
-            else:
-                query = query.outerjoin(BatchCalculationResult).filter(
-                    BatchCalculationResult.scenario_id.is_(None)
-                )
+            # Correlated (NOT) EXISTS: a semi-join that matches each scenario
+            # once, however many calculation results it has
+            has_results = exists().where(BatchCalculationResult.scenario_id == self.model.id)
+            query = query.filter(has_results if has_calculations else ~has_results)
         
         query = query.order_by(desc(self.model.updated_at))
         
@@ -206,7 +229,8 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
         
         return query.all()
     
-    def duplicate_scenario(self, scenario_id: str, new_name: str, new_description: Optional[str] = None) -> Optional[BatchScenario]:
+    def duplicate_scenario(self, scenario_id: str, new_name: str, new_description: Optional[str] = None,
+                           commit: bool = True) -> Optional[BatchScenario]:
         """
         Create a duplicate of an existing scenario.
         
@@ -214,22 +238,46 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             scenario_id: ID of scenario to duplicate
             new_name: Name for the new scenario
             new_description: Optional description for the new scenario
+            commit: Whether to commit; pass False to leave the commit to the
+                caller's unit of work
             
         Returns:
             New scenario or None if original not found
         """
-        original = self.get(scenario_id)
-        if not original:
+        source = self.model
+        original_name = self.db.execute(
+            select(source.name).where(source.id == scenario_id)
+        ).scalar_one_or_none()
+        if original_name is None:
             return None
         
-        duplicate_data = BatchScenarioCreate(
-            session_id=original.session_id,
-            name=new_name,
-            description=new_description or f"Copy of {original.name}",
-            parameters=original.parameters
+        # Copy the row server-side with INSERT ... SELECT, so the parameters
+        # JSON is not shipped to Python and back just to be written again
+        new_id = str(uuid.uuid4())
+        self.db.execute(
+            insert(source).from_select(
+                ["id", "session_id", "name", "description", "parameters"],
+                select(
+                    literal(new_id),
+                    source.session_id,
+                    literal(new_name),
+                    literal(new_description or f"Copy of {original_name}"),
+                    source.parameters
+                ).where(source.id == scenario_id)
+            )
         )
+        duplicate = self.get(new_id)
         
-        duplicate = self.create_with_audit(duplicate_data)
+        self._create_audit_log(
+            scenario_id=duplicate.id,
+            action="created",
+            new_values={
+                "session_id": duplicate.session_id,
+                "name": duplicate.name,
+                "description": duplicate.description,
+                "parameters": duplicate.parameters
+            }
+        )
         
         # Log the duplication action
         self._create_audit_log(
@@ -237,25 +285,32 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
             action="duplicated",
             new_values={
                 "duplicated_from": scenario_id,
-                "original_name": original.name
+                "original_name": original_name
             }
         )
         
+        # New scenario and both audit rows share one commit
+        if commit:
+            self.db.commit()
         return duplicate
     
-    def log_calculation(self, scenario_id: str, calculation_details: Dict[str, Any]) -> None:
+    def log_calculation(self, scenario_id: str, calculation_details: Dict[str, Any], commit: bool = True) -> None:
         """
         Log when a calculation is performed on a scenario.
         
         Args:
             scenario_id: Scenario ID
             calculation_details: Details about the calculation performed
+            commit: Whether to commit; pass False to leave the commit to the
+                caller's unit of work
         """
         self._create_audit_log(
             scenario_id=scenario_id,
             action="calculated",
             new_values=calculation_details
         )
+        if commit:
+            self.db.commit()
     
     def get_audit_history(self, scenario_id: str, limit: Optional[int] = None) -> List[ScenarioAuditLog]:
         """
@@ -285,7 +340,10 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
         new_values: Optional[Dict[str, Any]] = None
     ) -> ScenarioAuditLog:
         """
-        Create an audit log entry.
+        Add an audit log entry to the current transaction.
+        
+        The entry is not committed here; the calling operation commits it
+        together with the change it records.
         
         Args:
             scenario_id: Scenario ID
@@ -304,8 +362,7 @@ class ScenarioDAL(BaseDAL[BatchScenario]):
         )
         
         self.db.add(audit_log)
-        self.db.commit()
         
-        logger.info(f"Audit log created: scenario={scenario_id}, action={action}")
+        logger.info("Audit log created: scenario=%s, action=%s", scenario_id, action)
         
         return audit_log 
\ No newline at end of file
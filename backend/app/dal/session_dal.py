@@ -1,9 +1,22 @@
 from typing import Optional, List
+from sqlalchemy import bindparam, delete, select
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from .base import BaseDAL
 from ..models import Session as SessionModel
 
+# Statements built once at import with named bind parameters; each call only
+# binds values, and "now" is computed once per call and shared by every clause
+_ACTIVE_SESSION = select(SessionModel).where(
+    SessionModel.id == bindparam("session_id"),
+    SessionModel.expires_at > bindparam("now")
+)
+_DELETE_EXPIRED = delete(SessionModel).where(SessionModel.expires_at <= bindparam("now"))
+_EXPIRING_SOON = select(SessionModel).where(
+    SessionModel.expires_at <= bindparam("cutoff"),
+    SessionModel.expires_at > bindparam("now")
+)
+
 class SessionDAL(BaseDAL[SessionModel]):
     """Data Access Layer for Session operations"""
     
@@ -19,10 +32,9 @@ class SessionDAL(BaseDAL[SessionModel]):
     
     def get_active_session(self, session_id: str) -> Optional[SessionModel]:
         """Get an active (non-expired) session"""
-        return self.db.query(SessionModel).filter(
-            SessionModel.id == session_id,
-            SessionModel.expires_at > datetime.utcnow()
-        ).first()
+        return self.db.execute(
+            _ACTIVE_SESSION, {"session_id": session_id, "now": datetime.utcnow()}
+        ).scalars().first()
     
     def extend_session(self, session_id: str, hours: int = 24) -> Optional[SessionModel]:
         """Extend session expiration time"""
@@ -34,21 +46,15 @@ class SessionDAL(BaseDAL[SessionModel]):
     
     def cleanup_expired_sessions(self) -> int:
         """Remove expired sessions and return count of deleted sessions"""
-        expired_count = self.db.query(SessionModel).filter(
-            SessionModel.expires_at <= datetime.utcnow()
-        ).count()
-        
-        self.db.query(SessionModel).filter(
-            SessionModel.expires_at <= datetime.utcnow()
-        ).delete()
-        
+        # One DELETE; its rowcount is the number removed
+        result = self.db.execute(_DELETE_EXPIRED, {"now": datetime.utcnow()})
         self.db.commit()
-        return expired_count
+        self.clear_cache()
+        return result.rowcount
     
     def get_sessions_expiring_soon(self, hours: int = 1) -> List[SessionModel]:
         """Get sessions that will expire within specified hours"""
-        cutoff_time = datetime.utcnow() + timedelta(hours=hours)
-        return self.db.query(SessionModel).filter(
-            SessionModel.expires_at <= cutoff_time,
-            SessionModel.expires_at > datetime.utcnow()
-        ).all()
+        now = datetime.utcnow()
+        return self.db.execute(
+            _EXPIRING_SOON, {"cutoff": now + timedelta(hours=hours), "now": now}
+        ).scalars().all()
@@ -0,0 +1,52 @@
+"""
+Unit of Work for request-scoped writes
+
+Groups the writes of several DALs that share one Session into a single
+transaction, committed once when the block exits.
+"""
+
+from functools import cached_property
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from .scenario_dal import ScenarioDAL
+from .platform_dal import AuditEventDAL, BonusPlanDAL
+
+
+class UnitOfWork:
+    """
+    Request-scoped unit of work over one Session.
+    
+    DAL methods called through it take commit=False, so they only add and
+    flush; leaving the with block commits everything at once, or rolls it
+    all back if the block raised::
+    
+        with UnitOfWork(db) as uow:
+            uow.scenarios.update_with_audit(scenario_id, update_data, commit=False)
+    """
+    
+    def __init__(self, db: Session, tenant_id: Optional[str] = None):
+        self.db = db
+        self.tenant_id = tenant_id
+    
+    @cached_property
+    def scenarios(self) -> ScenarioDAL:
+        return ScenarioDAL(self.db)
+    
+    @cached_property
+    def audit(self) -> AuditEventDAL:
+        return AuditEventDAL(self.db, self.tenant_id)
+    
+    @cached_property
+    def plans(self) -> BonusPlanDAL:
+        return BonusPlanDAL(self.db, self.tenant_id)
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.db.commit()
+        else:
+            self.db.rollback()
+        return False
@@ -1,6 +1,12 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Optional, Union
+import asyncio
+import functools
 import os
 import logging
 from dotenv import load_dotenv
@@ -13,27 +19,61 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./bonus_calculator.db")
 
 # Enhanced engine configuration for platform requirements
+@functools.lru_cache(maxsize=1)
 def create_db_engine():
-    """Create database engine with enhanced configuration."""
+    """
+    Create database engine with enhanced configuration.
+    
+    Memoized: every caller shares the one engine (and connection pool)
+    created for the module-level `engine`.
+    """
     if DATABASE_URL.startswith("sqlite"):
         # SQLite configuration (development)
-        return create_engine(
+        if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database exists per connection, so keep one
+            return create_engine(
+                DATABASE_URL,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+                echo=os.getenv("DB_ECHO", "false").lower() == "true",
+            )
+        # File database in WAL mode (see _set_sqlite_pragmas): readers run on
+        # their own pooled connections alongside the writer
+        engine = create_engine(
             DATABASE_URL,
             connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
+            poolclass=QueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
             echo=os.getenv("DB_ECHO", "false").lower() == "true",
         )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
     else:
         # PostgreSQL configuration (production)
         return create_engine(
             DATABASE_URL,
             pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
             max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
             pool_pre_ping=True,
+            pool_use_lifo=True,  # Reuse the most recent (warm) connection; idle extras age out
             pool_recycle=3600,  # Recycle connections after 1 hour
             echo=os.getenv("DB_ECHO", "false").lower() == "true",
         )
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Per-connection SQLite settings: WAL so readers do not block the writer,
+    synchronous=NORMAL (fsync at checkpoints rather than every commit, safe
+    under WAL) and a 256 MiB memory map for reads.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 engine = create_db_engine()
 
 # Create SessionLocal class
@@ -43,42 +83,143 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 class Base(DeclarativeBase):
     pass
 
+# Optional pre-baked SQLite schema (see bake_sqlite_schema.py) for throwaway
+# test/dev databases
+DB_BAKED_SCHEMA = os.getenv("DB_BAKED_SCHEMA")
+
 def init_db():
     """Initialize database by creating all tables"""
+    if DATABASE_URL.startswith("sqlite") and DB_BAKED_SCHEMA and os.path.exists(DB_BAKED_SCHEMA):
+        if _load_baked_schema(DB_BAKED_SCHEMA):
+            return
     # Import all models to ensure they are registered
     from . import models
     Base.metadata.create_all(bind=engine)
 
-# Tenant-aware session context
-_tenant_context = None
+def _load_baked_schema(path: str) -> bool:
+    """Load the baked schema script into an empty SQLite database in one call."""
+    raw = engine.raw_connection()
+    try:
+        if raw.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1").fetchone():
+            return False  # existing database: fall back to create_all
+        with open(path, encoding="utf-8") as fh:
+            raw.executescript(fh.read())
+        raw.commit()
+        logger.info(f"Loaded baked SQLite schema from {path}")
+        return True
+    finally:
+        raw.close()
+
+# Tenant-aware session context. A ContextVar is local to each request's task
+# (and copied into threadpool calls), so concurrent requests never see each
+# other's tenant; TenantMiddleware sets and resets it around every request.
+_tenant_context: ContextVar[Optional[str]] = ContextVar("tenant_id", default=None)
+
+def set_tenant_context(tenant_id: Optional[str]) -> Token:
+    """Set tenant context for RLS (Row Level Security); returns a token for reset_tenant_context."""
+    return _tenant_context.set(tenant_id)
 
-def set_tenant_context(tenant_id: str):
-    """Set tenant context for RLS (Row Level Security)."""
-    global _tenant_context
-    _tenant_context = tenant_id
+def reset_tenant_context(token: Token) -> None:
+    """Restore the tenant context in place before the matching set_tenant_context."""
+    _tenant_context.reset(token)
 
-def get_tenant_context() -> str:
+def get_tenant_context() -> Optional[str]:
     """Get current tenant context."""
-    return _tenant_context
+    return _tenant_context.get()
 
 def create_tenant_session(tenant_id: str):
-    """Create a database session with tenant context set for RLS."""
+    """Create a database session with tenant context set for RLS (see _apply_tenant_context)."""
     db = SessionLocal()
-    
-    # Set tenant context for PostgreSQL RLS
-    if not DATABASE_URL.startswith("sqlite") and tenant_id:
-        try:
-            # Set both tenant_id and current_tenant_id for compatibility
-            db.execute(text("SELECT set_config('app.tenant_id', :tenant_id, true)"), 
-                      {'tenant_id': tenant_id})
-            db.execute(text("SELECT set_config('app.current_tenant_id', :tenant_id, true)"), 
-                      {'tenant_id': tenant_id})
-            logger.debug(f"Set tenant context: {tenant_id}")
-        except Exception as e:
-            logger.warning(f"Failed to set tenant context: {e}")
-    
+    db.info['tenant_id'] = tenant_id
     return db
 
+# Both names are set for compatibility, in one round trip. They are
+# transaction-local (is_local true): PostgreSQL drops them when the
+# transaction ends, however it ends, so a pooled connection never carries one
+# tenant's context into another session or into raw engine.connect() use.
+_SET_TENANT_CONTEXT = text(
+    "SELECT set_config('app.tenant_id', :tenant_id, true), "
+    "set_config('app.current_tenant_id', :tenant_id, true)"
+)
+
+def _apply_tenant_context(session, transaction, connection):
+    """
+    Point the transaction's RLS context at the session's tenant as it begins.
+    
+    Sessions without a tenant set it to '' (no rows visible).
+    """
+    tenant_id = session.info.get('tenant_id') or ''
+    connection.execute(_SET_TENANT_CONTEXT, {'tenant_id': tenant_id})
+    logger.debug("Set tenant context: %s", tenant_id)
+
+if not DATABASE_URL.startswith("sqlite"):
+    event.listen(SessionLocal, "after_begin", _apply_tenant_context)
+
+# Optional async engine (DB_ASYNC=true) so endpoints await queries on the
+# event loop instead of tying up a threadpool thread per request. Needs the
+# asyncpg or aiosqlite driver. Not available for in-memory SQLite, which
+# exists only on the sync engine's single connection.
+DB_ASYNC = (
+    os.getenv("DB_ASYNC", "false").lower() == "true"
+    and DATABASE_URL not in ("sqlite://", "sqlite:///:memory:")
+)
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+class _AsyncORMSession(Session):
+    """Sync session class behind AsyncSession, so listeners stay off SessionLocal's."""
+
+@functools.lru_cache(maxsize=1)
+def create_async_db_engine():
+    """Create the async engine (memoized) with the same pool settings as the sync one."""
+    url = make_url(DATABASE_URL)
+    url = url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    echo = os.getenv("DB_ECHO", "false").lower() == "true"
+    if DATABASE_URL.startswith("sqlite"):
+        # aiosqlite defaults to NullPool; pool file connections like the sync engine
+        async_engine = create_async_engine(
+            url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            echo=echo,
+        )
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return async_engine
+    return create_async_engine(
+        url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        pool_recycle=3600,
+        echo=echo,
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """AsyncSession factory; objects stay loaded after commit since lazy loads cannot run."""
+    factory = async_sessionmaker(
+        create_async_db_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=_AsyncORMSession,
+    )
+    if not DATABASE_URL.startswith("sqlite"):
+        event.listen(_AsyncORMSession, "after_begin", _apply_tenant_context)
+    return factory
+
+# On PostgreSQL, bonus_plans inserts/updates are audited by statement-level
+# triggers (revision i4d5e6f7a8b9), so application code skips those events
+DB_AUDIT_TRIGGERS = not DATABASE_URL.startswith("sqlite")
+
+def set_audit_actor(db, user_id: str):
+    """Expose the acting user to database audit triggers for this transaction."""
+    if DB_AUDIT_TRIGGERS and user_id:
+        db.execute(text("SELECT set_config('app.current_user_id', :user_id, true)"),
+                  {'user_id': user_id})
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -87,6 +228,32 @@ def get_db():
     finally:
         db.close()
 
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections, if it was ever created."""
+    if create_async_db_engine.cache_info().currsize:
+        await create_async_db_engine().dispose()
+
+# Dependency to get an async DB session (requires DB_ASYNC)
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+# Session dependency for endpoints migrated to run_db: async when DB_ASYNC is
+# set, otherwise the sync session
+get_request_db = get_async_db if DB_ASYNC else get_db
+
+async def run_db(db: Union[Session, AsyncSession], fn: Callable[..., Any], *args) -> Any:
+    """
+    Run fn(sync_session, *args) without blocking the event loop.
+    
+    With an AsyncSession, sync ORM code (services, DALs) runs through
+    run_sync on the async driver; with a sync Session it runs in a worker
+    thread.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await asyncio.to_thread(fn, db, *args)
+
 # Dependency to get tenant-aware DB session
 def get_tenant_db(tenant_id: str = None):
     """Get database session with optional tenant context."""
@@ -111,6 +278,29 @@ def check_database_connectivity() -> bool:
         logger.error(f"Database connectivity check failed: {e}")
         return False
 
+# Open the pool's connections at startup so first requests skip connecting
+DB_POOL_WARM = os.getenv("DB_POOL_WARM", "true").lower() == "true"
+
+def warm_pool() -> int:
+    """
+    Fill the connection pool up to pool_size and return the number opened.
+    
+    The connections are all checked out before any is returned, since
+    connecting one at a time would just reuse the first.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+    
+    connections = []
+    try:
+        for _ in range(pool.size()):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
 def get_db_stats() -> dict:
     """Get database connection statistics."""
     try:
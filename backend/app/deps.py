@@ -0,0 +1,49 @@
+"""
+Request-scoped service dependencies for FastAPI endpoints.
+"""
+from typing import Callable, Generic, TypeVar, Union
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .database import get_request_db, run_db
+from .services.data_retention_service import DataRetentionService
+from .services.session_service import SessionService
+
+ServiceType = TypeVar("ServiceType")
+T = TypeVar("T")
+
+
+class RequestService(Generic[ServiceType]):
+    """
+    A service built once per request on the request's database session.
+    
+    Services are sync ORM code, so endpoints await them through run(), which
+    goes through run_db and never blocks the event loop.
+    """
+    
+    def __init__(self, service: ServiceType, db: Union[Session, AsyncSession]):
+        self.service = service
+        self.db = db
+    
+    async def run(self, fn: Callable[[ServiceType], T]) -> T:
+        """Await fn(service), e.g. run(lambda service: service.get_session(session_id))."""
+        return await run_db(self.db, lambda _session: fn(self.service))
+
+
+def _sync_session(db: Union[Session, AsyncSession]) -> Session:
+    """The sync session that run_db hands to services for db."""
+    return db.sync_session if isinstance(db, AsyncSession) else db
+
+
+async def get_session_service(
+    db: Union[Session, AsyncSession] = Depends(get_request_db),
+) -> RequestService[SessionService]:
+    return RequestService(SessionService(_sync_session(db)), db)
+
+
+async def get_retention_service(
+    db: Union[Session, AsyncSession] = Depends(get_request_db),
+) -> RequestService[DataRetentionService]:
+    return RequestService(DataRetentionService(_sync_session(db)), db)
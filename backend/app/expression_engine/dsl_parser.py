@@ -3,11 +3,21 @@ Safe DSL Expression Parser for Bonus Calculation Plans
 Uses Python AST for secure parsing without code execution.
 """
 import ast
+import copy
+import functools
+import hashlib
 import logging
-from typing import Dict, List, Any, Set, Optional, Union
+import math
+import operator
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Any, Set, Optional, Union, FrozenSet, Tuple, Iterable
 from decimal import Decimal
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 class ExpressionSecurityError(Exception):
@@ -22,11 +32,19 @@ class ExpressionEvaluationError(Exception):
     """Raised when an expression fails during runtime evaluation."""
     pass
 
+def _string_to_decimal(value: str) -> Decimal:
+    """Parse a numeric string, raising ExpressionEvaluationError otherwise."""
+    try:
+        return Decimal(value)
+    except Exception:
+        raise ExpressionEvaluationError(f"Cannot convert string '{value}' to number")
+
+
 class SafeDSLParser:
     """Safe parser for bonus calculation expressions using AST whitelisting."""
     
     # Whitelisted AST node types for safe operations
-    ALLOWED_NODES = {
+    ALLOWED_NODES = frozenset({
         ast.Expression,    # Top-level expression node
         ast.BinOp,        # Binary operations (+, -, *, /, etc.)
         ast.UnaryOp,      # Unary operations (+x, -x, not x)
@@ -49,7 +67,15 @@ class SafeDSLParser:
         ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot, ast.In, ast.NotIn,  # Comparison
         ast.And, ast.Or,  # Boolean
         ast.Not, ast.Invert, ast.UAdd, ast.USub,  # Unary
-    }
+    })
+    
+    # Built-ins that may never be referenced, even as variable names
+    DANGEROUS_NAMES = frozenset({
+        '__import__', 'eval', 'exec', 'compile', 'open', 'file',
+        'input', 'raw_input', 'reload', '__builtins__', 'globals', 'locals',
+        'vars', 'dir', 'hasattr', 'getattr', 'setattr', 'delattr',
+        'isinstance', 'issubclass', 'callable', 'type', 'id', 'hash'
+    })
     
     # Whitelisted functions that are safe for calculations
     ALLOWED_FUNCTIONS = {
@@ -80,14 +106,12 @@ class SafeDSLParser:
         
     def parse(self, expression: str) -> ast.Expression:
         """Parse an expression string into a safe AST."""
+        return self._parse(expression)[0]
+    
+    def _parse(self, expression: str) -> Tuple[ast.Expression, '_ExprAnalyzer']:
+        """Parsed tree and analysis of an expression (cached, see _parse_and_validate)."""
         try:
-            # Parse the expression into an AST
-            tree = ast.parse(expression, mode='eval')
-            
-            # Validate that only safe nodes are used
-            self._validate_ast_security(tree)
-            
-            return tree
+            return _parse_and_validate(expression)
             
         except SyntaxError as e:
             raise ExpressionValidationError(f"Invalid expression syntax: {e}")
@@ -100,12 +124,9 @@ class SafeDSLParser:
             self.available_variables = available_variables
         
         try:
-            # Parse the expression
-            tree = self.parse(expression)
-            
-            # Extract variables and functions used
-            variables_used = self._extract_variables(tree)
-            functions_used = self._extract_functions(tree)
+            # Parse the expression; variables and functions used come with it
+            tree, analysis = self._parse(expression)
+            variables_used, functions_used = analysis.variables, analysis.functions
             
             # Validate variables exist
             undefined_variables = variables_used - self.available_variables
@@ -145,14 +166,14 @@ class SafeDSLParser:
     def get_expression_info(self, expression: str) -> Dict[str, Any]:
         """Get detailed information about an expression without executing it."""
         try:
-            tree = self.parse(expression)
+            analysis = self._parse(expression)[1]
             
             return {
-                'variables': list(self._extract_variables(tree)),
-                'functions': list(self._extract_functions(tree)),
-                'has_conditions': self._has_conditional_logic(tree),
-                'complexity_score': self._calculate_complexity(tree),
-                'node_count': self._count_nodes(tree)
+                'variables': list(analysis.variables),
+                'functions': list(analysis.functions),
+                'has_conditions': analysis.has_conditions,
+                'complexity_score': analysis.complexity,
+                'node_count': analysis.node_count
             }
             
         except Exception as e:
@@ -165,7 +186,41 @@ class SafeDSLParser:
                 'complexity_score': 0,
                 'node_count': 0
             }
-    
+
+    @staticmethod
+    def warmup(expressions: Iterable[str], float_paths: bool = False) -> Dict[str, str]:
+        """
+        Pre-parse expressions so the first evaluation of each skips the setup work.
+
+        Populates the per-process caches (parse, validation and constant
+        folding, opcodes and the compiled Decimal path) for every expression.
+        With float_paths, also builds the NumPy and Numba functions used by the
+        float precision modes; Numba compilation is the slow part.
+
+        Args:
+            expressions: Expression strings, duplicates and blanks allowed
+            float_paths: Whether to also build the float evaluation paths
+
+        Returns:
+            Dict[str, str]: Expression -> error message for each expression
+            that failed to parse or validate
+        """
+        errors: Dict[str, str] = {}
+        for expression in set(expressions):
+            if not expression or not expression.strip():
+                continue
+            try:
+                _parse_and_validate(expression)
+                _opcodes(expression)
+                _compile_expression(expression)
+                if float_paths:
+                    _numpy_function(expression)
+                    _float_function(expression)
+            except Exception as e:
+                logger.warning(f"Expression '{expression}' failed warm-up: {e}")
+                errors[expression] = str(e)
+        return errors
+
     def evaluate(self, expression: str, variables: Dict[str, Any]) -> Decimal:
         """
         Safely evaluate an expression with provided variable values.
@@ -183,21 +238,38 @@ class SafeDSLParser:
             ExpressionEvaluationError: If evaluation fails at runtime
         """
         try:
-            # First, parse and validate the expression for security
-            tree = self.parse(expression)
+            # First, parse and validate the expression for security (cached
+            # per expression string, so repeated rows skip both)
+            analysis = self._parse(expression)[1]
             
-            # Convert all input variables to appropriate types for calculation
+            # Convert the input variables the expression reads to appropriate
+            # types for calculation; missing ones fail when evaluation reaches them
             decimal_variables = {}
-            for name, value in variables.items():
+            for name in analysis.variables:
+                if name not in variables:
+                    continue
+                value = variables[name]
+                if type(value) is Decimal:
+                    # Already converted by the caller
+                    decimal_variables[name] = value
+                    continue
                 try:
-                    if isinstance(value, bool):
+                    if value is True or value is False:
                         # Booleans should remain as booleans for conditional logic
                         decimal_variables[name] = value
+                    elif type(value) is int:
+                        # Integer inputs recur constantly (0, 1, 100, ...)
+                        decimal_variables[name] = _int_to_decimal(value)
                     elif isinstance(value, (int, float)):
                         # Convert numeric types to Decimal for high-precision calculations
                         decimal_variables[name] = self._convert_to_decimal(value)
                     elif isinstance(value, str):
-                        # Try to convert strings to Decimal if they're numeric, otherwise keep as string
+                        # Try to convert strings to Decimal if they're numeric, otherwise keep as string.
+                        # Empty and plainly alphabetic strings skip the failing parse; Decimal also
+                        # accepts NaN, Infinity and sNaN, so those initials are still parsed.
+                        if not value or (value[0].isalpha() and value[0] not in 'iInNsS'):
+                            decimal_variables[name] = value
+                            continue
                         try:
                             decimal_variables[name] = self._convert_to_decimal(value)
                         except ExpressionEvaluationError:
@@ -209,8 +281,11 @@ class SafeDSLParser:
                 except Exception as e:
                     raise ExpressionEvaluationError(f"Cannot convert variable '{name}' with value '{value}' to calculation type: {e}")
             
-            # Evaluate the AST tree
-            result = self._evaluate_ast_node(tree.body, decimal_variables)
+            # Evaluate compiled bytecode when the expression allows it, else
+            # run its opcodes
+            result = self._evaluate_compiled(expression, analysis.variables, decimal_variables)
+            if result is _NOT_COMPILED:
+                result = self._run(_opcodes(expression), decimal_variables)
             
             # Ensure result is a Decimal for consistency
             return self._convert_to_decimal(result)
@@ -225,21 +300,113 @@ class SafeDSLParser:
             logger.error(f"Unexpected error evaluating expression '{expression}': {e}")
             raise ExpressionEvaluationError(f"Evaluation failed: {e}")
     
-    def _validate_ast_security(self, tree: ast.AST) -> None:
-        """Validate that an AST tree contains only safe operations."""
-        for node in ast.walk(tree):
-            node_type = type(node)
+    def evaluate_float(self, expression: str, variables: Dict[str, Any]) -> float:
+        """
+        Evaluate an expression with float64 arithmetic.
+        
+        For the float precision modes of batch execution, where results are
+        floats anyway. Float-safe expressions run as a Numba-compiled
+        function; anything else (non-numeric variables, runtime errors,
+        non-finite results such as pow(-8, 0.5), or expressions outside the
+        float-safe subset) goes through evaluate() and is converted to
+        float, so errors are the same as evaluate()'s.
+        """
+        # Validates the expression and wraps parse errors like evaluate()
+        self._parse(expression)
+        
+        compiled = _float_function(expression)
+        if compiled is not None:
+            function, names = compiled
+            try:
+                result = function(*[float(variables[name]) for name in names])
+                if math.isfinite(result):
+                    return result
+            except Exception:
+                pass
+        
+        return float(self.evaluate(expression, variables))
+    
+    def evaluate_batch(self, expression: str, columns: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate an expression over whole columns with float64 arithmetic.
+        
+        Args:
+            expression: The expression string to evaluate
+            columns: Variable name -> column mappings; columns are equal-length
+                array-likes (lists, NumPy arrays, Polars Series)
             
-            if node_type not in self.ALLOWED_NODES:
-                raise ExpressionSecurityError(
-                    f"Disallowed operation: {node_type.__name__}"
-                )
+        Returns:
+            np.ndarray: float64 results, one per row
             
-            # Additional security checks for specific node types
-            if isinstance(node, ast.Call):
-                self._validate_function_call(node)
-            elif isinstance(node, ast.Name):
-                self._validate_variable_name(node)
+        Float-safe expressions run as one NumPy expression over the columns.
+        Other expressions, non-numeric columns, missing (None/NaN) or
+        infinite inputs, non-finite results and floating-point errors (e.g.
+        division by zero in either branch of a conditional) are evaluated
+        row by row with evaluate_float(), which raises the usual evaluation
+        errors; NaN or infinite inputs and results raise
+        ExpressionEvaluationError there.
+        """
+        analysis = self._parse(expression)[1]
+        names = sorted(analysis.variables)
+        for name in names:
+            if name not in columns:
+                raise ExpressionEvaluationError(f"Variable '{name}' is not defined")
+        row_count = len(next(iter(columns.values()))) if columns else 0
+        
+        vectorized = _numpy_function(expression)
+        if vectorized is not None:
+            function, _ = vectorized
+            try:
+                arrays = [np.asarray(columns[name], dtype=np.float64) for name in names]
+                # None becomes NaN here; leave missing values to the row path
+                if all(np.isfinite(array).all() for array in arrays):
+                    with np.errstate(divide='raise', over='raise', invalid='raise'):
+                        result = np.asarray(function(*arrays), dtype=np.float64)
+                    if np.isfinite(result).all():
+                        # Expressions without variables produce a scalar
+                        return np.broadcast_to(result, (row_count,)).copy()
+            except (TypeError, ValueError, FloatingPointError):
+                pass
+        
+        values = {name: np.asarray(columns[name]).tolist() for name in names}
+        return np.fromiter(
+            (self._evaluate_row(expression, {name: values[name][row] for name in names}, row)
+             for row in range(row_count)),
+            dtype=np.float64,
+            count=row_count,
+        )
+    
+    def _evaluate_row(self, expression: str, variables: Dict[str, Any], row: int) -> float:
+        """evaluate_float() for one row of evaluate_batch, rejecting NaN or infinite inputs and results."""
+        for name, value in variables.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ExpressionEvaluationError(f"Variable '{name}' is missing or not finite in row {row}")
+        result = self.evaluate_float(expression, variables)
+        if not math.isfinite(result):
+            raise ExpressionEvaluationError(f"Expression produced a non-finite result in row {row}")
+        return result
+    
+    def _evaluate_compiled(self, expression: str, variables_used: FrozenSet[str],
+                           variables: Dict[str, Any]) -> Any:
+        """
+        Evaluate the expression's cached bytecode (see _compile_expression).
+        
+        Returns _NOT_COMPILED when the expression is outside the compiled
+        subset, a variable it reads is not a Decimal, or evaluation raised;
+        the interpreter then produces the result or the precise error.
+        """
+        compiled = _compile_expression(expression)
+        if compiled is None:
+            return _NOT_COMPILED
+        for name in variables_used:
+            if type(variables.get(name)) is not Decimal:
+                return _NOT_COMPILED
+        
+        code, compiled_globals = compiled
+        try:
+            return eval(code, compiled_globals, variables)
+        except Exception:
+            return _NOT_COMPILED
     
     def _validate_function_call(self, node: ast.Call) -> None:
         """Validate that function calls are safe."""
@@ -258,172 +425,123 @@ class SafeDSLParser:
         var_name = node.id
         
         # Prevent access to dangerous built-ins
-        dangerous_names = {
-            '__import__', 'eval', 'exec', 'compile', 'open', 'file',
-            'input', 'raw_input', 'reload', '__builtins__', 'globals', 'locals',
-            'vars', 'dir', 'hasattr', 'getattr', 'setattr', 'delattr',
-            'isinstance', 'issubclass', 'callable', 'type', 'id', 'hash'
-        }
-        
-        if var_name in dangerous_names:
+        if var_name in self.DANGEROUS_NAMES:
             raise ExpressionSecurityError(f"Access to '{var_name}' is not allowed")
         
         # Prevent access to private attributes
         if var_name.startswith('_'):
             raise ExpressionSecurityError(f"Access to private variable '{var_name}' is not allowed")
     
-    def _extract_variables(self, tree: ast.AST) -> Set[str]:
-        """Extract all variable names used in an expression."""
-        variables = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                # Only count variables being loaded, not function names
-                if not self._is_function_name(node, tree):
-                    variables.add(node.id)
-        
-        return variables
-    
-    def _extract_functions(self, tree: ast.AST) -> Set[str]:
-        """Extract all function names used in an expression."""
-        functions = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                functions.add(node.func.id)
-        
-        return functions
-    
-    def _is_function_name(self, name_node: ast.Name, tree: ast.AST) -> bool:
-        """Check if a Name node refers to a function call."""
-        for node in ast.walk(tree):
-            if (isinstance(node, ast.Call) and 
-                isinstance(node.func, ast.Name) and 
-                node.func.id == name_node.id):
-                return True
-        return False
-    
-    def _has_conditional_logic(self, tree: ast.AST) -> bool:
-        """Check if expression contains conditional logic."""
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.IfExp, ast.BoolOp, ast.Compare)):
-                return True
-        return False
-    
-    def _calculate_complexity(self, tree: ast.AST) -> int:
-        """Calculate a simple complexity score for the expression."""
-        complexity = 0
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.BinOp, ast.UnaryOp)):
-                complexity += 1
-            elif isinstance(node, ast.Compare):
-                complexity += 1
-            elif isinstance(node, ast.Call):
-                complexity += 2  # Function calls are more complex
-            elif isinstance(node, ast.IfExp):
-                complexity += 3  # Conditionals are most complex
-        
-        return complexity
-    
-    def _count_nodes(self, tree: ast.AST) -> int:
-        """Count the total number of nodes in the AST."""
-        return len(list(ast.walk(tree)))
-    
     def _convert_to_decimal(self, value: Any) -> Decimal:
         """Convert a value to Decimal for high-precision calculations."""
+        # Exact types take a single lookup (see _DECIMAL_CONVERTERS)
+        converter = self._DECIMAL_CONVERTERS.get(type(value))
+        if converter is not None:
+            return converter(value)
+        
+        # Subclasses, e.g. numpy.float64
         if isinstance(value, Decimal):
             return value
+        elif isinstance(value, bool):
+            return Decimal('1' if value else '0')
         elif isinstance(value, (int, float)):
             return Decimal(str(value))  # Convert to string first for precision
         elif isinstance(value, str):
-            try:
-                return Decimal(value)
-            except Exception:
-                raise ExpressionEvaluationError(f"Cannot convert string '{value}' to number")
-        elif isinstance(value, bool):
-            return Decimal('1' if value else '0')
+            return _string_to_decimal(value)
         elif value is None:
             raise ExpressionEvaluationError("Cannot convert None to number")
         else:
             raise ExpressionEvaluationError(f"Cannot convert {type(value).__name__} to Decimal")
     
-    def _evaluate_ast_node(self, node: ast.AST, variables: Dict[str, Any]) -> Any:
+    def _run(self, code: Tuple[Tuple[int, Any], ...], variables: Dict[str, Any]) -> Any:
         """
-        Recursively evaluate an AST node with provided variables.
+        Execute an expression's opcodes (see _opcodes) on a value stack.
         
         Args:
-            node: The AST node to evaluate
+            code: The opcodes, built once per expression string
             variables: Dictionary of variable values
             
         Returns:
             The evaluated result (Decimal for numbers, bool for comparisons, etc.)
+            
+        Helpers raise plain Python errors for failed operations; the single
+        handler around the loop wraps them according to the failing opcode
+        (see _OP_FAILURES).
         """
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        end = len(code)
+        
         try:
-            # Handle different node types
-            if isinstance(node, ast.Constant):
-                # Python 3.8+ literal values
-                return self._convert_to_decimal(node.value) if isinstance(node.value, (int, float)) else node.value
-                
-            elif isinstance(node, (ast.Num, ast.Str, ast.NameConstant)):
-                # Legacy literal values (Python < 3.8)
-                if isinstance(node, ast.Num):
-                    return self._convert_to_decimal(node.n)
-                elif isinstance(node, ast.Str):
-                    return node.s
-                elif isinstance(node, ast.NameConstant):
-                    return node.value
-            
-            elif isinstance(node, ast.Name):
-                # Variable reference
-                var_name = node.id
-                if var_name not in variables:
-                    raise ExpressionEvaluationError(f"Variable '{var_name}' is not defined")
-                return variables[var_name]
-            
-            elif isinstance(node, ast.BinOp):
-                # Binary operations (+, -, *, /, etc.)
-                left = self._evaluate_ast_node(node.left, variables)
-                right = self._evaluate_ast_node(node.right, variables)
-                return self._evaluate_binary_op(node.op, left, right)
-            
-            elif isinstance(node, ast.UnaryOp):
-                # Unary operations (+x, -x, not x)
-                operand = self._evaluate_ast_node(node.operand, variables)
-                return self._evaluate_unary_op(node.op, operand)
-            
-            elif isinstance(node, ast.Compare):
-                # Comparisons (==, !=, <, >, etc.)
-                return self._evaluate_comparison(node, variables)
+            while pc < end:
+                op, arg = code[pc]
+                pc += 1
             
-            elif isinstance(node, ast.BoolOp):
-                # Boolean operations (and, or)
-                return self._evaluate_bool_op(node, variables)
-            
-            elif isinstance(node, ast.IfExp):
-                # Conditional expression (x if condition else y)
-                test_result = self._evaluate_ast_node(node.test, variables)
-                if test_result:
-                    return self._evaluate_ast_node(node.body, variables)
+                if op == _OP_CONST:
+                    push(arg)
+                elif op == _OP_VAR:
+                    if arg not in variables:
+                        raise ExpressionEvaluationError(f"Variable '{arg}' is not defined")
+                    push(variables[arg])
+                elif op == _OP_BINARY:
+                    right = pop()
+                    push(self._evaluate_binary_op(arg, pop(), right))
+                elif op == _OP_UNARY:
+                    push(self._evaluate_unary_op(arg, pop()))
+                elif op == _OP_COMPARE:
+                    right = pop()
+                    push(self._compare(arg, pop(), right))
+                elif op == _OP_COMPARE_CHAIN:
+                    # A failing link ends the chain with its result; otherwise the
+                    # right operand stays as the next link's left operand
+                    compare_op, target = arg
+                    right = pop()
+                    result = self._compare(compare_op, pop(), right)
+                    if result:
+                        push(right)
+                    else:
+                        push(result)
+                        pc = target
+                elif op == _OP_JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == _OP_JUMP:
+                    pc = arg
+                elif op == _OP_AND:
+                    # Short-circuit AND evaluation
+                    if not pop():
+                        push(False)
+                        pc = arg
+                elif op == _OP_OR:
+                    # Short-circuit OR evaluation
+                    if pop():
+                        push(True)
+                        pc = arg
+                elif op == _OP_CALL:
+                    func_name, argc = arg
+                    args = stack[len(stack) - argc:]
+                    del stack[len(stack) - argc:]
+                    push(self._call_function(func_name, args))
+                elif op == _OP_LIST:
+                    items = stack[len(stack) - arg:]
+                    del stack[len(stack) - arg:]
+                    push(items)
                 else:
-                    return self._evaluate_ast_node(node.orelse, variables)
-            
-            elif isinstance(node, ast.Call):
-                # Function calls
-                return self._evaluate_function_call(node, variables)
-            
-            elif isinstance(node, (ast.List, ast.Tuple)):
-                # List or tuple literals [a, b, c] or (a, b, c)
-                return [self._evaluate_ast_node(elt, variables) for elt in node.elts]
-            
-            else:
-                raise ExpressionEvaluationError(f"Unsupported node type: {type(node).__name__}")
-                
+                    # _OP_FAIL: a node that cannot be evaluated, raised when reached
+                    raise ExpressionEvaluationError(arg)
+        
         except ExpressionEvaluationError:
-            # Re-raise evaluation errors
             raise
         except Exception as e:
-            raise ExpressionEvaluationError(f"Error evaluating {type(node).__name__}: {e}")
+            if op == _OP_CALL:
+                message = f"Function '{arg[0]}' evaluation failed"
+            else:
+                message = _OP_FAILURES.get(op, "Evaluation failed")
+            raise ExpressionEvaluationError(f"{message}: {e}") from e
+        
+        return pop()
     
     def _evaluate_binary_op(self, op: ast.operator, left: Any, right: Any) -> Decimal:
         """Evaluate binary operations with Decimal precision."""
@@ -431,226 +549,701 @@ class SafeDSLParser:
         left_decimal = self._convert_to_decimal(left)
         right_decimal = self._convert_to_decimal(right)
         
-        try:
-            if isinstance(op, ast.Add):
-                return left_decimal + right_decimal
-            elif isinstance(op, ast.Sub):
-                return left_decimal - right_decimal
-            elif isinstance(op, ast.Mult):
-                return left_decimal * right_decimal
-            elif isinstance(op, ast.Div):
-                if right_decimal == 0:
-                    raise ExpressionEvaluationError("Division by zero")
-                return left_decimal / right_decimal
-            elif isinstance(op, ast.FloorDiv):
-                if right_decimal == 0:
-                    raise ExpressionEvaluationError("Division by zero")
-                return left_decimal // right_decimal
-            elif isinstance(op, ast.Mod):
-                if right_decimal == 0:
-                    raise ExpressionEvaluationError("Modulo by zero")
-                return left_decimal % right_decimal
-            elif isinstance(op, ast.Pow):
-                return left_decimal ** right_decimal
-            else:
-                raise ExpressionEvaluationError(f"Unsupported binary operation: {type(op).__name__}")
-                
-        except Exception as e:
-            if isinstance(e, ExpressionEvaluationError):
-                raise
-            raise ExpressionEvaluationError(f"Binary operation failed: {e}")
+        op_type = type(op)
+        operation = self._BINOP_HANDLERS.get(op_type)
+        if operation is None:
+            raise ExpressionEvaluationError(f"Unsupported binary operation: {op_type.__name__}")
+        
+        if right_decimal == 0 and op_type in self._ZERO_DIVISOR_ERRORS:
+            raise ExpressionEvaluationError(self._ZERO_DIVISOR_ERRORS[op_type])
+        return operation(left_decimal, right_decimal)
     
     def _evaluate_unary_op(self, op: ast.unaryop, operand: Any) -> Any:
         """Evaluate unary operations."""
-        try:
-            if isinstance(op, ast.UAdd):
-                # Unary plus (+x)
-                return self._convert_to_decimal(operand)
-            elif isinstance(op, ast.USub):
-                # Unary minus (-x)
-                return -self._convert_to_decimal(operand)
-            elif isinstance(op, ast.Not):
-                # Logical not (not x)
-                return not bool(operand)
-            elif isinstance(op, ast.Invert):
-                # Bitwise invert (~x) - not commonly used in financial calculations
-                operand_decimal = self._convert_to_decimal(operand)
-                return Decimal(~int(operand_decimal))
-            else:
-                raise ExpressionEvaluationError(f"Unsupported unary operation: {type(op).__name__}")
-                
-        except Exception as e:
-            if isinstance(e, ExpressionEvaluationError):
-                raise
-            raise ExpressionEvaluationError(f"Unary operation failed: {e}")
+        operation = self._UNARYOP_HANDLERS.get(type(op))
+        if operation is None:
+            raise ExpressionEvaluationError(f"Unsupported unary operation: {type(op).__name__}")
+        return operation(self, operand)
     
-    def _evaluate_comparison(self, node: ast.Compare, variables: Dict[str, Any]) -> bool:
-        """Evaluate comparison operations."""
-        try:
-            # Evaluate the left operand
-            left = self._evaluate_ast_node(node.left, variables)
-            
-            # Handle multiple comparisons (a < b < c)
-            result = True
-            current = left
-            
-            for op, comparator in zip(node.ops, node.comparators):
-                right = self._evaluate_ast_node(comparator, variables)
-                
-                # Convert to comparable types
-                if isinstance(op, (ast.Lt, ast.LtE, ast.Gt, ast.GtE)):
-                    # Numeric comparisons - convert to Decimal
-                    current_decimal = self._convert_to_decimal(current)
-                    right_decimal = self._convert_to_decimal(right)
-                    
-                    if isinstance(op, ast.Lt):
-                        comparison_result = current_decimal < right_decimal
-                    elif isinstance(op, ast.LtE):
-                        comparison_result = current_decimal <= right_decimal
-                    elif isinstance(op, ast.Gt):
-                        comparison_result = current_decimal > right_decimal
-                    elif isinstance(op, ast.GtE):
-                        comparison_result = current_decimal >= right_decimal
-                        
-                elif isinstance(op, ast.Eq):
-                    comparison_result = current == right
-                elif isinstance(op, ast.NotEq):
-                    comparison_result = current != right
-                elif isinstance(op, ast.Is):
-                    comparison_result = current is right
-                elif isinstance(op, ast.IsNot):
-                    comparison_result = current is not right
-                elif isinstance(op, ast.In):
-                    comparison_result = current in right
-                elif isinstance(op, ast.NotIn):
-                    comparison_result = current not in right
-                else:
-                    raise ExpressionEvaluationError(f"Unsupported comparison: {type(op).__name__}")
-                
-                result = result and comparison_result
-                if not result:
-                    break  # Short-circuit evaluation
-                    
-                current = right  # For chained comparisons
-                
-            return result
-            
-        except Exception as e:
-            if isinstance(e, ExpressionEvaluationError):
-                raise
-            raise ExpressionEvaluationError(f"Comparison failed: {e}")
+    def _compare(self, op: ast.cmpop, current: Any, right: Any) -> Any:
+        """Evaluate one comparison, converting to Decimal for ordering comparisons."""
+        op_type = type(op)
+        if op_type in self._DECIMAL_COMPARISONS:
+            # Numeric comparisons - convert to Decimal
+            return self._DECIMAL_COMPARISONS[op_type](
+                self._convert_to_decimal(current), self._convert_to_decimal(right)
+            )
+        elif op_type in self._COMPARISONS:
+            return self._COMPARISONS[op_type](current, right)
+        else:
+            raise ExpressionEvaluationError(f"Unsupported comparison: {op_type.__name__}")
     
-    def _evaluate_bool_op(self, node: ast.BoolOp, variables: Dict[str, Any]) -> bool:
-        """Evaluate boolean operations (and, or)."""
-        try:
-            if isinstance(node.op, ast.And):
-                # Short-circuit AND evaluation
-                for value_node in node.values:
-                    result = self._evaluate_ast_node(value_node, variables)
-                    if not result:
-                        return False
-                return True
-                
-            elif isinstance(node.op, ast.Or):
-                # Short-circuit OR evaluation
-                for value_node in node.values:
-                    result = self._evaluate_ast_node(value_node, variables)
-                    if result:
-                        return True
-                return False
-                
-            else:
-                raise ExpressionEvaluationError(f"Unsupported boolean operation: {type(node.op).__name__}")
-                
-        except Exception as e:
-            if isinstance(e, ExpressionEvaluationError):
-                raise
-            raise ExpressionEvaluationError(f"Boolean operation failed: {e}")
+    def _call_function(self, func_name: str, args: List[Any]) -> Any:
+        """Apply a whitelisted function to evaluated arguments, keeping Decimal precision."""
+        # Functions needing Decimal handling have a pre-bound handler
+        handler = self._FUNCTION_HANDLERS.get(func_name)
+        if handler is None:
+            # Generic function call
+            return self.ALLOWED_FUNCTIONS[func_name](*args)
+        apply, func = handler
+        return apply(self, func, args)
     
-    def _evaluate_function_call(self, node: ast.Call, variables: Dict[str, Any]) -> Any:
-        """Evaluate function calls using whitelisted functions."""
-        try:
-            if not isinstance(node.func, ast.Name):
-                raise ExpressionEvaluationError("Only simple function calls are supported")
-                
-            func_name = node.func.id
-            if func_name not in self.ALLOWED_FUNCTIONS:
-                raise ExpressionEvaluationError(f"Function '{func_name}' is not allowed")
-                
-            # Evaluate function arguments
-            args = [self._evaluate_ast_node(arg, variables) for arg in node.args]
-            
-            # Get the actual function
-            func = self.ALLOWED_FUNCTIONS[func_name]
-            
-            # Handle special functions that need Decimal precision
-            if func_name in ['abs', 'round']:
-                # Convert arguments to Decimal and call function
-                decimal_args = [self._convert_to_decimal(arg) for arg in args]
-                result = func(*decimal_args)
-                return self._convert_to_decimal(result)
-                
-            elif func_name in ['max', 'min']:
-                # Convert arguments to Decimal for numeric comparison
-                if all(isinstance(arg, (int, float, Decimal, str)) or 
-                       (isinstance(arg, str) and arg.replace('.', '').replace('-', '').isdigit()) 
-                       for arg in args):
-                    decimal_args = [self._convert_to_decimal(arg) for arg in args]
-                    result = func(*decimal_args)
-                    return self._convert_to_decimal(result)
-                else:
-                    # Non-numeric max/min
-                    return func(*args)
-                    
-            elif func_name == 'sum':
-                # Convert list elements to Decimal
-                if len(args) != 1:
-                    raise ExpressionEvaluationError("sum() takes exactly one argument (iterable)")
-                iterable = args[0]
-                if not hasattr(iterable, '__iter__'):
-                    raise ExpressionEvaluationError("sum() argument must be iterable")
-                decimal_values = [self._convert_to_decimal(item) for item in iterable]
-                return sum(decimal_values, Decimal('0'))
-                
-            elif func_name in ['int', 'float', 'str', 'bool']:
-                # Type conversion functions
-                if len(args) != 1:
-                    raise ExpressionEvaluationError(f"{func_name}() takes exactly one argument")
-                if func_name in ['int', 'float']:
-                    # For numeric types, ensure we return Decimal for consistency
-                    result = func(args[0])
-                    return self._convert_to_decimal(result)
-                else:
-                    return func(args[0])
-                    
-            elif func_name == 'Decimal':
-                # Decimal constructor
-                if len(args) != 1:
-                    raise ExpressionEvaluationError("Decimal() takes exactly one argument")
-                return self._convert_to_decimal(args[0])
-                
-            elif func_name == 'pow':
-                # Power function
-                if len(args) != 2:
-                    raise ExpressionEvaluationError("pow() takes exactly two arguments")
-                base = self._convert_to_decimal(args[0])
-                exponent = self._convert_to_decimal(args[1])
-                return base ** exponent
-                
-            elif func_name == 'len':
-                # Length function
-                if len(args) != 1:
-                    raise ExpressionEvaluationError("len() takes exactly one argument")
-                return Decimal(str(len(args[0])))
-                
+    def _apply_decimal_math(self, func: Any, args: List[Any]) -> Decimal:
+        """abs/round: convert arguments to Decimal and call function."""
+        decimal_args = [self._convert_to_decimal(arg) for arg in args]
+        return self._convert_to_decimal(func(*decimal_args))
+    
+    def _apply_extremum(self, func: Any, args: List[Any]) -> Any:
+        """max/min: convert arguments to Decimal for numeric comparison."""
+        if all(isinstance(arg, (int, float, Decimal, str)) for arg in args):
+            decimal_args = [self._convert_to_decimal(arg) for arg in args]
+            return self._convert_to_decimal(func(*decimal_args))
+        # Non-numeric max/min
+        return func(*args)
+    
+    def _apply_sum(self, func: Any, args: List[Any]) -> Decimal:
+        """sum: convert list elements to Decimal."""
+        if len(args) != 1:
+            raise ExpressionEvaluationError("sum() takes exactly one argument (iterable)")
+        iterable = args[0]
+        if not hasattr(iterable, '__iter__'):
+            raise ExpressionEvaluationError("sum() argument must be iterable")
+        decimal_values = [self._convert_to_decimal(item) for item in iterable]
+        return sum(decimal_values, Decimal('0'))
+    
+    def _apply_conversion(self, func: Any, args: List[Any]) -> Any:
+        """int/float/str/bool type conversion; numeric results stay Decimal for consistency."""
+        if len(args) != 1:
+            raise ExpressionEvaluationError(f"{func.__name__}() takes exactly one argument")
+        result = func(args[0])
+        if func is int or func is float:
+            return self._convert_to_decimal(result)
+        return result
+    
+    def _apply_decimal(self, func: Any, args: List[Any]) -> Decimal:
+        """Decimal constructor."""
+        if len(args) != 1:
+            raise ExpressionEvaluationError("Decimal() takes exactly one argument")
+        return self._convert_to_decimal(args[0])
+    
+    def _apply_pow(self, func: Any, args: List[Any]) -> Decimal:
+        """Power function."""
+        if len(args) != 2:
+            raise ExpressionEvaluationError("pow() takes exactly two arguments")
+        base = self._convert_to_decimal(args[0])
+        exponent = self._convert_to_decimal(args[1])
+        return base ** exponent
+    
+    def _apply_len(self, func: Any, args: List[Any]) -> Decimal:
+        """Length function."""
+        if len(args) != 1:
+            raise ExpressionEvaluationError("len() takes exactly one argument")
+        return Decimal(str(len(args[0])))
+    
+    # (handler, builtin) per whitelisted function, dispatched by _call_function
+    _FUNCTION_HANDLERS = {
+        'abs': (_apply_decimal_math, abs),
+        'round': (_apply_decimal_math, round),
+        'max': (_apply_extremum, max),
+        'min': (_apply_extremum, min),
+        'sum': (_apply_sum, sum),
+        'len': (_apply_len, len),
+        'int': (_apply_conversion, int),
+        'float': (_apply_conversion, float),
+        'str': (_apply_conversion, str),
+        'bool': (_apply_conversion, bool),
+        'Decimal': (_apply_decimal, Decimal),
+        'pow': (_apply_pow, pow),
+    }
+    
+    # _convert_to_decimal by exact value type. Ints convert exactly without a
+    # str() round-trip; floats go through str() for their shortest repr.
+    _DECIMAL_CONVERTERS = {
+        Decimal: lambda value: value,
+        int: Decimal,
+        float: lambda value: Decimal(str(value)),
+        str: _string_to_decimal,
+        bool: lambda value: Decimal('1' if value else '0'),
+    }
+    
+    # Operator tables, keyed by exact AST type so each operation costs a
+    # single dict lookup
+    _BINOP_HANDLERS = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.FloorDiv: operator.floordiv,
+        ast.Mod: operator.mod,
+        ast.Pow: operator.pow,
+    }
+    
+    # Operations checked for a zero right operand, with the error they raise
+    _ZERO_DIVISOR_ERRORS = {
+        ast.Div: "Division by zero",
+        ast.FloorDiv: "Division by zero",
+        ast.Mod: "Modulo by zero",
+    }
+    
+    _UNARYOP_HANDLERS = {
+        # Unary plus (+x)
+        ast.UAdd: lambda self, operand: self._convert_to_decimal(operand),
+        # Unary minus (-x)
+        ast.USub: lambda self, operand: -self._convert_to_decimal(operand),
+        # Logical not (not x)
+        ast.Not: lambda self, operand: not bool(operand),
+        # Bitwise invert (~x) - not commonly used in financial calculations
+        ast.Invert: lambda self, operand: Decimal(~int(self._convert_to_decimal(operand))),
+    }
+    
+    # Ordering comparisons, applied to Decimal-converted operands
+    _DECIMAL_COMPARISONS = {
+        ast.Lt: operator.lt,
+        ast.LtE: operator.le,
+        ast.Gt: operator.gt,
+        ast.GtE: operator.ge,
+    }
+    
+    # Comparisons applied to the raw operand values
+    _COMPARISONS = {
+        ast.Eq: operator.eq,
+        ast.NotEq: operator.ne,
+        ast.Is: operator.is_,
+        ast.IsNot: operator.is_not,
+        ast.In: lambda left, right: left in right,
+        ast.NotIn: lambda left, right: left not in right,
+    }
+
+
+# Shared instance for the parse cache; parsing and validation only read the
+# class-level whitelists, never per-instance state
+_ANALYZER = SafeDSLParser()
+
+
+class _ExprAnalyzer(ast.NodeVisitor):
+    """
+    Validate a parsed expression against the parser's whitelists and collect
+    its variables, functions, conditional logic, complexity score and node
+    count, all in a single pass over the tree. Also flags whether the
+    expression is float-safe: plain numeric arithmetic that float64 code can
+    evaluate with the same results up to precision (see _float_function and
+    _numpy_function).
+    
+    Raises ExpressionSecurityError on the first unsafe node.
+    """
+    
+    FLOAT_SAFE_NODES = frozenset({
+        ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp,
+        ast.Name, ast.Constant, ast.Call, ast.Load,
+        # No FloorDiv/Mod: Decimal truncates toward zero where floats floor
+        ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
+        ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+        ast.UAdd, ast.USub,
+    })
+    FLOAT_SAFE_FUNCTIONS = frozenset({'abs', 'max', 'min', 'pow'})
+    
+    def __init__(self, tree: ast.AST, parser: SafeDSLParser):
+        self._parser = parser
+        self._allowed_nodes = parser.ALLOWED_NODES
+        self.functions: Set[str] = set()
+        self.float_safe = True
+        self.has_conditions = False
+        self.complexity = 0
+        self.node_count = 0
+        self._names: Set[str] = set()
+        # ids of the Name nodes in Call.func position; visit_Call records them
+        # before its children are visited
+        self._callee_ids: Set[int] = set()
+        
+        self.visit(tree)
+        
+        self.functions = frozenset(self.functions)
+        self.variables: FrozenSet[str] = frozenset(self._names)
+    
+    def visit(self, node: ast.AST) -> None:
+        node_type = type(node)
+        # Exact-type membership: subclasses of whitelisted nodes are rejected
+        if node_type not in self._allowed_nodes:
+            raise ExpressionSecurityError(
+                f"Disallowed operation: {node_type.__name__}"
+            )
+        if node_type not in self.FLOAT_SAFE_NODES:
+            self.float_safe = False
+        self.node_count += 1
+        super().visit(node)
+    
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if type(node.value) not in (int, float):
+            self.float_safe = False
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        self._parser._validate_variable_name(node)
+        # Only count variables being loaded, not function names
+        if isinstance(node.ctx, ast.Load) and id(node) not in self._callee_ids:
+            self._names.add(node.id)
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        self._parser._validate_function_call(node)
+        func_name = node.func.id
+        if (node.keywords or func_name not in self.FLOAT_SAFE_FUNCTIONS
+                or (func_name in ('max', 'min') and len(node.args) < 2)):
+            self.float_safe = False
+        self.complexity += 2  # Function calls are more complex
+        if isinstance(node.func, ast.Name):
+            self.functions.add(node.func.id)
+            self._callee_ids.add(id(node.func))
+        self.generic_visit(node)
+    
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self.complexity += 3  # Conditionals are most complex
+        self.has_conditions = True
+        self.generic_visit(node)
+    
+    def visit_Compare(self, node: ast.Compare) -> None:
+        self.complexity += 1
+        self.has_conditions = True
+        self.generic_visit(node)
+    
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self.has_conditions = True
+        self.generic_visit(node)
+    
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        self.complexity += 1
+        self.generic_visit(node)
+    
+    visit_UnaryOp = visit_BinOp
+
+
+def _is_numeric_constant(node: ast.AST) -> bool:
+    """Whether node is an int, float or Decimal literal (bools excluded)."""
+    return isinstance(node, ast.Constant) and type(node.value) in (int, float, Decimal)
+
+
+# Decimals shared by every parsed expression for literals that recur across
+# plans (Decimals are immutable). Keyed by (type, value): 1 and 1.0 compare
+# equal but convert to different Decimals.
+_INTERNED_DECIMALS = {
+    (type(value), value): Decimal(str(value))
+    for value in (0, 1, 2, 3, 5, 10, 12, 100, 1000, 0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+}
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """
+    Convert numeric literals to Decimal once, fold arithmetic on them (e.g.
+    100 * 12) into Decimal constants, and fold conditionals on literal tests
+    into the taken branch.
+    
+    Folding reuses the interpreter's own operations, so results are exactly
+    what evaluation would produce. A subtree that would raise (e.g. 1 / 0) is
+    left in place so the error still surfaces at evaluation time.
+    """
+    
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if type(node.value) in (int, float):
+            value = _INTERNED_DECIMALS.get((type(node.value), node.value))
+            if value is None:
+                value = _ANALYZER._convert_to_decimal(node.value)
+            return ast.copy_location(ast.Constant(value=value), node)
+        return node
+    
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if _is_numeric_constant(node.left) and _is_numeric_constant(node.right):
+            try:
+                value = _ANALYZER._evaluate_binary_op(node.op, node.left.value, node.right.value)
+            except Exception:
+                return node
+            return ast.copy_location(ast.Constant(value=value), node)
+        return node
+    
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if _is_numeric_constant(node.operand) and not isinstance(node.op, ast.Not):
+            try:
+                value = _ANALYZER._evaluate_unary_op(node.op, node.operand.value)
+            except Exception:
+                return node
+            return ast.copy_location(ast.Constant(value=value), node)
+        return node
+    
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.test, ast.Constant):
+            return node.body if node.test.value else node.orelse
+        return node
+
+
+@functools.lru_cache(maxsize=1024)
+def _float_function(expression: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+    """
+    Numba-compile a float-safe expression once per distinct source string.
+    
+    Returns the compiled function with its parameter names (the expression's
+    variables, sorted), or None when the expression is not float-safe or
+    Numba cannot type it. The source is the validated expression itself,
+    unparsed before constant folding since folded literals are Decimals.
+    """
+    analysis = _parse_and_validate(expression)[1]
+    if not analysis.float_safe:
+        return None
+    
+    # Imported on first use: only the float precision modes need the JIT
+    from numba import njit
+    
+    names = tuple(sorted(analysis.variables))
+    source = (
+        f"def _expression({', '.join(names)}):\n"
+        f"    return {ast.unparse(ast.parse(expression, mode='eval'))}\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(source, {'__builtins__': {}, 'abs': abs, 'max': max, 'min': min, 'pow': pow}, namespace)
+    
+    # An explicit signature compiles now, so the JIT cost is paid once per
+    # expression and typing failures are cached as None. Functions built by
+    # exec() have no source file, so Numba's on-disk cache does not apply.
+    signature = f"float64({', '.join(['float64'] * len(names))})"
+    try:
+        return njit(signature)(namespace['_expression']), names
+    except Exception as e:
+        logger.debug(f"Expression '{expression}' not compiled with Numba: {e}")
+        return None
+
+
+class _NumpyTranslator(ast.NodeTransformer):
+    """Rewrite a float-safe expression into element-wise NumPy operations."""
+    
+    FUNCTIONS = {'abs': '_abs', 'max': '_maximum', 'min': '_minimum', 'pow': '_power'}
+    
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        return ast.Call(func=ast.Name(id='_where', ctx=ast.Load()),
+                        args=[node.test, node.body, node.orelse], keywords=[])
+    
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        # a < b < c becomes (a < b) & (b < c)
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        comparisons = [
+            ast.Compare(left=left, ops=[op], comparators=[right])
+            for left, op, right in zip(operands, node.ops, operands[1:])
+        ]
+        return functools.reduce(
+            lambda left, right: ast.BinOp(left=left, op=ast.BitAnd(), right=right), comparisons
+        )
+    
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        func_name = node.func.id
+        func = ast.Name(id=self.FUNCTIONS[func_name], ctx=ast.Load())
+        if func_name in ('max', 'min'):
+            # np.maximum/np.minimum are binary; fold max(a, b, c) pairwise
+            return functools.reduce(
+                lambda left, right: ast.Call(func=func, args=[left, right], keywords=[]), node.args
+            )
+        return ast.Call(func=func, args=node.args, keywords=[])
+
+
+_NUMPY_GLOBALS = {
+    '__builtins__': {},
+    '_where': np.where,
+    '_abs': np.abs,
+    '_maximum': np.maximum,
+    '_minimum': np.minimum,
+    '_power': np.power,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _numpy_function(expression: str) -> Optional[Tuple[Any, Tuple[str, ...]]]:
+    """
+    Build a column-wise NumPy function for a float-safe expression, once per
+    distinct source string.
+    
+    Returns the function with its parameter names (the expression's
+    variables, sorted), or None when the expression is not float-safe.
+    """
+    analysis = _parse_and_validate(expression)[1]
+    if not analysis.float_safe:
+        return None
+    
+    names = tuple(sorted(analysis.variables))
+    body = _NumpyTranslator().visit(ast.parse(expression, mode='eval')).body
+    source = (
+        f"def _expression({', '.join(names)}):\n"
+        f"    return {ast.unparse(ast.fix_missing_locations(body))}\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(source, _NUMPY_GLOBALS, namespace)
+    return namespace['_expression'], names
+
+
+@functools.lru_cache(maxsize=4096)
+def _int_to_decimal(value: int) -> Decimal:
+    """Decimal for an integer input, memoized since the same values recur across rows."""
+    return Decimal(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_and_validate(expression: str) -> Tuple[ast.Expression, _ExprAnalyzer]:
+    """
+    Parse and security-validate an expression once per distinct source string.
+    
+    Returns the constant-folded tree with the analysis of the expression as
+    written. Trees are never mutated after this, so every caller can share
+    the cached one; failures raise and are not cached.
+    """
+    cached = _load_parsed(expression)
+    if cached is not None:
+        return cached
+    
+    tree = ast.parse(expression, mode='eval')
+    analysis = _ExprAnalyzer(tree, _ANALYZER)
+    parsed = (_ConstantFolder().visit(tree), analysis)
+    _store_parsed(expression, parsed)
+    return parsed
+
+
+# Optional on-disk cache of parsed, validated and folded expressions, so
+# short-lived processes skip re-parsing the same plan expressions. Disabled
+# unless DSL_AST_CACHE_DIR is set. Entries are pickles that are trusted
+# without re-validation, so the directory must only be writable by the
+# service itself. Keys include a hash of this module's source, so any change
+# to the parser or its whitelists invalidates every entry.
+DSL_AST_CACHE_DIR = os.getenv("DSL_AST_CACHE_DIR")
+_PARSER_VERSION = (
+    hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16] if DSL_AST_CACHE_DIR else None
+)
+
+
+def _parsed_cache_path(expression: str) -> Path:
+    key = hashlib.sha256(f"{_PARSER_VERSION}:{expression}".encode()).hexdigest()
+    return Path(DSL_AST_CACHE_DIR) / f"{key}.pkl"
+
+
+def _load_parsed(expression: str) -> Optional[Tuple[ast.Expression, _ExprAnalyzer]]:
+    """The cached parse of an expression from disk, or None on a miss."""
+    if not DSL_AST_CACHE_DIR:
+        return None
+    try:
+        with open(_parsed_cache_path(expression), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable expression cache entry: {e}")
+        return None
+
+
+def _store_parsed(expression: str, parsed: Tuple[ast.Expression, _ExprAnalyzer]) -> None:
+    """Write a parse to the disk cache; failures only cost a re-parse later."""
+    if not DSL_AST_CACHE_DIR:
+        return
+    path = _parsed_cache_path(expression)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to write expression cache entry: {e}")
+
+
+# Interpreter opcodes (see SafeDSLParser._run). Each is a (code, argument)
+# pair; jump targets are opcode indexes.
+_OP_CONST = 0              # push the argument
+_OP_VAR = 1                # push the named variable
+_OP_BINARY = 2             # pop two operands, push the result of the ast operator
+_OP_UNARY = 3              # pop one operand, push the result of the ast operator
+_OP_COMPARE = 4            # pop two operands, push the comparison result
+_OP_COMPARE_CHAIN = 5      # (ast cmpop, target) for all but the last link of a chain
+_OP_JUMP_IF_FALSE = 6      # pop; jump to the target if falsy
+_OP_JUMP = 7               # jump to the target
+_OP_AND = 8                # pop; if falsy push False and jump to the target
+_OP_OR = 9                 # pop; if truthy push True and jump to the target
+_OP_CALL = 10              # (function name, argc): pop argc arguments, push the result
+_OP_LIST = 11              # pop n items, push them as a list
+_OP_FAIL = 12              # raise ExpressionEvaluationError with the argument
+
+# Messages for other errors raised while executing an opcode (_OP_CALL names
+# the function instead)
+_OP_FAILURES = {
+    _OP_BINARY: "Binary operation failed",
+    _OP_UNARY: "Unary operation failed",
+    _OP_COMPARE: "Comparison failed",
+    _OP_COMPARE_CHAIN: "Comparison failed",
+    _OP_AND: "Boolean operation failed",
+    _OP_OR: "Boolean operation failed",
+    _OP_JUMP_IF_FALSE: "Error evaluating IfExp",
+}
+
+
+def _emit_opcodes(node: ast.AST, code: List[Any]) -> None:
+    """Append the opcodes evaluating node to code (post-order, operands first)."""
+    node_type = type(node)
+    
+    if node_type is ast.Constant:
+        code.append((_OP_CONST, node.value))
+    elif node_type is ast.Name:
+        code.append((_OP_VAR, node.id))
+    elif node_type is ast.BinOp:
+        _emit_opcodes(node.left, code)
+        _emit_opcodes(node.right, code)
+        code.append((_OP_BINARY, node.op))
+    elif node_type is ast.UnaryOp:
+        _emit_opcodes(node.operand, code)
+        code.append((_OP_UNARY, node.op))
+    elif node_type is ast.Compare:
+        _emit_opcodes(node.left, code)
+        chain_links = []
+        for index, (op, comparator) in enumerate(zip(node.ops, node.comparators)):
+            _emit_opcodes(comparator, code)
+            if index == len(node.ops) - 1:
+                code.append((_OP_COMPARE, op))
             else:
-                # Generic function call
-                return func(*args)
-                
-        except Exception as e:
-            if isinstance(e, ExpressionEvaluationError):
-                raise
-            raise ExpressionEvaluationError(f"Function '{func_name}' evaluation failed: {e}")
+                chain_links.append(len(code))
+                code.append((_OP_COMPARE_CHAIN, (op, None)))
+        for link in chain_links:
+            code[link] = (_OP_COMPARE_CHAIN, (code[link][1][0], len(code)))
+    elif node_type is ast.BoolOp:
+        short_circuit = _OP_AND if isinstance(node.op, ast.And) else _OP_OR
+        jumps = []
+        for value in node.values:
+            _emit_opcodes(value, code)
+            jumps.append(len(code))
+            code.append(None)
+        # Reached only when no value short-circuited
+        code.append((_OP_CONST, short_circuit == _OP_AND))
+        for jump in jumps:
+            code[jump] = (short_circuit, len(code))
+    elif node_type is ast.IfExp:
+        _emit_opcodes(node.test, code)
+        to_orelse = len(code)
+        code.append(None)
+        _emit_opcodes(node.body, code)
+        to_end = len(code)
+        code.append(None)
+        code[to_orelse] = (_OP_JUMP_IF_FALSE, len(code))
+        _emit_opcodes(node.orelse, code)
+        code[to_end] = (_OP_JUMP, len(code))
+    elif node_type is ast.Call:
+        if not isinstance(node.func, ast.Name):
+            code.append((_OP_FAIL, "Only simple function calls are supported"))
+        elif node.func.id not in _ANALYZER.ALLOWED_FUNCTIONS:
+            code.append((_OP_FAIL, f"Function '{node.func.id}' is not allowed"))
+        else:
+            for arg in node.args:
+                _emit_opcodes(arg, code)
+            code.append((_OP_CALL, (node.func.id, len(node.args))))
+    elif node_type in (ast.List, ast.Tuple):
+        # List or tuple literals [a, b, c] or (a, b, c)
+        for elt in node.elts:
+            _emit_opcodes(elt, code)
+        code.append((_OP_LIST, len(node.elts)))
+    else:
+        code.append((_OP_FAIL, f"Unsupported node type: {node_type.__name__}"))
+
+
+@functools.lru_cache(maxsize=1024)
+def _opcodes(expression: str) -> Tuple[Tuple[int, Any], ...]:
+    """Flatten an expression's folded tree into opcodes once per distinct source string."""
+    code: List[Any] = []
+    _emit_opcodes(_parse_and_validate(expression)[0].body, code)
+    return tuple(code)
+
+
+# Compiled fast path. eval() only matches the interpreter when every operand
+# is already a Decimal, so compilation is limited to Decimal arithmetic:
+# numeric literals are hoisted into Decimal globals, comparisons may only
+# appear as conditional tests, and only functions returning Decimals are
+# callable. Anything else stays on the interpreter.
+_NOT_COMPILED = object()
+
+_COMPILED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_COMPILED_COMPARISONS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_COMPILED_FUNCTIONS = ('abs', 'round', 'max', 'min', 'sum', 'int', 'float', 'Decimal', 'pow', 'len')
+
+
+def _compiled_function(func_name: str):
+    """Bind a whitelisted function to the interpreter's Decimal-preserving implementation."""
+    def call(*args):
+        return _ANALYZER._call_function(func_name, list(args))
+    return call
+
+
+_COMPILED_GLOBALS = {
+    '__builtins__': {},
+    **{name: _compiled_function(name) for name in _COMPILED_FUNCTIONS},
+}
+
+
+def _is_compilable(node: ast.AST) -> bool:
+    """Whether a value node evaluates identically under eval() and the interpreter."""
+    if isinstance(node, ast.Constant):
+        return _is_numeric_constant(node)
+    if isinstance(node, ast.Name):
+        return True
+    if isinstance(node, ast.BinOp):
+        return (isinstance(node.op, _COMPILED_BINOPS)
+                and _is_compilable(node.left) and _is_compilable(node.right))
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, ast.USub) and _is_compilable(node.operand)
+    if isinstance(node, ast.IfExp):
+        return (_is_compilable_test(node.test)
+                and _is_compilable(node.body) and _is_compilable(node.orelse))
+    if isinstance(node, ast.Call):
+        return (isinstance(node.func, ast.Name)
+                and node.func.id in _COMPILED_FUNCTIONS
+                and not node.keywords
+                and all(_is_compilable(arg)
+                        or (isinstance(arg, ast.List) and all(_is_compilable(elt) for elt in arg.elts))
+                        for arg in node.args))
+    return False
+
+
+def _is_compilable_test(node: ast.AST) -> bool:
+    """Like _is_compilable, additionally allowing comparisons of Decimal values."""
+    if isinstance(node, ast.Compare):
+        return (all(isinstance(op, _COMPILED_COMPARISONS) for op in node.ops)
+                and _is_compilable(node.left)
+                and all(_is_compilable(comparator) for comparator in node.comparators))
+    return _is_compilable(node)
+
+
+class _ConstantHoister(ast.NodeTransformer):
+    """Replace numeric literals, folded ones included, with names bound to their Decimal values."""
+
+    def __init__(self):
+        # Generated names start with '_', which user variables never do
+        self.constants: Dict[str, Decimal] = {}
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        name = f'_c{len(self.constants)}'
+        self.constants[name] = _ANALYZER._convert_to_decimal(node.value)
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(expression: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+    """
+    Compile an expression to bytecode once per distinct source string.
+
+    Returns the code object with the sandboxed globals to eval it against,
+    or None when the expression is outside the compiled subset.
+    """
+    tree = _parse_and_validate(expression)[0]
+    if not _is_compilable(tree.body):
+        return None
+
+    # Rewrite a copy; the cached tree is shared
+    hoister = _ConstantHoister()
+    body = hoister.visit(copy.deepcopy(tree.body))
+    code = compile(ast.fix_missing_locations(ast.Expression(body=body)), '<dsl>', 'eval')
+    return code, {**_COMPILED_GLOBALS, **hoister.constants}
 
 
 # Convenience functions
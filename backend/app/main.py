@@ -1,12 +1,14 @@
 import logging
 import asyncio
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
-from .database import get_db, init_db, engine, Base
+from .database import init_db, DB_POOL_WARM, warm_pool, dispose_async_engine
+from .deps import RequestService, get_session_service, get_retention_service
 from .models import Session as SessionModel
 from .schemas import ApiResponse, SessionResponse
 from .services.session_service import SessionService
@@ -17,42 +19,18 @@ from .routers import batch, batch_parameters, parameter_presets, batch_calculati
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global variable to control cleanup task
-cleanup_task = None
+# Global variable holding the expression warm-up task
+expression_warmup_task = None
 
-async def periodic_cleanup():
-    """Background task to periodically clean up expired sessions and data"""
-    logger.info("Starting periodic cleanup task")
+async def warm_expression_cache():
+    """Pre-parse stored plan expressions in a worker thread, off the event loop"""
+    from .services.plan_management_service import warm_plan_expressions
     
-    while True:
-        try:
-            # Wait 4 hours between cleanup runs
-            await asyncio.sleep(4 * 60 * 60)  # 4 hours in seconds
-            
-            logger.info("Running periodic cleanup of expired data")
-            
-            # Get database session
-            from .database import SessionLocal
-            db = SessionLocal()
-            
-            try:
-                # Run cleanup
-                retention_service = DataRetentionService(db)
-                cleanup_stats = retention_service.cleanup_expired_data(retention_hours=72)
-                
-                logger.info(f"Periodic cleanup completed: {cleanup_stats}")
-                
-            except Exception as e:
-                logger.error(f"Error during periodic cleanup: {str(e)}")
-            finally:
-                db.close()
-                
-        except asyncio.CancelledError:
-            logger.info("Periodic cleanup task cancelled")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error in periodic cleanup: {str(e)}")
-            # Continue running even if an error occurs
+    try:
+        warmed = await asyncio.to_thread(warm_plan_expressions)
+        logger.info(f"Expression cache warmed with {warmed} plan expressions")
+    except Exception as e:
+        logger.warning(f"Expression cache warm-up failed: {e}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -61,6 +39,13 @@ async def lifespan(app: FastAPI):
     logger.info("Starting FastAPI application")
     init_db()
     
+    # Pre-open pooled database connections
+    if DB_POOL_WARM:
+        try:
+            logger.info(f"Warmed {warm_pool()} database connections")
+        except Exception as e:
+            logger.warning(f"Database pool warm-up failed: {e}")
+    
     # Initialize platform infrastructure
     from .redis_client import is_redis_available
     from .queue import queue_service
@@ -82,16 +67,20 @@ async def lifespan(app: FastAPI):
     enable_metrics()
     logger.info("Metrics collection enabled")
     
-    # Start periodic cleanup task
-    global cleanup_task
-    cleanup_task = asyncio.create_task(periodic_cleanup())
-    logger.info("Started periodic cleanup background task")
+    # Warm the expression caches so first plan runs skip parsing
+    global expression_warmup_task
+    expression_warmup_task = asyncio.create_task(warm_expression_cache())
+    
+    # Periodic data cleanup runs on Celery workers (see app.tasks.maintenance_tasks)
     
     yield
     
     # Shutdown
     logger.info("Shutting down FastAPI application")
     
+    # Close async database connections
+    await dispose_async_engine()
+    
     # Cleanup Redis connections
     try:
         from .redis_client import close_redis
@@ -99,48 +88,68 @@ async def lifespan(app: FastAPI):
         logger.info("Redis connections closed")
     except Exception as e:
         logger.warning(f"Error closing Redis connections: {e}")
-    
-    # Cancel cleanup task
-    if cleanup_task:
-        cleanup_task.cancel()
-        try:
-            await cleanup_task
-        except asyncio.CancelledError:
-            logger.info("Periodic cleanup task cancelled successfully")
 
 app = FastAPI(
     title="Compensation Platform API",
     description="Pluggable bonus calculation platform for fund managers with multi-tenant support, configurable rules, and workflow automation",
     version="2.0.0-dev",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson-encoded response bodies
 )
 
-# Platform tenant middleware
-from .middleware import TenantMiddleware
-app.add_middleware(TenantMiddleware)
+# Redis-backed cache for slow-changing GETs; added before TenantMiddleware so
+# it runs inside it and keys entries by the resolved tenant
+from .middleware import MetricsMiddleware, ResponseCacheMiddleware, TenantMiddleware
+app.add_middleware(
+    ResponseCacheMiddleware,
+    routes={
+        "/api/v1/sessions/{session_id}": 30,
+        "/api/admin/retention/stats": 300,
+    },
+    invalidations={
+        "/api/v1/sessions/{session_id}/extend": "/api/v1/sessions/{session_id}",
+        "/api/admin/retention/cleanup": "/api/admin/retention/stats",
+    },
+)
+
+# Platform tenant middleware; CORS is added after it, so it runs first and
+# answers preflights before tenant resolution
+app.add_middleware(
+    TenantMiddleware,
+    bypass_paths=frozenset({"/", "/health", "/health/", "/health/metrics", "/docs", "/redoc", "/openapi.json"}),
+)
+
+# CORS middleware. Credentialed requests need exact origins (browsers reject
+# "*"): local dev servers on any port, plus deployment origins from
+# FRONTEND_URL and CORS_ORIGINS (comma-separated). max_age lets browsers
+# cache preflights.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in f'{os.getenv("FRONTEND_URL", "")},{os.getenv("CORS_ORIGINS", "")}'.split(",")
+    if origin.strip()
+]
 
-# CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:3001", 
-        "http://localhost:3002",
-        "http://localhost:3003",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:3001",
-        "http://127.0.0.1:3002", 
-        "http://127.0.0.1:3003",
-        "*"  # Fallback for any other origins
-    ],
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=r"http://(localhost|127\.0\.0\.1):\d+",
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    max_age=600,
 )
 
+# Compress responses over 1 KB for clients that accept gzip; outside the
+# response cache, which keeps uncompressed bodies for every client
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Request metrics for every endpoint; added last so it is the outermost layer
+# and times the whole middleware stack
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(batch.router)  # Router already has prefix='/api/v1/batch'
-app.include_router(batch_parameters.router, prefix="/api/v1/batch")
+app.include_router(batch_parameters.router)  # Router already has prefix='/api/v1/batch'
 
 # Mount parameter_presets only under /api/v1 to avoid duplicate routes
 app.include_router(parameter_presets.router, prefix="/api/v1")
@@ -187,17 +196,27 @@ async def health_check():
     return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
 
 # Session Management Endpoints
+
+# Session rows come straight from the database with every SessionResponse
+# field set, so responses are built without a validation pass
+_SESSION_RESPONSE_FIELDS = tuple(SessionResponse.model_fields)
+
+def _session_response(session: SessionModel) -> SessionResponse:
+    """Build a SessionResponse from a session row without re-validating it."""
+    return SessionResponse.model_construct(
+        **{field: getattr(session, field) for field in _SESSION_RESPONSE_FIELDS}
+    )
+
 @app.post("/api/v1/sessions", response_model=ApiResponse)
-async def create_session(db: Session = Depends(get_db)):
+async def create_session(sessions: RequestService[SessionService] = Depends(get_session_service)):
     """Create a new session"""
     try:
-        session_service = SessionService(db)
-        session = session_service.create_session()
+        session = await sessions.run(lambda service: service.create_session())
         
         return ApiResponse(
             success=True,
             message="Session created successfully",
-            data=SessionResponse.model_validate(session)
+            data=_session_response(session)
         )
     except Exception as e:
         logger.error(f"Failed to create session: {str(e)}")
@@ -207,11 +226,10 @@ async def create_session(db: Session = Depends(get_db)):
         )
 
 @app.get("/api/v1/sessions/{session_id}", response_model=ApiResponse)
-async def get_session(session_id: str, db: Session = Depends(get_db)):
+async def get_session(session_id: str, sessions: RequestService[SessionService] = Depends(get_session_service)):
     """Get session information"""
     try:
-        session_service = SessionService(db)
-        session_info = session_service.get_session_info(session_id)
+        session_info = await sessions.run(lambda service: service.get_session_info(session_id))
         
         if not session_info:
             raise HTTPException(
@@ -234,11 +252,11 @@ async def get_session(session_id: str, db: Session = Depends(get_db)):
         )
 
 @app.post("/api/v1/sessions/{session_id}/extend", response_model=ApiResponse)
-async def extend_session(session_id: str, hours: int = 24, db: Session = Depends(get_db)):
+async def extend_session(session_id: str, hours: int = 24,
+                         sessions: RequestService[SessionService] = Depends(get_session_service)):
     """Extend session expiration time"""
     try:
-        session_service = SessionService(db)
-        session = session_service.extend_session(session_id, hours)
+        session = await sessions.run(lambda service: service.extend_session(session_id, hours))
         
         if not session:
             raise HTTPException(
@@ -249,7 +267,7 @@ async def extend_session(session_id: str, hours: int = 24, db: Session = Depends
         return ApiResponse(
             success=True,
             message=f"Session extended by {hours} hours",
-            data=SessionResponse.model_validate(session)
+            data=_session_response(session)
         )
     except HTTPException:
         raise
@@ -262,11 +280,10 @@ async def extend_session(session_id: str, hours: int = 24, db: Session = Depends
 
 # Data Retention Endpoints
 @app.get("/api/admin/retention/stats", response_model=ApiResponse)
-async def get_retention_stats(db: Session = Depends(get_db)):
+async def get_retention_stats(retention: RequestService[DataRetentionService] = Depends(get_retention_service)):
     """Get data retention statistics"""
     try:
-        retention_service = DataRetentionService(db)
-        stats = retention_service.get_data_retention_stats()
+        stats = await retention.run(lambda service: service.get_data_retention_stats())
         
         return ApiResponse(
             success=True,
@@ -281,11 +298,11 @@ async def get_retention_stats(db: Session = Depends(get_db)):
         )
 
 @app.post("/api/admin/retention/cleanup", response_model=ApiResponse)
-async def cleanup_expired_data(retention_hours: int = 72, db: Session = Depends(get_db)):
+async def cleanup_expired_data(retention_hours: int = 72,
+                               retention: RequestService[DataRetentionService] = Depends(get_retention_service)):
     """Clean up expired data"""
     try:
-        retention_service = DataRetentionService(db)
-        cleanup_stats = retention_service.cleanup_expired_data(retention_hours)
+        cleanup_stats = await retention.run(lambda service: service.cleanup_expired_data(retention_hours))
         
         return ApiResponse(
             success=True,
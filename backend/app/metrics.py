@@ -2,10 +2,8 @@
 Metrics and observability for the platform transformation.
 Provides Prometheus metrics without breaking existing functionality.
 """
-import time
 import logging
 from typing import Dict, Any, Optional
-from functools import wraps
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Response
 
@@ -18,10 +16,17 @@ REQUESTS_TOTAL = Counter(
     ['method', 'endpoint', 'status_code']
 )
 
+# Buckets match each workload's range instead of the 5ms-10s defaults: API
+# requests take milliseconds, calculations and file processing take seconds
+# to minutes
+REQUEST_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PROCESSING_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600)
+
 REQUEST_DURATION = Histogram(
     'http_request_duration_seconds',
     'HTTP request duration in seconds',
-    ['method', 'endpoint']
+    ['method', 'endpoint'],
+    buckets=REQUEST_DURATION_BUCKETS
 )
 
 CALCULATION_REQUESTS = Counter(
@@ -33,7 +38,8 @@ CALCULATION_REQUESTS = Counter(
 CALCULATION_DURATION = Histogram(
     'calculation_duration_seconds',
     'Calculation processing time in seconds',
-    ['plan_type']
+    ['plan_type'],
+    buckets=PROCESSING_DURATION_BUCKETS
 )
 
 ACTIVE_CALCULATIONS = Gauge(
@@ -50,7 +56,8 @@ FILE_UPLOADS = Counter(
 FILE_PROCESSING_DURATION = Histogram(
     'file_processing_duration_seconds',
     'File processing time in seconds',
-    ['file_type']
+    ['file_type'],
+    buckets=PROCESSING_DURATION_BUCKETS
 )
 
 QUEUE_DEPTH = Gauge(
@@ -140,29 +147,6 @@ class MetricsCollector:
 # Global metrics collector
 metrics = MetricsCollector()
 
-def track_request_metrics(endpoint: str):
-    """Decorator to track request metrics."""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            start_time = time.time()
-            status_code = 200
-            
-            try:
-                result = await func(*args, **kwargs)
-                return result
-            except Exception as e:
-                status_code = 500
-                raise
-            finally:
-                duration = time.time() - start_time
-                # Extract method from request if available
-                method = "GET"  # Default, would need request context for actual method
-                metrics.record_request(method, endpoint, status_code, duration)
-        
-        return wrapper
-    return decorator
-
 def get_metrics() -> Response:
     """Get Prometheus metrics endpoint."""
     try:
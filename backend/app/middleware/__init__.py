@@ -12,6 +12,8 @@ from .tenant_middleware import (
     OptionalTenant,
     RequiredTenant
 )
+from .response_cache import ResponseCacheMiddleware
+from .metrics_middleware import MetricsMiddleware
 
 __all__ = [
     'TenantMiddleware',
@@ -20,5 +22,7 @@ __all__ = [
     'get_tenant_db_session',
     'TenantContextDependency',
     'OptionalTenant',
-    'RequiredTenant'
+    'RequiredTenant',
+    'ResponseCacheMiddleware',
+    'MetricsMiddleware'
 ]
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Metrics middleware recording Prometheus request metrics for every endpoint.
+"""
+import time
+from typing import Optional
+
+from starlette.routing import Match
+
+from ..metrics import metrics
+
+
+def _route_template(scope) -> Optional[str]:
+    """
+    Path template of the route serving the request.
+    
+    The router stores the matched route in the scope; responses answered
+    before routing (response cache hits) are matched against the app's
+    routes here instead.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", None)
+    app = scope.get("app")
+    for candidate in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return getattr(candidate, "path", None)
+    return None
+
+
+class MetricsMiddleware:
+    """
+    Record method, route, status code and duration of every HTTP request.
+    
+    Endpoints are labelled by their route template (/api/v1/sessions/{session_id})
+    so path parameters do not multiply series; requests matching no route
+    share one label.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        """ASGI middleware implementation."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start_time
+            endpoint = _route_template(scope) or "unmatched"
+            metrics.record_request(scope["method"], endpoint, status_code, duration)
@@ -0,0 +1,186 @@
+"""
+Response cache middleware for slow-changing GET endpoints.
+Serves repeat GETs from Redis without touching the database.
+"""
+import asyncio
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from redis.exceptions import RedisError
+
+from ..redis_client import get_redis, get_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def _route_pattern(template: str) -> Pattern:
+    """Compile a path template like /sessions/{session_id} to a regex with named groups."""
+    parts = re.split(r"\{(\w+)\}", template)
+    regex = "".join(
+        f"(?P<{part}>[^/]+)" if index % 2 else re.escape(part)
+        for index, part in enumerate(parts)
+    )
+    return re.compile(f"^{regex}$")
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache successful GET responses of selected routes in Redis.
+
+    Entries are keyed by path, tenant and query string, and expire after the
+    route's TTL. A successful write (POST, PUT, PATCH, DELETE) to an invalidating route drops
+    every cached variant of the route it maps to, so writes made through the
+    API are visible at once; writes made elsewhere show up within the TTL.
+    Each path's variants are listed in a Redis set, so invalidation deletes
+    them directly instead of scanning the keyspace. Without Redis every
+    request passes straight through.
+    
+    The Redis client is synchronous, so every call runs in a worker thread
+    to keep the event loop free.
+
+    Mount it before TenantMiddleware (so it runs inside it) to key entries
+    by the resolved tenant.
+    """
+
+    def __init__(self, app, routes: Dict[str, int], invalidations: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            app: The ASGI application
+            routes: Cached GET path template -> TTL in seconds
+            invalidations: Mutating path template -> cached path template
+                it invalidates; path parameters are carried over by name
+        """
+        self.app = app
+        self.routes: List[Tuple[Pattern, int]] = [
+            (_route_pattern(template), ttl) for template, ttl in routes.items()
+        ]
+        self.invalidations: List[Tuple[Pattern, str]] = [
+            (_route_pattern(template), target) for template, target in (invalidations or {}).items()
+        ]
+
+    async def __call__(self, scope, receive, send):
+        """ASGI middleware implementation."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if method == "GET":
+            ttl = self._ttl(path)
+            if ttl is not None:
+                await self._cached(scope, receive, send, ttl)
+                return
+        elif method in ("POST", "PUT", "PATCH", "DELETE"):
+            stale_path = self._invalidated_path(path)
+            if stale_path is not None:
+                await self._invalidating(scope, receive, send, stale_path)
+                return
+
+        await self.app(scope, receive, send)
+
+    def _ttl(self, path: str) -> Optional[int]:
+        for pattern, ttl in self.routes:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    def _invalidated_path(self, path: str) -> Optional[str]:
+        for pattern, target in self.invalidations:
+            match = pattern.match(path)
+            if match:
+                return target.format(**match.groupdict())
+        return None
+
+    @staticmethod
+    def _key(scope) -> str:
+        tenant_id = scope.get("state", {}).get("tenant_id") or ""
+        query = scope.get("query_string", b"").decode("latin-1")
+        return get_cache_key("response", f"{scope['path']}:{tenant_id}:{query}")
+
+    @staticmethod
+    def _variants_key(path: str) -> str:
+        """Key of the set listing every cached variant of path."""
+        return get_cache_key("response-variants", path)
+
+    async def _cached(self, scope, receive, send, ttl: int) -> None:
+        """Replay a cached response, or run the app and cache a 200 response."""
+        redis = await asyncio.to_thread(get_redis)
+        if redis is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope)
+        try:
+            cached = await asyncio.to_thread(redis.get, key)
+        except RedisError as e:
+            logger.warning("Failed to read response cache: %s", e)
+            cached = None
+
+        if cached is not None:
+            entry = json.loads(cached)
+            headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in entry["headers"]]
+            await send({"type": "http.response.start", "status": entry["status"],
+                        "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": entry["body"].encode("latin-1")})
+            return
+
+        start: Dict = {}
+        body = []
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+            await send(message)
+            if (message["type"] == "http.response.body" and not message.get("more_body", False)
+                    and start.get("status") == 200):
+                await asyncio.to_thread(self._store, redis, scope["path"], key, ttl, start, b"".join(body))
+
+        await self.app(scope, receive, send_and_capture)
+
+    @classmethod
+    def _store(cls, redis, path: str, key: str, ttl: int, start: Dict, body: bytes) -> None:
+        """Cache a response under key and list key among path's variants."""
+        entry = json.dumps({
+            "status": start["status"],
+            "headers": [(name.decode("latin-1"), value.decode("latin-1")) for name, value in start.get("headers", [])],
+            "body": body.decode("latin-1"),
+        })
+        variants_key = cls._variants_key(path)
+        try:
+            pipe = redis.pipeline()
+            pipe.setex(key, ttl, entry)
+            pipe.sadd(variants_key, key)
+            # The entries a path's set lists share the route's TTL, so the set
+            # expires with the newest of them
+            pipe.expire(variants_key, ttl)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning("Failed to write response cache: %s", e)
+
+    async def _invalidating(self, scope, receive, send, stale_path: str) -> None:
+        """Run a mutating request, dropping the cached responses it makes stale before replying."""
+        async def send_and_drop(message):
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                await asyncio.to_thread(self._drop, stale_path)
+            await send(message)
+
+        await self.app(scope, receive, send_and_drop)
+
+    @classmethod
+    def _drop(cls, path: str) -> None:
+        """Delete every cached variant (tenant, query string) of path, and its variant set."""
+        redis = get_redis()
+        if redis is None:
+            return
+        variants_key = cls._variants_key(path)
+        try:
+            keys = redis.smembers(variants_key)
+            redis.delete(*keys, variants_key)
+        except RedisError as e:
+            logger.warning("Failed to invalidate response cache: %s", e)
@@ -3,12 +3,12 @@ Tenant middleware for automatic tenant context setting.
 Handles tenant identification from headers, tokens, or subdomain.
 """
 import logging
-from typing import Optional
+from typing import FrozenSet, Optional
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
-from ..database import create_tenant_session, get_db
+from ..database import create_tenant_session, get_db, set_tenant_context as set_request_tenant, reset_tenant_context
 from ..security import set_tenant_context
 
 logger = logging.getLogger(__name__)
@@ -16,18 +16,25 @@ logger = logging.getLogger(__name__)
 class TenantMiddleware:
     """Middleware to extract and set tenant context for requests."""
     
-    def __init__(self, app):
+    def __init__(self, app, bypass_paths: FrozenSet[str] = frozenset()):
+        """
+        Args:
+            app: The ASGI application
+            bypass_paths: Exact paths served without tenant context (health
+                checks, docs), skipped without parsing any headers
+        """
         self.app = app
+        self.bypass_paths = frozenset(bypass_paths)
         self.security = HTTPBearer(auto_error=False)
     
     async def __call__(self, scope, receive, send):
         """ASGI middleware implementation."""
-        if scope["type"] != "http":
+        if (scope["type"] != "http" or scope["method"] == "OPTIONS"
+                or scope["path"] in self.bypass_paths):
             await self.app(scope, receive, send)
             return
             
         # Create a request object to extract tenant info
-        from starlette.requests import Request
         request = Request(scope, receive)
         
         tenant_id = self._extract_tenant_id(request)
@@ -38,7 +45,12 @@ class TenantMiddleware:
             scope["state"]["tenant_id"] = tenant_id
             logger.debug(f"Set tenant context: {tenant_id}")
         
-        await self.app(scope, receive, send)
+        # Also expose it through get_tenant_context() for this request only
+        token = set_request_tenant(tenant_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_tenant_context(token)
     
     def _extract_tenant_id(self, request: Request) -> Optional[str]:
         """Extract tenant ID from request headers, subdomain, or token."""
@@ -1,19 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float, JSON, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float, JSON, Index, LargeBinary, BigInteger, Identity
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text, false
 from datetime import datetime, timedelta
 import uuid
 
 from .database import Base
 
+# Fixed-width identifier type for platform tables: native 16-byte uuid on
+# PostgreSQL, VARCHAR(36) elsewhere. Values remain strings in Python.
+GUID = String(36).with_variant(UUID(as_uuid=False), "postgresql")
+
+# JSON type for platform tables: binary JSONB on PostgreSQL, JSON elsewhere.
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
 class Session(Base):
     """Session model for managing anonymous user sessions"""
     __tablename__ = "sessions"
     
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    expires_at = Column(DateTime, nullable=False, default=lambda: datetime.utcnow() + timedelta(hours=24))
+    expires_at = Column(DateTime, nullable=False, index=True, default=lambda: datetime.utcnow() + timedelta(hours=24))
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
@@ -44,6 +51,11 @@ class BatchUpload(Base):
     employee_data = relationship("EmployeeData", back_populates="batch_upload", cascade="all, delete-orphan")
     calculation_results = relationship("BatchCalculationResult", back_populates="batch_upload", cascade="all, delete-orphan")
 
+    # Serves the per-session upload listing in its newest-first order
+    __table_args__ = (
+        Index("ix_batch_uploads_session_created", session_id, created_at.desc()),
+    )
+
 class EmployeeData(Base):
     """Model for storing employee data from batch uploads"""
     __tablename__ = "employee_data"
@@ -194,7 +206,7 @@ class Team(Base):
     """Team entity used for revenue banding and grouping."""
     __tablename__ = "teams"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, unique=True, index=True)
     division = Column(String, nullable=True)
     peer_group = Column(String, nullable=True)
@@ -213,24 +225,27 @@ class TeamRevenueHistory(Base):
     """Normalized annual revenue series per team (one row per fiscal year)."""
     __tablename__ = "team_revenue_history"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    team_id = Column(String, ForeignKey("teams.id"), nullable=False, index=True)
-    fiscal_year = Column(Integer, nullable=False)
+    team_id = Column(String, ForeignKey("teams.id"), primary_key=True)
+    fiscal_year = Column(Integer, primary_key=True)
     revenue = Column(Float, nullable=False)
     currency = Column(String, nullable=True)
-    is_adjusted = Column(Boolean, default=False)
+    is_adjusted = Column(Boolean, nullable=False, default=False, server_default=false())
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=func.now())
 
     # Relationships
     team = relationship("Team", back_populates="revenue_history")
 
+    # The natural (team_id, fiscal_year) key is the only index needed; it also
+    # serves team_id-only lookups as its leftmost prefix
+    __table_args__ = {"sqlite_with_rowid": False}
+
 
 class RevenueBandConfig(Base):
     """Configuration for revenue banding thresholds, weights, and multipliers."""
     __tablename__ = "revenue_band_configs"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, unique=True, index=True)
     # Flexible settings blob to hold weights, thresholds, multipliers, etc.
     settings = Column(JSON, nullable=False)
@@ -246,12 +261,12 @@ class Tenant(Base):
     """Multi-tenant organization model for platform transformation."""
     __tablename__ = "tenants"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, nullable=False, default=True)
-    tenant_metadata = Column(JSON, nullable=False, default=lambda: {})
+    tenant_metadata = Column(JSONVariant, nullable=False, default=lambda: {})
     
     # Relationships
     users = relationship("User", back_populates="tenant", cascade="all, delete-orphan")
@@ -263,8 +278,8 @@ class User(Base):
     """Platform user model with role-based access control."""
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
     email = Column(String, nullable=False, index=True)
     display_name = Column(String)
     role = Column(String, nullable=False, default="readonly")  # admin, hr, manager, auditor, readonly
@@ -280,6 +295,8 @@ class User(Base):
     
     # Unique constraint on tenant + email
     __table_args__ = (
+        # Login and user lookups are always tenant + email
+        Index("ix_users_tenant_email", "tenant_id", "email"),
         {'schema': None},  # Will be set to 'comp' schema in production
     )
 
@@ -288,14 +305,14 @@ class InputCatalog(Base):
     """Catalog of input parameters for bonus calculations."""
     __tablename__ = "input_catalog"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
     key = Column(String, nullable=False)  # e.g., 'employee_score', 'aum', 'fund_return'
     label = Column(String, nullable=False)
     dtype = Column(String, nullable=False)  # decimal, int, text, date, bool
     required = Column(Boolean, nullable=False, default=False)
-    default_value = Column(JSON)
-    validation = Column(JSON, nullable=False, default=lambda: {})
+    default_value = Column(JSONVariant)
+    validation = Column(JSONVariant, nullable=False, default=lambda: {})
     created_at = Column(DateTime, nullable=False, default=func.now())
     
     # Relationships
@@ -304,6 +321,7 @@ class InputCatalog(Base):
     
     # Unique constraint on tenant + key
     __table_args__ = (
+        Index("ix_input_catalog_tenant_key", "tenant_id", "key"),
         {'schema': None},
     )
 
@@ -312,18 +330,18 @@ class BonusPlan(Base):
     """Configurable bonus calculation plans."""
     __tablename__ = "bonus_plans"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
     name = Column(String, nullable=False)  # e.g., "2025 Analyst Bonus Plan"
     version = Column(Integer, nullable=False)  # immutable after lock
     status = Column(String, nullable=False, default="draft")  # draft, approved, locked, archived
     effective_from = Column(DateTime)
     effective_to = Column(DateTime)
     notes = Column(Text)
-    plan_metadata = Column(JSON, nullable=False, default=lambda: {})
-    created_by = Column(String, ForeignKey("users.id"))
+    plan_metadata = Column(JSONVariant, nullable=False, default=lambda: {})
+    created_by = Column(GUID, ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
-    locked_by = Column(String, ForeignKey("users.id"))
+    locked_by = Column(GUID, ForeignKey("users.id"), index=True)
     locked_at = Column(DateTime)
     
     # Relationships
@@ -337,6 +355,14 @@ class BonusPlan(Base):
     
     # Unique constraint on tenant + name + version
     __table_args__ = (
+        # Version lookups filter on tenant + name and take the highest version
+        Index("ix_bonus_plan_tenant_name_ver", "tenant_id", "name", "version"),
+        # Partial index: plan listings only page through non-archived plans
+        Index(
+            "ix_bonus_plans_live", "tenant_id", "created_at",
+            postgresql_where=text("status <> 'archived'"),
+            sqlite_where=text("status <> 'archived'"),
+        ),
         {'schema': None},
     )
 
@@ -345,11 +371,12 @@ class PlanInput(Base):
     """Input parameters associated with a bonus plan."""
     __tablename__ = "plan_inputs"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    plan_id = Column(String, ForeignKey("bonus_plans.id"), nullable=False, index=True)
-    input_id = Column(String, ForeignKey("input_catalog.id"), nullable=False)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    plan_id = Column(GUID, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)  # denormalized for RLS
+    input_id = Column(GUID, ForeignKey("input_catalog.id"), nullable=False, index=True)
     required = Column(Boolean, nullable=False, default=True)
-    source_mapping = Column(JSON, nullable=False, default=lambda: {})  # CSV column names, transforms
+    source_mapping = Column(JSONVariant, nullable=False, default=lambda: {})  # CSV column names, transforms
     
     # Relationships
     plan = relationship("BonusPlan", back_populates="plan_inputs")
@@ -360,13 +387,14 @@ class PlanStep(Base):
     """Individual calculation steps within a bonus plan."""
     __tablename__ = "plan_steps"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    plan_id = Column(String, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    plan_id = Column(GUID, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)  # denormalized for RLS
     step_order = Column(Integer, nullable=False)
     name = Column(String, nullable=False)  # e.g., "performance_multiplier"
     expr = Column(Text, nullable=False)  # DSL or CEL/JSONLogic string
     condition_expr = Column(Text)  # optional IF guard
-    outputs = Column(JSON, nullable=False, default=lambda: [])  # which variables this step defines
+    outputs = Column(JSONVariant, nullable=False, default=lambda: [])  # which variables this step defines
     notes = Column(Text)
     
     # Relationships
@@ -382,11 +410,12 @@ class BonusPool(Base):
     """Bonus pool definitions for plans."""
     __tablename__ = "bonus_pools"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    plan_id = Column(String, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    plan_id = Column(GUID, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)  # denormalized for RLS
     currency = Column(String(3), nullable=False)
-    amount = Column(Numeric(38, 10), nullable=False)  # High precision for financial calculations
-    allocation_rules = Column(JSON, nullable=False, default=lambda: [])
+    amount_micros = Column(BigInteger, nullable=False)  # millionths of `currency`; integer sums, no NUMERIC
+    allocation_rules = Column(JSONVariant, nullable=False, default=lambda: [])
     created_at = Column(DateTime, nullable=False, default=func.now())
     
     # Relationships
@@ -397,13 +426,13 @@ class PlatformUpload(Base):
     """Enhanced upload tracking for platform transformation."""
     __tablename__ = "platform_uploads"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
-    created_by = Column(String, ForeignKey("users.id"))
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
+    created_by = Column(GUID, ForeignKey("users.id"), index=True)
     filename = Column(String, nullable=False)
     status = Column(String, nullable=False, default="received")  # received, processing, failed, ready
     file_size = Column(Integer)
-    upload_metadata = Column(JSON, nullable=False, default=lambda: {})
+    upload_metadata = Column(JSONVariant, nullable=False, default=lambda: {})
     created_at = Column(DateTime, nullable=False, default=func.now())
     
     # Relationships
@@ -412,31 +441,36 @@ class PlatformUpload(Base):
 
 
 class EmployeeRow(Base):
-    """Employee data rows from platform uploads."""
+    """Employee data rows from platform uploads (UNLOGGED staging table on PostgreSQL)."""
     __tablename__ = "employee_rows"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
-    upload_id = Column(String, ForeignKey("platform_uploads.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
+    upload_id = Column(GUID, ForeignKey("platform_uploads.id"), nullable=False, index=True)
     employee_ref = Column(String, nullable=False)  # external id or HR id
-    raw = Column(JSON, nullable=False)  # raw mapped fields as JSON
+    raw = Column(JSONVariant, nullable=False)  # raw mapped fields as JSON
     created_at = Column(DateTime, nullable=False, default=func.now())
     
     # Relationships
     upload = relationship("PlatformUpload", back_populates="employee_rows")
 
+    __table_args__ = (
+        # GIN index for JSONB containment queries; PostgreSQL only
+        Index("ix_employee_rows_raw_gin", "raw", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 
 class PlanRun(Base):
     """Execution runs of bonus plans."""
     __tablename__ = "plan_runs"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
-    plan_id = Column(String, ForeignKey("bonus_plans.id"), nullable=False, index=True)
-    upload_id = Column(String, ForeignKey("platform_uploads.id"))
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
+    plan_id = Column(GUID, ForeignKey("bonus_plans.id"), nullable=False, index=True)
+    upload_id = Column(GUID, ForeignKey("platform_uploads.id"), index=True)
     scenario_name = Column(String)
-    approvals_state = Column(JSON, nullable=False, default=lambda: {"state": "draft", "history": []})
-    snapshot_hash = Column(String, nullable=False)  # hash of plan+steps+inputs+funcs
+    approvals_state = Column(JSONVariant, nullable=False, default=lambda: {"state": "draft", "history": []})
+    snapshot_hash = Column(LargeBinary(32), nullable=False)  # raw SHA-256 of plan+steps+inputs+funcs; hex at the API
     started_at = Column(DateTime, nullable=False, default=func.now())
     finished_at = Column(DateTime)
     status = Column(String, nullable=False, default="draft")  # draft, manager_approved, hr_approved, finance_approved, finalized, failed
@@ -447,28 +481,51 @@ class PlanRun(Base):
     step_results = relationship("RunStepResult", back_populates="run", cascade="all, delete-orphan")
     totals = relationship("RunTotals", back_populates="run", uselist=False, cascade="all, delete-orphan")
 
+    # Newest-first run pages per tenant and per plan (any status), plus partial indexes for
+    # the dashboard/reporting status filters
+    __table_args__ = (
+        Index("ix_plan_run_tenant_started", "tenant_id", "started_at", "id"),
+        Index("ix_plan_run_tenant_plan_started", "tenant_id", "plan_id", "started_at", "id"),
+        Index(
+            "ix_plan_runs_active", "tenant_id", "started_at",
+            postgresql_where=text("status = 'running'"),
+            sqlite_where=text("status = 'running'"),
+        ),
+        Index(
+            "ix_plan_runs_completed", "tenant_id", "finished_at",
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'"),
+        ),
+    )
+
 
 class RunStepResult(Base):
     """Results of individual calculation steps per employee."""
     __tablename__ = "run_step_results"
     
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    run_id = Column(String, ForeignKey("plan_runs.id"), nullable=False, index=True)
+    id = Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(GUID, ForeignKey("plan_runs.id"), nullable=False)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)  # denormalized for RLS
     employee_ref = Column(String, nullable=False)
     step_name = Column(String, nullable=False)
-    value = Column(JSON, nullable=False)  # store numeric as string inside JSON for precision
+    value = Column(JSONVariant, nullable=False)  # store numeric as string inside JSON for precision
     created_at = Column(DateTime, nullable=False, default=func.now())
     
     # Relationships
     run = relationship("PlanRun", back_populates="step_results")
+    
+    __table_args__ = (
+        # Covering index so per-run reports can use index-only scans on PostgreSQL
+        Index("ix_run_step_results_run_id", "run_id", postgresql_include=["employee_ref", "step_name"]),
+    )
 
 
 class RunTotals(Base):
     """Aggregated totals for plan runs."""
     __tablename__ = "run_totals"
     
-    run_id = Column(String, ForeignKey("plan_runs.id"), primary_key=True)
-    totals = Column(JSON, nullable=False, default=lambda: {})  # aggregated metrics, pool usage, etc.
+    run_id = Column(GUID, ForeignKey("plan_runs.id"), primary_key=True)
+    totals = Column(JSONVariant, nullable=False, default=lambda: {})  # aggregated metrics, pool usage, etc.
     
     # Relationships
     run = relationship("PlanRun", back_populates="totals")
@@ -478,16 +535,24 @@ class AuditEvent(Base):
     """Comprehensive audit trail for platform actions."""
     __tablename__ = "audit_events"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)  # Use bigserial equivalent
-    tenant_id = Column(String, ForeignKey("tenants.id"), nullable=False, index=True)
-    actor_user_id = Column(String, ForeignKey("users.id"))
+    # 64-bit identity; SQLite needs INTEGER for its rowid-backed autoincrement.
+    # On PostgreSQL the migrations range-partition this table on `at`.
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), Identity(always=True), primary_key=True)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False, index=True)
+    actor_user_id = Column(GUID, ForeignKey("users.id"), index=True)
     action = Column(String, nullable=False)  # 'plan.create', 'run.finalize', etc.
     entity = Column(String, nullable=False)  # 'bonus_plan', 'plan_run', 'upload', ...
     entity_id = Column(String, nullable=False)
-    before = Column(JSON)
-    after = Column(JSON)
+    before = Column(JSONVariant)
+    after = Column(JSONVariant)
     at = Column(DateTime, nullable=False, default=func.now())
     signature = Column(String)  # optional tamper-evident chain
     
     # Relationships
     actor = relationship("User", back_populates="audit_events")
+    
+    # Keyset pagination of per-entity and per-actor trails seeks on (at, id)
+    __table_args__ = (
+        Index("ix_audit_events_entity_at", tenant_id, entity, entity_id, at.desc(), id.desc()),
+        Index("ix_audit_events_actor_at", tenant_id, actor_user_id, at.desc(), id.desc()),
+    )
@@ -14,6 +14,12 @@ logger = logging.getLogger(__name__)
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
 
+# Time between scheduled data retention cleanups (run by celery beat)
+CLEANUP_INTERVAL_SECONDS = int(os.getenv("CLEANUP_INTERVAL_SECONDS", str(4 * 60 * 60)))
+
+# Time between runs of the task that creates upcoming audit_events partitions
+AUDIT_PARTITION_INTERVAL_SECONDS = int(os.getenv("AUDIT_PARTITION_INTERVAL_SECONDS", str(24 * 60 * 60)))
+
 # Create Celery app
 celery_app = Celery(
     'compensation_platform',
@@ -22,6 +28,7 @@ celery_app = Celery(
     include=[
         'app.tasks.calculation_tasks',
         'app.tasks.processing_tasks',
+        'app.tasks.maintenance_tasks',
     ]
 )
 
@@ -38,6 +45,22 @@ celery_app.conf.update(
     task_routes={
         'app.tasks.calculation_tasks.*': {'queue': 'calculations'},
         'app.tasks.processing_tasks.*': {'queue': 'processing'},
+        'app.tasks.maintenance_tasks.*': {'queue': 'maintenance'},
+    },
+    
+    # Scheduled tasks; run beat alongside a worker consuming the maintenance
+    # queue, e.g. celery -A app.queue worker -B -Q maintenance
+    beat_schedule={
+        'cleanup-expired-data': {
+            'task': 'app.tasks.maintenance_tasks.cleanup_expired_data',
+            'schedule': CLEANUP_INTERVAL_SECONDS,
+            'kwargs': {'retention_hours': 72},
+        },
+        'create-audit-partitions': {
+            'task': 'app.tasks.maintenance_tasks.create_audit_partitions',
+            'schedule': AUDIT_PARTITION_INTERVAL_SECONDS,
+            'kwargs': {'months_ahead': 3},
+        },
     },
     
     # Result settings
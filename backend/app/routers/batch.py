@@ -407,7 +407,7 @@ async def list_uploads(
     """
     try:
         batch_dal = BatchUploadDAL(db)
-        uploads = batch_dal.get_by_session(session_id)
+        uploads = batch_dal.iter_by_session(session_id)
         
         upload_data = []
         for upload in uploads:
@@ -28,6 +28,7 @@ async def list_bonus_plans(
     status: Optional[str] = Query(None, description="Filter by plan status"),
     include_steps: bool = Query(False, description="Include plan steps in response"),
     include_inputs: bool = Query(False, description="Include plan inputs in response"),
+    include_summary: bool = Query(False, description="Include step/input/run counts and last run time"),
     request: Request = None,
     tenant_id: str = Depends(RequiredTenant)
 ):
@@ -39,7 +40,8 @@ async def list_bonus_plans(
         plans = plan_service.get_plans(
             status_filter=status,
             include_steps=include_steps,
-            include_inputs=include_inputs
+            include_inputs=include_inputs,
+            include_summary=include_summary
         )
         
         return PlatformApiResponse(
@@ -1144,7 +1146,7 @@ async def get_run_snapshot_hash(
             data={
                 'run_id': run_id,
                 'plan_id': plan_run.plan_id,
-                'snapshot_hash': plan_run.snapshot_hash,
+                'snapshot_hash': plan_run.snapshot_hash.hex(),
                 'started_at': plan_run.started_at.isoformat(),
                 'finished_at': plan_run.finished_at.isoformat() if plan_run.finished_at else None,
                 'status': plan_run.status,
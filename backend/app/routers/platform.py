@@ -2,8 +2,10 @@
 Platform API router for tenant and user management.
 Provides endpoints for multi-tenant platform operations.
 """
+import json
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -276,4 +278,38 @@ async def get_audit_trail(
             detail=f"Failed to get audit trail: {str(e)}"
         )
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@router.get("/audit-trail/export")
+async def export_audit_trail(
+    entity: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    actor_user_id: Optional[str] = None,
+    request: Request = None,
+    tenant_id: str = Depends(RequiredTenant)
+):
+    """
+    Stream the full audit trail of an entity or an actor as NDJSON.
+    
+    Events are written as they are fetched, so memory stays bounded by the
+    DAL's fetch chunk however long the trail is.
+    """
+    if not ((entity and entity_id) or actor_user_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide entity and entity_id, or actor_user_id"
+        )
+    
+    db = get_tenant_db_session(request)
+    tenant_service = get_tenant_service(db, tenant_id)
+    
+    def ndjson_lines():
+        # The session has to outlive this handler, so the stream closes it
+        try:
+            for event in tenant_service.iter_audit_trail(entity, entity_id, actor_user_id):
+                yield json.dumps(event, default=str) + "\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..dal.scenario_dal import ScenarioDAL
+from ..dal.unit_of_work import UnitOfWork
 from ..dal.batch_upload_dal import BatchUploadDAL
 from ..schemas import (
     ApiResponse, 
@@ -315,14 +316,15 @@ async def update_scenario(
         ApiResponse with updated scenario details
     """
     try:
-        scenario_dal = ScenarioDAL(db)
-        updated_scenario = scenario_dal.update_with_audit(scenario_id, update_data)
-        
-        if not updated_scenario:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Scenario {scenario_id} not found"
-            )
+        # Update and its audit row commit together when the block exits
+        with UnitOfWork(db) as uow:
+            updated_scenario = uow.scenarios.update_with_audit(scenario_id, update_data, commit=False)
+            
+            if not updated_scenario:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Scenario {scenario_id} not found"
+                )
         
         return ApiResponse(
             success=True,
@@ -364,24 +366,23 @@ async def delete_scenario(
         ApiResponse confirming deletion
     """
     try:
-        scenario_dal = ScenarioDAL(db)
-        
-        # Get scenario name before deletion for response
-        scenario = scenario_dal.get(scenario_id)
-        if not scenario:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Scenario {scenario_id} not found"
-            )
-        
-        scenario_name = scenario.name
-        deleted = scenario_dal.delete_with_audit(scenario_id)
-        
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Scenario {scenario_id} not found"
-            )
+        with UnitOfWork(db) as uow:
+            # Get scenario name before deletion for response
+            scenario = uow.scenarios.get(scenario_id)
+            if not scenario:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Scenario {scenario_id} not found"
+                )
+            
+            scenario_name = scenario.name
+            deleted = uow.scenarios.delete_with_audit(scenario_id, commit=False)
+            
+            if not deleted:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Scenario {scenario_id} not found"
+                )
         
         return ApiResponse(
             success=True,
@@ -419,14 +420,16 @@ async def duplicate_scenario(
         ApiResponse with duplicated scenario details
     """
     try:
-        scenario_dal = ScenarioDAL(db)
-        duplicate = scenario_dal.duplicate_scenario(scenario_id, new_name, new_description)
-        
-        if not duplicate:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Scenario {scenario_id} not found"
+        with UnitOfWork(db) as uow:
+            duplicate = uow.scenarios.duplicate_scenario(
+                scenario_id, new_name, new_description, commit=False
             )
+            
+            if not duplicate:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Scenario {scenario_id} not found"
+                )
         
         return ApiResponse(
             success=True,
@@ -532,7 +535,7 @@ async def get_available_batch_sources(
     """
     try:
         batch_dal = BatchUploadDAL(db)
-        uploads = batch_dal.get_by_session(session_id)
+        uploads = batch_dal.iter_by_session(session_id)
         
         # Filter to only completed uploads with employee data
         available_sources = []
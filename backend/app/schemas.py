@@ -303,7 +303,6 @@ class TeamRevenueHistoryCreate(TeamRevenueHistoryBase):
 class TeamRevenueHistoryResponse(TeamRevenueHistoryBase):
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
     team_id: str
     created_at: datetime
 
@@ -591,6 +590,12 @@ class PlanRunResponse(PlanRunBase):
     upload_id: Optional[str] = None
     started_at: datetime
     finished_at: Optional[datetime] = None
+    
+    @field_validator('snapshot_hash', mode='before')
+    @classmethod
+    def hex_snapshot_hash(cls, v):
+        # Stored as a raw 32-byte digest; exposed as hex
+        return v.hex() if isinstance(v, bytes) else v
 
 
 class AuditEventBase(BaseModel):
@@ -20,6 +20,7 @@ class RLSManager:
         try:
             # Enable RLS on all tenant tables
             self._enable_rls_on_tables()
+            self._create_current_tenant_function()
             
             # Create policies for each table
             self._create_user_policies()
@@ -54,13 +55,22 @@ class RLSManager:
         for table in tables:
             self.db.execute(text(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;"))
     
+    def _create_current_tenant_function(self):
+        """Create the STABLE tenant lookup used by every policy."""
+        # Evaluated once per query rather than per row, already cast to uuid
+        self.db.execute(text("""
+            CREATE OR REPLACE FUNCTION current_tenant() RETURNS uuid AS $$
+                SELECT NULLIF(current_setting('app.current_tenant_id', true), '')::uuid
+            $$ LANGUAGE sql STABLE;
+        """))
+    
     def _create_user_policies(self):
         """Create RLS policies for users table."""
         # Allow users to see only users from their tenant
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON users
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_input_catalog_policies(self):
@@ -68,7 +78,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON input_catalog
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_bonus_plan_policies(self):
@@ -76,21 +86,16 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON bonus_plans
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_plan_input_policies(self):
         """Create RLS policies for plan_inputs table."""
-        # Use subquery to check tenant via bonus_plans
+        # tenant_id is denormalized onto child tables so no parent subquery is needed
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON plan_inputs
             FOR ALL
-            USING (
-                plan_id IN (
-                    SELECT id FROM bonus_plans 
-                    WHERE tenant_id = current_setting('app.current_tenant_id', true)
-                )
-            );
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_plan_step_policies(self):
@@ -98,12 +103,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON plan_steps
             FOR ALL
-            USING (
-                plan_id IN (
-                    SELECT id FROM bonus_plans 
-                    WHERE tenant_id = current_setting('app.current_tenant_id', true)
-                )
-            );
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_bonus_pool_policies(self):
@@ -111,12 +111,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON bonus_pools
             FOR ALL
-            USING (
-                plan_id IN (
-                    SELECT id FROM bonus_plans 
-                    WHERE tenant_id = current_setting('app.current_tenant_id', true)
-                )
-            );
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_platform_upload_policies(self):
@@ -124,7 +119,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON platform_uploads
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_employee_row_policies(self):
@@ -132,7 +127,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON employee_rows
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_plan_run_policies(self):
@@ -140,7 +135,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON plan_runs
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_run_step_result_policies(self):
@@ -148,12 +143,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON run_step_results
             FOR ALL
-            USING (
-                run_id IN (
-                    SELECT id FROM plan_runs 
-                    WHERE tenant_id = current_setting('app.current_tenant_id', true)
-                )
-            );
+            USING (tenant_id = current_tenant());
         """))
     
     def _create_audit_event_policies(self):
@@ -161,7 +151,7 @@ class RLSManager:
         self.db.execute(text("""
             CREATE POLICY tenant_isolation ON audit_events
             FOR ALL
-            USING (tenant_id = current_setting('app.current_tenant_id', true));
+            USING (tenant_id = current_tenant());
         """))
     
     def set_tenant_context(self, tenant_id: str):
@@ -156,7 +156,7 @@ class ApprovalWorkflowService:
             return {'error': 'Plan not found'}
         
         # Get workflow history from audit events
-        workflow_events = self.audit_dal.get_by_entity('bonus_plan', plan_id)
+        workflow_events = self.audit_dal.get_by_entity('bonus_plan', plan_id, limit=None)
         
         return {
             'plan_id': plan_id,
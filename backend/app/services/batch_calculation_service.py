@@ -14,7 +14,7 @@ import asyncio
 
 from ..models import BatchUpload, EmployeeData, BatchCalculationResult, EmployeeCalculationResult, BatchScenario
 from ..schemas import BatchParameters, BatchCalculationResultCreate, EmployeeCalculationResultCreate
-from ..calculation_engine import CalculationEngine, CalculationInputs, CalculationResult, ValidationError
+from ..calculation_engine import CalculationEngine, CalculationInputs, ValidationError
 from .revenue_banding_service import RevenueBandingService
 
 logger = logging.getLogger(__name__)
@@ -221,12 +221,9 @@ class BatchCalculationService:
 
             # Process employees in chunks to avoid memory issues
             chunk_size = 100
-            total_base_salary = 0
-            pre_scaling_bonus_total = 0
-            capped_count = 0
             
-            # First pass: Calculate initial bonuses without pool limit to get total
-            initial_results = []
+            # First pass: resolve each employee's inputs
+            valid_employees = []
             initial_calculation_inputs = []
             
             logger.info("Starting first pass calculation...")
@@ -237,10 +234,10 @@ class BatchCalculationService:
                     try:
                         base_salary = float(employee.salary) if employee.salary is not None else 0
                         if base_salary <= 0:
-                            logger.warning(f"Invalid base salary for employee {employee.id}: {base_salary}")
+                            logger.warning("Invalid base salary for employee %s: %s", employee.id, base_salary)
                             continue
                     except (ValueError, TypeError):
-                        logger.warning(f"Invalid base salary format for employee {employee.id}: {employee.salary}")
+                        logger.warning("Invalid base salary format for employee %s: %s", employee.id, employee.salary)
                         continue
                     
                     # Check if employee has RAF override in additional_data
@@ -254,13 +251,13 @@ class BatchCalculationService:
                             try:
                                 raf_override = float(raw_raf)
                             except (ValueError, TypeError):
-                                logger.warning(f"Invalid RAF override for employee {employee.id}: {raw_raf}")
+                                logger.warning("Invalid RAF override for employee %s: %s", employee.id, raw_raf)
                         
                         # Get MRT flag and ensure it's a boolean
                         raw_is_mrt = employee.additional_data.get('is_mrt', False)
                         is_mrt = bool(raw_is_mrt)
                     
-                    # Prepare calculation inputs for first pass (without pool limit)
+                    # Prepare calculation inputs (pool limit is applied batch-wide below)
                     if is_category_based:
                         # Use category-aware parameter resolution
                         calculation_inputs = self.calculation_engine.create_calculation_inputs_from_category_params(
@@ -270,7 +267,7 @@ class BatchCalculationService:
                             employee_position=employee.position,
                             is_mrt=is_mrt,
                             raf_override=raf_override if raf_override is not None and category_based_params['defaultParameters'].get('useDirectRaf', True) else None,
-                            use_bonus_pool_limit=False  # First pass without pool limit
+                            use_bonus_pool_limit=False
                         )
                     else:
                         # Use legacy universal parameters
@@ -284,42 +281,53 @@ class BatchCalculationService:
                             raf=raf_override if raf_override is not None and legacy_parameters.useDirectRaf else legacy_parameters.raf,
                             is_mrt=is_mrt,
                             mrt_cap_pct=legacy_parameters.mrtCapPct if is_mrt else None,
-                            # No bonus pool limit for first pass
                             use_bonus_pool_limit=False
                         )
                     
-                    # Store calculation inputs for potential second pass
-                    initial_calculation_inputs.append((employee.id, calculation_inputs))
-                    
-                    # Calculate initial bonus (without pool limit)
-                    result = self.calculation_engine.calculate_final_bonus(calculation_inputs)
-                    
-                    # Store initial result
-                    initial_results.append((employee.id, result))
-                    
-                    # Update totals for first pass
-                    total_base_salary += base_salary
-                    pre_scaling_bonus_total += result.final_bonus
-                    if result.cap_applied:
-                        capped_count += 1
+                    valid_employees.append(employee)
+                    initial_calculation_inputs.append(calculation_inputs)
                     
                     # Update batch upload progress periodically
                     if (i + 1) % chunk_size == 0 or i == len(employee_data) - 1:
                         batch_upload.processed_rows = i + 1
                         self.db.commit()
-                        logger.info(f"Processed {i + 1} of {len(employee_data)} employees")
+                        logger.info("Processed %d of %d employees", i + 1, len(employee_data))
                         
                         # Allow other tasks to run
                         await asyncio.sleep(0)
                     
                 except ValidationError as e:
-                    logger.error(f"Validation error for employee {employee.id}: {str(e)}")
+                    logger.error("Validation error for employee %s: %s", employee.id, e)
                     continue
                 except Exception as e:
-                    logger.error(f"Error calculating bonus for employee {employee.id}: {str(e)}")
+                    logger.error("Error calculating bonus for employee %s: %s", employee.id, e)
                     continue
             
-            logger.info(f"First pass completed. Processed {len(initial_results)} employees successfully")
+            # Validate the whole batch at once; only when it fails are rows
+            # checked one by one to drop (and log) the invalid ones
+            input_arrays = self.calculation_engine.inputs_to_arrays(initial_calculation_inputs)
+            try:
+                self.calculation_engine.validate_inputs_batch(input_arrays)
+            except ValidationError:
+                checked_employees = []
+                checked_inputs = []
+                for employee, calculation_inputs in zip(valid_employees, initial_calculation_inputs):
+                    try:
+                        self.calculation_engine.validate_inputs(calculation_inputs)
+                    except ValidationError as e:
+                        logger.error("Validation error for employee %s: %s", employee.id, e)
+                        continue
+                    checked_employees.append(employee)
+                    checked_inputs.append(calculation_inputs)
+                valid_employees, initial_calculation_inputs = checked_employees, checked_inputs
+                input_arrays = self.calculation_engine.inputs_to_arrays(initial_calculation_inputs)
+            
+            # Calculate every valid employee in one vectorized pass
+            batch = self.calculation_engine.calculate_final_bonus_batch(input_arrays)
+            total_base_salary = float(input_arrays["base_salary"].sum())
+            pre_scaling_bonus_total = float(batch["final_bonus"].sum())
+            
+            logger.info(f"First pass completed. Processed {len(valid_employees)} employees successfully")
             
             # Check if bonus pool limit should be applied
             pool_scaling_applied = False
@@ -332,70 +340,52 @@ class BatchCalculationService:
                 pool_scaling_factor = total_bonus_pool / pre_scaling_bonus_total
                 total_bonus_amount = total_bonus_pool
                 logger.info(f"Applying bonus pool limit: {total_bonus_pool} / {pre_scaling_bonus_total} = {pool_scaling_factor}")
+                # One factor for the whole batch, applied to the existing arrays
+                self.calculation_engine.apply_bonus_pool_limit_batch(
+                    batch,
+                    total_bonus_pool=total_bonus_pool,
+                    total_calculated_bonuses=pre_scaling_bonus_total
+                )
             
             # Process final results and create employee calculation records
             employee_results = []
             
             logger.info("Starting second pass calculation...")
             
-            for employee_id, initial_result in initial_results:
+            for index, (employee, calculation_inputs) in enumerate(zip(valid_employees, initial_calculation_inputs)):
                 try:
-                    # Get the employee data
-                    employee = next((e for e in employee_data if e.id == employee_id), None)
-                    if not employee:
-                        continue
-                    
-                    base_salary = float(employee.salary) if employee.salary is not None else 0
-                    
-                    # Apply team multiplier after caps and before any pool scaling
-                    final_result = initial_result
-                    if pool_scaling_applied:
-                        # Get the original calculation inputs
-                        _, calculation_inputs = next((item for item in initial_calculation_inputs if item[0] == employee_id), (None, None))
-                        if calculation_inputs:
-                            # Update inputs with pool limit parameters
-                            calculation_inputs.use_bonus_pool_limit = True
-                            calculation_inputs.total_bonus_pool = total_bonus_pool
-                            calculation_inputs.total_calculated_bonuses = pre_scaling_bonus_total
-                            
-                            # Recalculate with pool limit
-                            final_result = self.calculation_engine.calculate_final_bonus(calculation_inputs)
+                    base_salary = calculation_inputs.base_salary
+                    final_result = self.calculation_engine.batch_result_at(
+                        calculation_inputs,
+                        batch,
+                        index,
+                        total_bonus_pool=total_bonus_pool if pool_scaling_applied else None,
+                        total_calculated_bonuses=pre_scaling_bonus_total if pool_scaling_applied else None
+                    )
+                    bonus_amount = final_result.final_bonus
+                    calculation_breakdown = final_result.calculation_steps
 
                     # Apply team multiplier (banding) on the final capped (and possibly pool-scaled) bonus
                     if team_multiplier != 1.0:
-                        adjusted_bonus = final_result.final_bonus * team_multiplier
-                        # Rebuild a CalculationResult-like object with adjusted bonus and step note
-                        final_result = CalculationResult(
-                            target_bonus=final_result.target_bonus,
-                            weighted_performance=final_result.weighted_performance,
-                            pre_raf_bonus=final_result.pre_raf_bonus,
-                            initial_bonus=final_result.initial_bonus,
-                            base_salary_cap=final_result.base_salary_cap,
-                            mrt_cap=final_result.mrt_cap,
-                            final_bonus=adjusted_bonus,
-                            cap_applied=final_result.cap_applied,
-                            calculation_steps={**final_result.calculation_steps, 'team_multiplier': team_multiplier},
-                            pool_scaling_applied=final_result.pool_scaling_applied,
-                            pool_scaling_factor=final_result.pool_scaling_factor,
-                            pre_scaling_bonus=final_result.pre_scaling_bonus,
-                        )
+                        bonus_amount = bonus_amount * team_multiplier
+                        calculation_breakdown['team_multiplier'] = team_multiplier
                     
                     # Create employee calculation result
                     employee_result = EmployeeCalculationResult(
-                        employee_data_id=employee_id,
+                        employee_data_id=employee.id,
                         batch_result_id=batch_result.id,
                         base_salary=base_salary,
-                        bonus_percentage=final_result.final_bonus / base_salary if base_salary > 0 else 0,
-                        bonus_amount=final_result.final_bonus,
-                        total_compensation=base_salary + final_result.final_bonus,
-                        calculation_breakdown=final_result.calculation_steps
+                        bonus_percentage=bonus_amount / base_salary if base_salary > 0 else 0,
+                        bonus_amount=bonus_amount,
+                        total_compensation=base_salary + bonus_amount,
+                        calculation_breakdown=calculation_breakdown
                     )
                     
                     self.db.add(employee_result)
                     employee_results.append(employee_result)
                     
                 except Exception as e:
-                    logger.error(f"Error in second pass for employee {employee_id}: {str(e)}")
+                    logger.error("Error in second pass for employee %s: %s", employee.id, e)
                     continue
             
             logger.info(f"Second pass completed. Created {len(employee_results)} employee results")
@@ -3,6 +3,7 @@ Bonus Statement Service for generating professional PDF and XLSX statements.
 Task 20: Individual bonus statement generator leveraging calculation tape transparency.
 """
 import logging
+import time
 import io
 import os
 from typing import Dict, Any, Optional, List
@@ -49,7 +50,7 @@ class BonusStatementService:
             Dictionary with generated file data and metadata
         """
         try:
-            start_time = datetime.utcnow()
+            start_time = time.perf_counter()
             
             # 1. Gather statement data
             statement_data = self._gather_statement_data(run_id, employee_ref, request)
@@ -62,7 +63,7 @@ class BonusStatementService:
             else:
                 raise ValueError(f"Unsupported format: {request.format}")
             
-            generation_time = (datetime.utcnow() - start_time).total_seconds()
+            generation_time = time.perf_counter() - start_time
             
             return {
                 'success': True,
@@ -77,7 +78,7 @@ class BonusStatementService:
             
         except Exception as e:
             logger.error(f"Statement generation failed for employee {employee_ref}: {e}")
-            generation_time = (datetime.utcnow() - start_time).total_seconds()
+            generation_time = time.perf_counter() - start_time
             
             return {
                 'success': False,
@@ -3,6 +3,7 @@ Executive Reporting Service for dynamic pool analysis, trends, and executive sum
 Task 21: Build dynamic reporting system (pool vs target, trends) for fund management executives.
 """
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
@@ -41,7 +42,7 @@ class ExecutiveReportingService:
             Dictionary containing requested report data
         """
         try:
-            start_time = datetime.utcnow()
+            start_time = time.perf_counter()
             
             if request.report_type == 'pool_analysis':
                 data = self._generate_pool_analysis(request.filters, request.include_details)
@@ -54,7 +55,7 @@ class ExecutiveReportingService:
             else:
                 raise ValueError(f"Unsupported report type: {request.report_type}")
             
-            generation_time = (datetime.utcnow() - start_time).total_seconds()
+            generation_time = time.perf_counter() - start_time
             
             return {
                 'success': True,
@@ -67,7 +68,7 @@ class ExecutiveReportingService:
             
         except Exception as e:
             logger.error(f"Dynamic report generation failed: {e}")
-            generation_time = (datetime.utcnow() - start_time).total_seconds()
+            generation_time = time.perf_counter() - start_time
             
             return {
                 'success': False,
@@ -16,7 +16,7 @@ import pandas as pd
 from sqlalchemy.orm import Session
 
 from ..models import BatchUpload, EmployeeData
-from ..dal.batch_upload_dal import BatchUploadDAL
+from ..dal.batch_upload_dal import BatchUploadDAL, EmployeeDataDAL
 from ..schemas import EmployeeDataCreate
 
 logger = logging.getLogger(__name__)
@@ -69,6 +69,7 @@ class FileProcessingService:
     def __init__(self, db: Session):
         self.db = db
         self.batch_upload_dal = BatchUploadDAL(db)
+        self.employee_data_dal = EmployeeDataDAL(db)
     
     def validate_file(self, file_content: bytes, filename: str) -> FileValidationResult:
         """
@@ -316,21 +317,20 @@ class FileProcessingService:
             
             for row_number, row in enumerate(csv_reader, 1):
                 try:
-                    # Create employee data record (without committing)
+                    # Build the employee data row (inserted with its batch)
                     employee_data = self._create_employee_record_batch(upload_id, row_number, row)
                     employee_records.append(employee_data)
                     processed_count += 1
                     
                     # Batch insert and update progress every batch_size rows
                     if len(employee_records) >= batch_size or row_number == validation_result.total_rows:
-                        # Batch insert records
-                        self.db.add_all(employee_records)
-                        self.db.commit()
+                        # Batch insert records in one executemany
+                        self.employee_data_dal.bulk_create(employee_records)
                         logger.info(f"Committed batch of {len(employee_records)} records")
                         employee_records = []  # Clear batch
                         
-                        # Update progress
-                        self.batch_upload_dal.update_progress(
+                        # Update progress (written periodically, not per batch)
+                        self.batch_upload_dal.update_progress_batched(
                             upload_id, 
                             validation_result.total_rows, 
                             processed_count, 
@@ -350,16 +350,16 @@ class FileProcessingService:
             
             # Commit any remaining records
             if employee_records:
-                self.db.add_all(employee_records)
-                self.db.commit()
+                self.employee_data_dal.bulk_create(employee_records)
                 logger.info(f"Committed final batch of {len(employee_records)} records")
             
             # Final progress update
-            self.batch_upload_dal.update_progress(
+            self.batch_upload_dal.update_progress_batched(
                 upload_id, 
                 validation_result.total_rows, 
                 processed_count, 
-                failed_count
+                failed_count,
+                force=True
             )
             
             # Mark as completed
@@ -473,9 +473,9 @@ class FileProcessingService:
         
         return employee
     
-    def _create_employee_record_batch(self, upload_id: str, row_number: int, row_data: Dict[str, str]) -> EmployeeData:
+    def _create_employee_record_batch(self, upload_id: str, row_number: int, row_data: Dict[str, str]) -> Dict[str, Any]:
         """
-        Create an EmployeeData record from CSV row data (for batch processing - no individual commit).
+        Build the EmployeeData column values for a CSV row (for batch processing - no individual insert).
         
         Args:
             upload_id: ID of the batch upload
@@ -483,7 +483,8 @@ class FileProcessingService:
             row_data: Dictionary of column values
             
         Returns:
-            Created EmployeeData instance (not yet committed)
+            Column values for EmployeeDataDAL.bulk_create; column defaults
+            (id, created_at) are filled in on insert
         """
         # Extract standard fields
         employee_data = {
@@ -543,10 +544,7 @@ class FileProcessingService:
         employee_data['is_valid'] = is_valid
         employee_data['validation_errors'] = validation_errors if validation_errors else None
         
-        # Create database record (but don't commit yet)
-        employee = EmployeeData(**employee_data)
-        
-        return employee
+        return employee_data
     
     def get_template_csv(self, template_type: str = "standard") -> str:
         """
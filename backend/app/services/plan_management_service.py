@@ -7,8 +7,9 @@ from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
+from ..database import DB_AUDIT_TRIGGERS, SessionLocal, create_tenant_session, set_audit_actor
 from ..dal.platform_dal import BonusPlanDAL, InputCatalogDAL, AuditEventDAL
-from ..models import BonusPlan, PlanStep, PlanInput, InputCatalog
+from ..models import BonusPlan, PlanStep, PlanInput, InputCatalog, Tenant
 from ..schemas import (
     BonusPlanResponse, BonusPlanUpdate,
     PlanStepCreate, PlanStepResponse, PlanStepUpdate,
@@ -36,23 +37,39 @@ class PlanManagementService:
     
     def get_plans(self, status_filter: Optional[str] = None,
                   include_steps: bool = False, 
-                  include_inputs: bool = False) -> List[Dict[str, Any]]:
+                  include_inputs: bool = False,
+                  include_summary: bool = False) -> List[Dict[str, Any]]:
         """Get bonus plans with optional filtering and related data."""
-        plans = self.plan_dal.get_by_tenant(status=status_filter)
+        # Steps and inputs are eager-loaded for all plans at once; summaries
+        # (step/input/run counts) come back in the same query as the plans
+        if include_summary:
+            plans = self.plan_dal.get_by_tenant_with_summary(
+                status=status_filter, include_steps=include_steps, include_inputs=include_inputs
+            )
+        else:
+            plans = [
+                (plan, None) for plan in self.plan_dal.get_by_tenant(
+                    status=status_filter, include_steps=include_steps, include_inputs=include_inputs
+                )
+            ]
         
         result = []
-        for plan in plans:
+        for plan, summary in plans:
             plan_data = BonusPlanResponse.model_validate(plan).model_dump()
+            if summary is not None:
+                plan_data['summary'] = summary
             
             # Include steps if requested
             if include_steps:
-                steps = self._get_plan_steps_data(plan.id)
-                plan_data['steps'] = steps
+                steps = sorted(plan.plan_steps, key=lambda step: step.step_order)
+                plan_data['steps'] = [PlanStepResponse.model_validate(step).model_dump() for step in steps]
             
             # Include inputs if requested  
             if include_inputs:
-                inputs = self._get_plan_inputs_data(plan.id)
-                plan_data['inputs'] = inputs
+                plan_data['inputs'] = [
+                    self._plan_input_data(plan_input, plan_input.input_definition)
+                    for plan_input in plan.plan_inputs
+                ]
             
             result.append(plan_data)
         
@@ -61,6 +78,16 @@ class PlanManagementService:
     def get_plan(self, plan_id: str, include_steps: bool = False,
                  include_inputs: bool = False) -> Optional[Dict[str, Any]]:
         """Get a specific bonus plan with optional related data."""
+        if include_steps or include_inputs:
+            # Plan, steps and inputs in one query; drop what was not asked for
+            plan_data = self.plan_dal.get_plan_full(plan_id)
+            if plan_data is not None:
+                if not include_steps:
+                    del plan_data['steps']
+                if not include_inputs:
+                    del plan_data['inputs']
+            return plan_data
+        
         plan = self.plan_dal.get_by_id(plan_id)
         if not plan or plan.tenant_id != self.tenant_id:
             return None
@@ -123,26 +150,28 @@ class PlanManagementService:
             for field, value in update_fields.items():
                 setattr(plan, field, value)
             
+            set_audit_actor(self.db, updated_by)
             self.db.commit()
             
-            # Log update
-            new_values = {
-                'name': plan.name,
-                'status': plan.status,
-                'effective_from': plan.effective_from.isoformat() if plan.effective_from else None,
-                'effective_to': plan.effective_to.isoformat() if plan.effective_to else None,
-                'notes': plan.notes,
-                'plan_metadata': plan.plan_metadata
-            }
-            
-            self.audit_dal.log_event(
-                action='plan.update',
-                entity='bonus_plan',
-                entity_id=plan_id,
-                actor_user_id=updated_by,
-                before=old_values,
-                after=new_values
-            )
+            # Log update (the bonus_plans trigger records it on PostgreSQL)
+            if not DB_AUDIT_TRIGGERS:
+                new_values = {
+                    'name': plan.name,
+                    'status': plan.status,
+                    'effective_from': plan.effective_from.isoformat() if plan.effective_from else None,
+                    'effective_to': plan.effective_to.isoformat() if plan.effective_to else None,
+                    'notes': plan.notes,
+                    'plan_metadata': plan.plan_metadata
+                }
+                
+                self.audit_dal.log_event(
+                    action='plan.update',
+                    entity='bonus_plan',
+                    entity_id=plan_id,
+                    actor_user_id=updated_by,
+                    before=old_values,
+                    after=new_values
+                )
             
             return BonusPlanResponse.model_validate(plan)
             
@@ -169,6 +198,7 @@ class PlanManagementService:
             # Create plan step
             step = PlanStep(
                 plan_id=plan_id,
+                tenant_id=plan.tenant_id,
                 step_order=step_data.step_order,
                 name=step_data.name,
                 expr=step_data.expr,
@@ -372,6 +402,7 @@ class PlanManagementService:
             # Create plan input
             plan_input = PlanInput(
                 plan_id=plan_id,
+                tenant_id=plan.tenant_id,
                 input_id=input_data.input_id,
                 required=input_data.required,
                 source_mapping=input_data.source_mapping
@@ -412,20 +443,24 @@ class PlanManagementService:
             InputCatalog, PlanInput.input_id == InputCatalog.id
         ).filter(PlanInput.plan_id == plan_id).all()
         
-        result = []
-        for plan_input, input_catalog in plan_inputs:
-            input_data = PlanInputResponse.model_validate(plan_input).model_dump()
-            input_data['input_definition'] = {
-                'key': input_catalog.key,
-                'label': input_catalog.label,
-                'dtype': input_catalog.dtype,
-                'required': input_catalog.required,
-                'default_value': input_catalog.default_value,
-                'validation': input_catalog.validation
-            }
-            result.append(input_data)
-        
-        return result
+        return [
+            self._plan_input_data(plan_input, input_catalog)
+            for plan_input, input_catalog in plan_inputs
+        ]
+    
+    @staticmethod
+    def _plan_input_data(plan_input: PlanInput, input_catalog: InputCatalog) -> Dict[str, Any]:
+        """Plan input response dict with its input catalog details."""
+        input_data = PlanInputResponse.model_validate(plan_input).model_dump()
+        input_data['input_definition'] = {
+            'key': input_catalog.key,
+            'label': input_catalog.label,
+            'dtype': input_catalog.dtype,
+            'required': input_catalog.required,
+            'default_value': input_catalog.default_value,
+            'validation': input_catalog.validation
+        }
+        return input_data
     
     def remove_plan_input(self, input_id: str, removed_by: Optional[str] = None) -> bool:
         """Remove an input parameter from a bonus plan."""
@@ -908,7 +943,7 @@ class PlanManagementService:
                     'plan_status': plan.status,
                     'employees_processed': result['rows_processed'],
                     'step_results_persisted': True,
-                    'snapshot_hash': snapshot_hash,
+                    'snapshot_hash': snapshot_hash.hex(),
                     'reproducibility_guaranteed': True
                 })
             
@@ -977,4 +1012,38 @@ class PlanManagementService:
 
 def get_plan_management_service(db: Session, tenant_id: str) -> PlanManagementService:
     """Factory function to create PlanManagementService."""
-    return PlanManagementService(db, tenant_id)
\ No newline at end of file
+    return PlanManagementService(db, tenant_id)
+
+
+def warm_plan_expressions() -> int:
+    """
+    Pre-parse every stored plan step expression into the per-process
+    expression caches, so first evaluations skip parsing and validation.
+    
+    Steps are read tenant by tenant since plan tables are under RLS. Invalid
+    expressions are logged by SafeDSLParser.warmup rather than raised.
+    
+    Returns:
+        Number of distinct expressions warmed
+    """
+    db = SessionLocal()
+    try:
+        tenant_ids = [tenant_id for (tenant_id,) in db.query(Tenant.id).all()]
+    finally:
+        db.close()
+    
+    expressions = set()
+    for tenant_id in tenant_ids:
+        db = create_tenant_session(tenant_id)
+        try:
+            for expr, condition_expr in db.query(PlanStep.expr, PlanStep.condition_expr).all():
+                expressions.add(expr)
+                if condition_expr:
+                    expressions.add(condition_expr)
+        finally:
+            db.close()
+    
+    errors = SafeDSLParser.warmup(expressions)
+    if errors:
+        logger.warning(f"{len(errors)} plan expressions failed warm-up")
+    return len(expressions) - len(errors)
@@ -3,10 +3,11 @@ Platform Service for Multi-Tenant Operations
 Provides high-level business logic for platform transformation features.
 """
 import hashlib
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from ..database import DB_AUDIT_TRIGGERS, set_audit_actor
 from ..dal.platform_dal import TenantDAL, UserDAL, BonusPlanDAL, AuditEventDAL
 from ..models import Tenant, User, BonusPlan
 from ..schemas import (
@@ -27,10 +28,10 @@ class PlatformService:
         """Create a new tenant with an admin user."""
         try:
             tenant, user = self.tenant_dal.create_with_default_user(
-                tenant_data.name, admin_email, admin_name
+                tenant_data.name, admin_email, admin_name, commit=False
             )
             
-            # Log tenant creation
+            # Log tenant creation; this commits the tenant and admin with it
             self.audit_dal.log_event(
                 action='tenant.create',
                 entity='tenant',
@@ -136,6 +137,7 @@ class TenantService:
     def create_bonus_plan(self, plan_data: BonusPlanCreate, created_by: str = None) -> BonusPlanResponse:
         """Create a new bonus plan."""
         try:
+            set_audit_actor(self.db, created_by)
             plan = self.plan_dal.create({
                 'tenant_id': self.tenant_id,
                 'name': plan_data.name,
@@ -148,18 +150,19 @@ class TenantService:
                 'created_by': created_by
             })
             
-            # Log plan creation
-            self.audit_dal.log_event(
-                action='plan.create',
-                entity='bonus_plan',
-                entity_id=plan.id,
-                actor_user_id=created_by,
-                after={
-                    'name': plan.name,
-                    'version': plan.version,
-                    'status': plan.status
-                }
-            )
+            # Log plan creation (the bonus_plans trigger records it on PostgreSQL)
+            if not DB_AUDIT_TRIGGERS:
+                self.audit_dal.log_event(
+                    action='plan.create',
+                    entity='bonus_plan',
+                    entity_id=plan.id,
+                    actor_user_id=created_by,
+                    after={
+                        'name': plan.name,
+                        'version': plan.version,
+                        'status': plan.status
+                    }
+                )
             
             return BonusPlanResponse.model_validate(plan)
         except Exception as e:
@@ -178,9 +181,11 @@ class TenantService:
             if not plan or plan.tenant_id != self.tenant_id:
                 return False
             
+            set_audit_actor(self.db, locked_by)
             success = self.plan_dal.lock_plan(plan_id, locked_by)
-            if success:
-                # Log plan lock
+            
+            # Log plan lock (the bonus_plans trigger records it on PostgreSQL)
+            if success and not DB_AUDIT_TRIGGERS:
                 self.audit_dal.log_event(
                     action='plan.lock',
                     entity='bonus_plan',
@@ -195,8 +200,8 @@ class TenantService:
             self.db.rollback()
             raise e
     
-    def generate_snapshot_hash(self, plan_id: str) -> str:
-        """Generate a reproducible hash for a plan configuration."""
+    def generate_snapshot_hash(self, plan_id: str) -> bytes:
+        """Generate a reproducible hash (raw SHA-256 digest) for a plan configuration."""
         plan = self.plan_dal.get_by_id(plan_id)
         if not plan:
             raise ValueError(f"Plan {plan_id} not found")
@@ -211,34 +216,48 @@ class TenantService:
         }
         
         hash_string = str(hash_data)
-        return hashlib.sha256(hash_string.encode()).hexdigest()
+        return hashlib.sha256(hash_string.encode()).digest()
     
     def get_audit_trail(self, entity: str = None, entity_id: str = None, 
                        actor_user_id: str = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get audit trail with optional filters."""
         if entity and entity_id:
-            events = self.audit_dal.get_by_entity(entity, entity_id)
+            events = self.audit_dal.get_by_entity(entity, entity_id, limit=limit)
         elif actor_user_id:
-            events = self.audit_dal.get_by_actor(actor_user_id)
+            events = self.audit_dal.get_by_actor(actor_user_id, limit=limit)
         else:
             # Get recent events for the tenant
             events = self.db.query(self.audit_dal.model).filter(
                 self.audit_dal.model.tenant_id == self.tenant_id
             ).order_by(self.audit_dal.model.at.desc()).limit(limit).all()
         
-        return [
-            {
-                'id': event.id,
-                'action': event.action,
-                'entity': event.entity,
-                'entity_id': event.entity_id,
-                'actor_user_id': event.actor_user_id,
-                'at': event.at.isoformat(),
-                'before': event.before,
-                'after': event.after
-            }
-            for event in events[:limit]
-        ]
+        return [self._audit_event_dict(event) for event in events[:limit]]
+    
+    def iter_audit_trail(self, entity: str = None, entity_id: str = None,
+                         actor_user_id: str = None) -> Iterator[Dict[str, Any]]:
+        """Stream the whole audit trail of an entity or an actor, newest first."""
+        if entity and entity_id:
+            events = self.audit_dal.iter_by_entity(entity, entity_id)
+        elif actor_user_id:
+            events = self.audit_dal.iter_by_actor(actor_user_id)
+        else:
+            raise ValueError("entity and entity_id, or actor_user_id, are required")
+        
+        for event in events:
+            yield self._audit_event_dict(event)
+    
+    @staticmethod
+    def _audit_event_dict(event) -> Dict[str, Any]:
+        return {
+            'id': event.id,
+            'action': event.action,
+            'entity': event.entity,
+            'entity_id': event.entity_id,
+            'actor_user_id': event.actor_user_id,
+            'at': event.at.isoformat(),
+            'before': event.before,
+            'after': event.after
+        }
 
 
 def get_platform_service(db: Session) -> PlatformService:
@@ -59,7 +59,7 @@ class ReproducibilityValidationService:
             validation_report = {
                 'run_id': run_id,
                 'plan_id': plan_run.plan_id,
-                'stored_snapshot_hash': plan_run.snapshot_hash,
+                'stored_snapshot_hash': plan_run.snapshot_hash.hex(),
                 'validation_performed_at': datetime.utcnow().isoformat(),
                 'is_valid': True,
                 'validation_details': []
@@ -138,14 +138,14 @@ class ReproducibilityValidationService:
                 'run_1': {
                     'id': run1.id,
                     'plan_id': run1.plan_id,
-                    'snapshot_hash': run1.snapshot_hash,
+                    'snapshot_hash': run1.snapshot_hash.hex(),
                     'started_at': run1.started_at.isoformat(),
                     'status': run1.status
                 },
                 'run_2': {
                     'id': run2.id,
                     'plan_id': run2.plan_id,
-                    'snapshot_hash': run2.snapshot_hash,
+                    'snapshot_hash': run2.snapshot_hash.hex(),
                     'started_at': run2.started_at.isoformat(),
                     'status': run2.status
                 },
@@ -229,9 +229,10 @@ class ReproducibilityValidationService:
             hash_groups = {}
             for run in runs:
                 if run.snapshot_hash:
-                    if run.snapshot_hash not in hash_groups:
-                        hash_groups[run.snapshot_hash] = []
-                    hash_groups[run.snapshot_hash].append({
+                    hash_key = run.snapshot_hash.hex()
+                    if hash_key not in hash_groups:
+                        hash_groups[hash_key] = []
+                    hash_groups[hash_key].append({
                         'run_id': run.id,
                         'plan_id': run.plan_id,
                         'started_at': run.started_at.isoformat(),
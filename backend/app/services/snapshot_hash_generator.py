@@ -38,7 +38,7 @@ class SnapshotHashGenerator:
                                        plan_id: str, 
                                        employee_data_structure: Dict[str, str],
                                        precision_mode: str = 'balanced',
-                                       execution_metadata: Optional[Dict[str, Any]] = None) -> str:
+                                       execution_metadata: Optional[Dict[str, Any]] = None) -> bytes:
         """
         Generate comprehensive snapshot hash for plan execution.
         
@@ -49,7 +49,8 @@ class SnapshotHashGenerator:
             execution_metadata: Optional metadata about execution context
             
         Returns:
-            SHA-256 hash string representing the complete execution snapshot
+            Raw 32-byte SHA-256 digest of the complete execution snapshot
+            (stored as-is in plan_runs.snapshot_hash; use .hex() for display)
         """
         try:
             # 1. Get plan definition
@@ -160,7 +161,7 @@ class SnapshotHashGenerator:
         # Sort by column name for deterministic ordering
         return dict(sorted(data_structure.items()))
     
-    def _generate_deterministic_hash(self, snapshot_data: Dict[str, Any]) -> str:
+    def _generate_deterministic_hash(self, snapshot_data: Dict[str, Any]) -> bytes:
         """
         Generate a deterministic SHA-256 hash from snapshot data.
         
@@ -175,8 +176,8 @@ class SnapshotHashGenerator:
             default=str  # Handle datetime and other non-JSON types
         )
         
-        # Generate SHA-256 hash
-        return hashlib.sha256(json_string.encode('utf-8')).hexdigest()
+        # Raw digest: half the size of hex text in the column and its index
+        return hashlib.sha256(json_string.encode('utf-8')).digest()
     
     def verify_snapshot_reproducibility(self, 
                                       plan_id: str,
@@ -189,7 +190,7 @@ class SnapshotHashGenerator:
         
         Args:
             plan_id: Plan to verify
-            expected_hash: Hash from previous execution to compare against
+            expected_hash: Hex hash from previous execution to compare against
             employee_data_structure: Current employee data structure
             precision_mode: Current precision mode
             execution_metadata: Current execution metadata
@@ -204,11 +205,11 @@ class SnapshotHashGenerator:
             )
             
             # Compare hashes
-            is_reproducible = current_hash == expected_hash
+            is_reproducible = current_hash == bytes.fromhex(expected_hash)
             
             result = {
                 'is_reproducible': is_reproducible,
-                'current_hash': current_hash,
+                'current_hash': current_hash.hex(),
                 'expected_hash': expected_hash,
                 'verified_at': datetime.utcnow().isoformat()
             }
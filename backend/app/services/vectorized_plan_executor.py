@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 
 from ..expression_engine.dsl_parser import SafeDSLParser
 from .plan_dependency_validator import PlanDependencyValidator
-from ..models import RunStepResult
+from ..models import RunStepResult, PlanRun
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +63,7 @@ class VectorizedPlanExecutor:
         Returns:
             Dictionary containing execution results and performance metrics
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # 1. Validate plan dependencies
@@ -91,7 +91,7 @@ class VectorizedPlanExecutor:
             if self.precision_mode == 'balanced':
                 results_df = self._apply_precision_correction(results_df, ordered_steps)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             return {
                 'success': True,
@@ -109,7 +109,7 @@ class VectorizedPlanExecutor:
             }
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"Vectorized plan execution failed for plan {plan_id}: {e}")
             return {
                 'success': False,
@@ -182,11 +182,11 @@ class VectorizedPlanExecutor:
                         self._persist_step_results(db_session, run_id, step_name, result_df)
                     
                 except ValueError as ve:
-                    # Fallback to row-by-row evaluation for complex expressions
+                    # Fallback to NumPy column evaluation for complex expressions
                     if "too complex for vectorization" in str(ve):
-                        logger.debug(f"Step '{step_name}' too complex for vectorization, using row-by-row fallback")
-                        result_df = self._execute_step_row_by_row(result_df, step_name, step_expr, step_outputs, db_session, run_id)
-                        logger.debug(f"Step '{step_name}' executed successfully via row-by-row fallback")
+                        logger.debug(f"Step '{step_name}' too complex for Polars translation, using NumPy batch evaluation")
+                        result_df = self._execute_step_batch(result_df, step_name, step_expr, step_outputs)
+                        logger.debug(f"Step '{step_name}' executed successfully via batch evaluation")
                         
                         # Persist step results if session and run_id provided
                         if db_session and run_id:
@@ -199,47 +199,21 @@ class VectorizedPlanExecutor:
         
         return result_df
     
-    def _execute_step_row_by_row(self, df: pl.DataFrame, step_name: str, expression: str, outputs: List[str],
-                                db_session: Optional[Session] = None, run_id: Optional[str] = None) -> pl.DataFrame:
-        """Execute a single step using row-by-row evaluation as fallback for complex expressions."""
-        # Convert DataFrame to list of dictionaries
-        rows = df.to_dicts()
-        
-        # Process each row individually
-        for row in rows:
-            try:
-                # Convert numeric values to appropriate types for evaluation
-                evaluation_context = {}
-                for key, value in row.items():
-                    if isinstance(value, (int, float)) and not isinstance(value, bool):
-                        evaluation_context[key] = value  # Keep as float for fast mode
-                    else:
-                        evaluation_context[key] = value
-                
-                # Evaluate expression
-                result = self.parser.evaluate(expression, evaluation_context)
-                
-                # Convert Decimal result back to float for consistency with vectorized operations
-                if hasattr(result, 'is_finite'):  # Check if it's a Decimal
-                    result = float(result)
-                
-                # Add result to row for all output variables
-                if outputs:
-                    for output_name in outputs:
-                        row[output_name] = result
-                else:
-                    row[step_name] = result
-                        
-            except Exception as e:
-                raise ValueError(f"Row-by-row evaluation failed for step '{step_name}': {e}")
+    def _execute_step_batch(self, df: pl.DataFrame, step_name: str, expression: str,
+                            outputs: List[str]) -> pl.DataFrame:
+        """
+        Execute a single step the Polars translator cannot handle.
         
-        # Persist step results if session and run_id provided
-        if db_session and run_id:
-            temp_df = pl.DataFrame(rows)
-            self._persist_step_results(db_session, run_id, step_name, temp_df)
+        The parser evaluates the expression over whole columns with NumPy,
+        falling back to per-row float evaluation itself where it must.
+        """
+        try:
+            values = self.parser.evaluate_batch(expression, {name: df[name] for name in df.columns})
+        except Exception as e:
+            raise ValueError(f"Batch evaluation failed for step '{step_name}': {e}")
         
-        # Convert back to Polars DataFrame
-        return pl.DataFrame(rows)
+        # Add result for all output variables
+        return df.with_columns([pl.Series(name, values) for name in (outputs or [step_name])])
     
     def _execute_exact_precision(self, ordered_steps: List[Dict[str, Any]], df: pl.DataFrame,
                                 db_session: Optional[Session] = None, run_id: Optional[str] = None) -> pl.DataFrame:
@@ -485,6 +459,9 @@ class VectorizedPlanExecutor:
                 logger.warning(f"Employee reference column '{employee_ref_column}' not found in DataFrame")
                 return
             
+            # The run was flushed by the caller, so this is an identity-map hit
+            tenant_id = db_session.get(PlanRun, run_id).tenant_id
+            
             # Extract step results for each employee
             step_data = result_df.select([employee_ref_column, step_name]).to_dicts()
             
@@ -501,6 +478,7 @@ class VectorizedPlanExecutor:
                 
                 step_result = RunStepResult(
                     run_id=run_id,
+                    tenant_id=tenant_id,
                     employee_ref=employee_ref,
                     step_name=step_name,
                     value=json_value
@@ -0,0 +1,3 @@
+"""
+Celery tasks for the background job queue (see app.queue).
+"""
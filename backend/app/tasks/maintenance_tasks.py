@@ -0,0 +1,107 @@
+"""
+Scheduled maintenance tasks run by Celery workers instead of the API process.
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, List
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+
+from ..database import SessionLocal
+from ..queue import celery_app, CLEANUP_INTERVAL_SECONDS
+from ..redis_client import get_redis
+from ..services.data_retention_service import DataRetentionService
+
+logger = logging.getLogger(__name__)
+
+# Taken with SET NX so only one worker runs each scheduled cleanup when several
+# beat schedulers are deployed. Held for half an interval: long enough to cover
+# their near-simultaneous ticks, short enough not to swallow the next one.
+CLEANUP_LOCK_KEY = "lock:retention_cleanup"
+CLEANUP_LOCK_TTL = max(CLEANUP_INTERVAL_SECONDS // 2, 1)
+
+
+@celery_app.task(name='app.tasks.maintenance_tasks.cleanup_expired_data')
+def cleanup_expired_data(retention_hours: int = 72) -> Dict[str, Any]:
+    """Clean up expired sessions and data, unless another worker already did this interval."""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            if not redis.set(CLEANUP_LOCK_KEY, "1", nx=True, ex=CLEANUP_LOCK_TTL):
+                logger.info("Skipping periodic cleanup: already run this interval")
+                return {'skipped': True}
+        except RedisError as e:
+            logger.warning(f"Cleanup lock unavailable, running anyway: {e}")
+    
+    logger.info("Running periodic cleanup of expired data")
+    db = SessionLocal()
+    try:
+        cleanup_stats = DataRetentionService(db).cleanup_expired_data(retention_hours=retention_hours)
+        logger.info(f"Periodic cleanup completed: {cleanup_stats}")
+        return cleanup_stats
+    finally:
+        db.close()
+
+
+def _month_start(month: date, offset: int) -> date:
+    """First day of the month offset months after month's."""
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_audit_partition(db, start: date) -> bool:
+    """
+    Attach the audit_events partition for the month starting at start.
+    
+    Rows for that month already in audit_events_default (written before the
+    partition existed) are moved into it first; PostgreSQL refuses to add a
+    partition whose range the default partition still holds rows for. Runs in
+    one transaction under an advisory lock, so concurrent workers serialize.
+    Returns False when the partition already exists.
+    """
+    end = _month_start(start, 1)
+    name = f"audit_events_{start:%Y}m{start:%m}"
+    bounds = {'start': start, 'end': end}
+    try:
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('audit_events_partitions'))"))
+        if db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': name}).scalar():
+            db.rollback()
+            return False
+        
+        db.execute(text(f"CREATE TABLE {name} (LIKE audit_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        db.execute(text(
+            f'INSERT INTO {name} SELECT * FROM audit_events_default WHERE "at" >= :start AND "at" < :end'
+        ), bounds)
+        db.execute(text('DELETE FROM audit_events_default WHERE "at" >= :start AND "at" < :end'), bounds)
+        db.execute(text(
+            f"ALTER TABLE audit_events ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+
+
+@celery_app.task(name='app.tasks.maintenance_tasks.create_audit_partitions')
+def create_audit_partitions(months_ahead: int = 3) -> Dict[str, Any]:
+    """Create the monthly audit_events partitions for this month and the next months_ahead."""
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != 'postgresql':
+            # Only PostgreSQL partitions audit_events
+            return {'skipped': True}
+        
+        this_month = date.today().replace(day=1)
+        created: List[str] = []
+        for offset in range(months_ahead + 1):
+            start = _month_start(this_month, offset)
+            if _create_audit_partition(db, start):
+                created.append(f"audit_events_{start:%Y}m{start:%m}")
+        if created:
+            logger.info(f"Created audit_events partitions: {created}")
+        return {'created': created}
+    finally:
+        db.close()
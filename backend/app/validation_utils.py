@@ -376,7 +376,7 @@ def safe_calculate_bonus(inputs_dict: Dict[str, Any]) -> Dict[str, Any]:
         
         # Return success response with warnings if any
         return CalculationErrorHandler.create_success_response(
-            result.__dict__,
+            result.to_dict(),
             validation_result.warnings if validation_result.warnings else None
         )
         
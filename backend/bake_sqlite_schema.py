@@ -0,0 +1,68 @@
+"""
+SQLite Schema Bake Script
+
+Dumps the complete SQLite schema (tables, indexes and the alembic_version
+stamp) to a single SQL script. Throwaway databases for tests and local runs
+can then be created with one executescript() call instead of compiling every
+model or walking the migration chain on each refresh.
+
+Point DB_BAKED_SCHEMA at the generated file to have init_db() load it into
+an empty SQLite database. Re-run this script after changing models or adding
+a migration; production PostgreSQL still runs the migrations.
+"""
+
+import logging
+import sqlite3
+import sys
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+
+from app.database import Base
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Output file path
+SCHEMA_PATH = "./sqlite_schema.sql"
+
+
+def bake_schema(output_path: str = SCHEMA_PATH) -> bool:
+    """Build the schema in memory and write it out as a SQL script"""
+    try:
+        conn = sqlite3.connect(":memory:")
+        engine = create_engine("sqlite://", creator=lambda: conn)
+        Base.metadata.create_all(bind=engine)
+
+        # Stamp the baked database at the migration heads so a later
+        # `alembic upgrade heads` against it is a no-op
+        heads = ScriptDirectory.from_config(Config("alembic.ini")).get_heads()
+        conn.execute("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+        conn.executemany("INSERT INTO alembic_version (version_num) VALUES (?)", [(h,) for h in heads])
+
+        # Tables before indexes; rowid order keeps FK targets ahead of referrers
+        rows = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END, rowid"
+        ).fetchall()
+        statements = [row[0] for row in rows]
+        statements += [f"INSERT INTO alembic_version (version_num) VALUES ('{h}')" for h in heads]
+
+        with open(output_path, "w", encoding="utf-8") as fh:
+            fh.write(";\n".join(statements) + ";\n")
+
+        conn.close()
+        logger.info(f"Wrote {len(statements)} statements to {output_path} (heads: {', '.join(heads)})")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error baking schema: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = bake_schema(sys.argv[1] if len(sys.argv) > 1 else SCHEMA_PATH)
+    sys.exit(0 if success else 1)
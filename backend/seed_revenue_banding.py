@@ -33,11 +33,7 @@ def upsert_team(session, name: str, division: str | None = None, peer_group: str
 
 def upsert_revenue_history(session, team: Team, series: Dict[int, float], currency: str = "USD") -> None:
     for fiscal_year, revenue in series.items():
-        row = (
-            session.query(TeamRevenueHistory)
-            .filter(TeamRevenueHistory.team_id == team.id, TeamRevenueHistory.fiscal_year == fiscal_year)
-            .first()
-        )
+        row = session.get(TeamRevenueHistory, (team.id, int(fiscal_year)))
         if row:
             if float(row.revenue) != float(revenue) or row.currency != currency:
                 row.revenue = float(revenue)
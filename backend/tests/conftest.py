@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the backend tests.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app import models
+
+
+@pytest.fixture
+def engine():
+    """A fresh in-memory SQLite database with every table created."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """A Session on the test database."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def session_id(db):
+    """ID of a committed anonymous session to hang uploads and scenarios off."""
+    session = models.Session()
+    db.add(session)
+    db.commit()
+    return session.id
@@ -0,0 +1,314 @@
+"""
+Tests for the data access layer and the unit of work.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, text
+
+from app.dal import batch_upload_dal
+from app.dal.batch_upload_dal import BatchUploadDAL, EmployeeDataDAL
+from app.dal.scenario_dal import ScenarioDAL
+from app.dal.unit_of_work import UnitOfWork
+from app.models import BatchScenario, BatchUpload, EmployeeData, ScenarioAuditLog
+from app.schemas import BatchScenarioCreate, BatchScenarioUpdate
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the test database, recorded as they execute."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _create_uploads(db, session_id, count):
+    """Add count uploads created a minute apart, oldest first."""
+    start = datetime(2025, 1, 1)
+    uploads = [
+        BatchUpload(session_id=session_id, filename=f"upload-{i}.csv", original_filename=f"upload-{i}.csv",
+                    file_size=100, created_at=start + timedelta(minutes=i))
+        for i in range(count)
+    ]
+    db.add_all(uploads)
+    db.commit()
+    return uploads
+
+
+def _stored_progress(engine, upload_id):
+    """(total_rows, processed_rows, failed_rows) as committed in the database."""
+    with engine.connect() as conn:
+        return tuple(conn.execute(
+            select(BatchUpload.total_rows, BatchUpload.processed_rows, BatchUpload.failed_rows)
+            .where(BatchUpload.id == upload_id)
+        ).one())
+
+
+def _create_scenario(db, session_id, **values):
+    scenario = BatchScenarioCreate(session_id=session_id, name=values.get("name", "Base"),
+                                   description=values.get("description"),
+                                   parameters=values.get("parameters", {"pool": 1000}))
+    return ScenarioDAL(db).create_with_audit(scenario)
+
+
+def _audit_actions(db, scenario_id):
+    return sorted(db.execute(
+        select(ScenarioAuditLog.action).where(ScenarioAuditLog.scenario_id == scenario_id)
+    ).scalars())
+
+
+class TestIdentityCache:
+    def test_get_serves_repeat_lookups_from_the_cache(self, db, session_id, statements):
+        dal = BatchUploadDAL(db)
+        upload = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10)
+        dal.clear_cache()
+
+        first = dal.get(upload.id)
+        statements.clear()
+        assert dal.get(upload.id) is first
+        assert statements == []
+
+    def test_invalidate_makes_the_next_get_query_again(self, db, session_id, statements):
+        dal = BatchUploadDAL(db)
+        upload = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10)
+        upload_id = upload.id
+        db.execute(text("DELETE FROM batch_uploads WHERE id = :id"), {"id": upload_id})
+        db.commit()
+
+        # Still cached from create(), so the deleted row is returned without a query
+        statements.clear()
+        assert dal.get(upload_id) is upload
+        assert statements == []
+
+        dal.invalidate(upload_id)
+        assert dal.get(upload_id) is None
+        assert len(statements) == 1
+
+    def test_get_does_not_cache_missing_records(self, db, session_id):
+        dal = BatchUploadDAL(db)
+        assert dal.get("missing") is None
+        assert "missing" not in dal._cache
+
+    def test_delete_drops_the_record_from_the_cache(self, db, session_id):
+        dal = BatchUploadDAL(db)
+        upload = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10)
+        assert dal.delete(upload.id)
+        assert dal.get(upload.id) is None
+
+
+class TestKeysetPage:
+    def test_pages_walk_every_row_newest_first_without_overlap(self, db, session_id):
+        uploads = _create_uploads(db, session_id, 5)
+        dal = BatchUploadDAL(db)
+        query = db.query(BatchUpload).filter(BatchUpload.session_id == session_id)
+
+        seen = []
+        cursor = None
+        while True:
+            page = dal._page(query, BatchUpload.created_at, limit=2, cursor=cursor)
+            if not page:
+                break
+            assert len(page) <= 2
+            seen.extend(page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert [upload.id for upload in seen] == [upload.id for upload in reversed(uploads)]
+
+    def test_ties_on_the_sort_column_are_broken_by_id(self, db, session_id):
+        uploads = _create_uploads(db, session_id, 4)
+        for upload in uploads:
+            upload.created_at = datetime(2025, 1, 1)
+        db.commit()
+        dal = BatchUploadDAL(db)
+        query = db.query(BatchUpload)
+
+        first = dal._page(query, BatchUpload.created_at, limit=2)
+        second = dal._page(query, BatchUpload.created_at, limit=2,
+                           cursor=(first[-1].created_at, first[-1].id))
+
+        ids = [upload.id for upload in first + second]
+        assert ids == sorted((upload.id for upload in uploads), reverse=True)
+
+    def test_no_limit_returns_the_rest(self, db, session_id):
+        uploads = _create_uploads(db, session_id, 3)
+        dal = BatchUploadDAL(db)
+        newest = uploads[-1]
+
+        rest = dal._page(db.query(BatchUpload), BatchUpload.created_at, limit=None,
+                         cursor=(newest.created_at, newest.id))
+        assert [upload.id for upload in rest] == [uploads[1].id, uploads[0].id]
+
+
+class TestUpdateReturning:
+    def test_update_status_returns_and_caches_the_updated_row(self, db, session_id):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+        dal.clear_cache()
+
+        updated = dal.mark_as_failed(upload_id, "bad header")
+        assert updated.status == "failed"
+        assert updated.error_message == "bad header"
+        assert dal.get(upload_id) is updated
+
+        db.expire_all()
+        assert db.get(BatchUpload, upload_id).status == "failed"
+
+    def test_update_progress_is_committed(self, db, engine, session_id):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+
+        updated = dal.update_progress(upload_id, 10, 7, 1)
+        assert (updated.total_rows, updated.processed_rows, updated.failed_rows) == (10, 7, 1)
+        assert _stored_progress(engine, upload_id) == (10, 7, 1)
+
+    def test_missing_row_returns_none(self, db, session_id):
+        dal = BatchUploadDAL(db)
+        assert dal.update_status("missing", "completed") is None
+        assert "missing" not in dal._cache
+
+
+class TestBatchedProgress:
+    @pytest.fixture(autouse=True)
+    def no_time_based_flush(self, monkeypatch):
+        monkeypatch.setattr(batch_upload_dal, "PROGRESS_FLUSH_SECONDS", 3600.0)
+
+    def test_updates_below_the_row_threshold_are_queued(self, db, engine, session_id):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+
+        dal.update_progress_batched(upload_id, 1000, batch_upload_dal.PROGRESS_FLUSH_ROWS - 1)
+        assert _stored_progress(engine, upload_id) == (None, 0, 0)
+
+        dal.update_progress_batched(upload_id, 1000, batch_upload_dal.PROGRESS_FLUSH_ROWS, 2)
+        assert _stored_progress(engine, upload_id) == (1000, batch_upload_dal.PROGRESS_FLUSH_ROWS, 2)
+
+    def test_threshold_counts_from_the_last_write(self, db, engine, session_id):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+        rows = batch_upload_dal.PROGRESS_FLUSH_ROWS
+
+        dal.update_progress_batched(upload_id, 2000, rows)
+        dal.update_progress_batched(upload_id, 2000, rows + 1)
+        assert _stored_progress(engine, upload_id) == (2000, rows, 0)
+
+    def test_force_writes_at_once(self, db, engine, session_id):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+
+        dal.update_progress_batched(upload_id, 10, 10, 3, force=True)
+        assert _stored_progress(engine, upload_id) == (10, 10, 3)
+
+    def test_time_based_flush(self, db, engine, session_id, monkeypatch):
+        dal = BatchUploadDAL(db)
+        upload_id = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+        monkeypatch.setattr(batch_upload_dal, "PROGRESS_FLUSH_SECONDS", 0.0)
+
+        dal.update_progress_batched(upload_id, 10, 1)
+        assert _stored_progress(engine, upload_id) == (10, 1, 0)
+
+    def test_flush_progress_writes_the_latest_update_of_every_upload(self, db, engine, session_id):
+        dal = BatchUploadDAL(db)
+        first = dal.create_batch_upload(session_id, "a.csv", "a.csv", 10).id
+        second = dal.create_batch_upload(session_id, "b.csv", "b.csv", 10).id
+
+        dal.update_progress_batched(first, 10, 2)
+        dal.update_progress_batched(first, 10, 4, 1)
+        dal.update_progress_batched(second, 20, 5)
+        dal.flush_progress()
+
+        assert _stored_progress(engine, first) == (10, 4, 1)
+        assert _stored_progress(engine, second) == (20, 5, 0)
+        assert dal._pending_progress == {}
+
+    def test_flush_progress_without_queued_updates_does_nothing(self, db, statements):
+        dal = BatchUploadDAL(db)
+        statements.clear()
+        dal.flush_progress()
+        assert statements == []
+
+
+class TestEmployeeDataBulkCreate:
+    def test_inserts_every_row_with_defaults(self, db, session_id):
+        upload = BatchUploadDAL(db).create_batch_upload(session_id, "a.csv", "a.csv", 10)
+        rows = [
+            {"batch_upload_id": upload.id, "row_number": i, "employee_id": f"E{i}", "salary": 1000.0 * i}
+            for i in range(1, 4)
+        ]
+
+        EmployeeDataDAL(db).bulk_create(rows)
+
+        stored = db.query(EmployeeData).order_by(EmployeeData.row_number).all()
+        assert [employee.employee_id for employee in stored] == ["E1", "E2", "E3"]
+        assert all(employee.id for employee in stored)
+        assert len({employee.id for employee in stored}) == 3
+
+    def test_no_rows_is_a_no_op(self, db, statements):
+        statements.clear()
+        EmployeeDataDAL(db).bulk_create([])
+        assert statements == []
+
+
+class TestDuplicateScenario:
+    def test_copies_the_row_and_audits_the_copy(self, db, session_id):
+        original = _create_scenario(db, session_id, name="Base", description="Original",
+                                    parameters={"pool": 1000, "targets": [1, 2]})
+        dal = ScenarioDAL(db)
+
+        duplicate = dal.duplicate_scenario(original.id, "Copy")
+
+        assert duplicate.id != original.id
+        assert duplicate.session_id == session_id
+        assert duplicate.name == "Copy"
+        assert duplicate.description == "Copy of Base"
+        assert duplicate.parameters == {"pool": 1000, "targets": [1, 2]}
+        assert duplicate.created_at is not None
+        assert _audit_actions(db, duplicate.id) == ["created", "duplicated"]
+        assert db.query(BatchScenario).count() == 2
+
+    def test_keeps_a_given_description(self, db, session_id):
+        original = _create_scenario(db, session_id)
+        duplicate = ScenarioDAL(db).duplicate_scenario(original.id, "Copy", "Stretch targets")
+        assert duplicate.description == "Stretch targets"
+
+    def test_missing_scenario_returns_none(self, db, session_id):
+        assert ScenarioDAL(db).duplicate_scenario("missing", "Copy") is None
+        assert db.query(BatchScenario).count() == 0
+
+
+class TestUnitOfWork:
+    def test_commits_every_write_on_exit(self, db, engine, session_id):
+        original = _create_scenario(db, session_id)
+
+        with UnitOfWork(db) as uow:
+            uow.scenarios.update_with_audit(original.id, BatchScenarioUpdate(name="Renamed"), commit=False)
+            duplicate = uow.scenarios.duplicate_scenario(original.id, "Copy", commit=False)
+
+        with engine.connect() as conn:
+            names = set(conn.execute(select(BatchScenario.name)).scalars())
+        assert names == {"Renamed", "Copy"}
+        assert _audit_actions(db, original.id) == ["created", "updated"]
+        assert _audit_actions(db, duplicate.id) == ["created", "duplicated"]
+
+    def test_rolls_every_write_back_when_the_block_raises(self, db, session_id):
+        original = _create_scenario(db, session_id)
+
+        with pytest.raises(RuntimeError):
+            with UnitOfWork(db) as uow:
+                uow.scenarios.update_with_audit(original.id, BatchScenarioUpdate(name="Renamed"), commit=False)
+                uow.scenarios.duplicate_scenario(original.id, "Copy", commit=False)
+                raise RuntimeError("boom")
+
+        db.expire_all()
+        assert db.query(BatchScenario).one().name == "Base"
+        assert _audit_actions(db, original.id) == ["created"]
+
+    def test_dals_are_created_once_per_unit_of_work(self, db):
+        uow = UnitOfWork(db, tenant_id="tenant-1")
+        assert uow.scenarios is uow.scenarios
+        assert uow.scenarios.db is db
+        assert uow.audit.tenant_id == "tenant-1"
@@ -0,0 +1,146 @@
+"""
+Tests for the DSL expression sandbox and its evaluation paths.
+"""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.expression_engine.dsl_parser import (
+    SafeDSLParser,
+    ExpressionEvaluationError,
+    ExpressionSecurityError,
+    ExpressionValidationError,
+    is_expression_safe,
+    _compile_expression,
+    _float_function,
+    _numpy_function,
+    _opcodes,
+)
+
+
+BLOCKED_EXPRESSIONS = [
+    # Dunder and other attribute access
+    "x.__class__",
+    "().__class__.__bases__",
+    "x.__dict__",
+    "x.real",
+    # Calls to names outside the whitelist
+    "open('/etc/passwd')",
+    "__import__('os')",
+    "eval('1 + 1')",
+    "exec('x = 1')",
+    "getattr(x, 'real')",
+    "globals()",
+    # Private names
+    "_x + 1",
+    # Lambdas
+    "lambda: 1",
+    "(lambda: 1)()",
+    # Comprehensions and generator expressions
+    "[a for a in items]",
+    "{a for a in items}",
+    "{a: a for a in items}",
+    "sum(a for a in items)",
+]
+
+# Expression -> expected Decimal result for SAMPLE_VARIABLES
+SAMPLE_VARIABLES = {
+    'salary': Decimal('85000'),
+    'bonus': Decimal('12500.50'),
+    'rate': Decimal('0.15'),
+}
+
+SAMPLE_EXPRESSIONS = {
+    "salary * 0.1 + bonus": Decimal('85000') * Decimal('0.1') + Decimal('12500.50'),
+    "salary * (1 + rate) if salary > 50000 else salary": Decimal('85000') * Decimal('1.15'),
+    "max(salary, bonus) - min(salary, 2 * bonus)": Decimal('85000') - Decimal('25001.00'),
+    "abs(bonus - salary) / 4": Decimal('72499.50') / 4,
+    "pow(rate, 2) * salary": Decimal('0.0225') * Decimal('85000'),
+    "-salary + bonus * 3": Decimal('-85000') + Decimal('37501.50'),
+}
+
+
+@pytest.fixture
+def parser():
+    return SafeDSLParser()
+
+
+@pytest.mark.parametrize("expression", BLOCKED_EXPRESSIONS)
+def test_blocked_constructs_raise_on_evaluate(parser, expression):
+    with pytest.raises((ExpressionSecurityError, ExpressionValidationError)):
+        parser.evaluate(expression, {'x': 1, 'items': [1, 2]})
+
+
+@pytest.mark.parametrize("expression", BLOCKED_EXPRESSIONS)
+def test_blocked_constructs_raise_on_float_paths(parser, expression):
+    with pytest.raises((ExpressionSecurityError, ExpressionValidationError)):
+        parser.evaluate_float(expression, {'x': 1.0})
+    with pytest.raises((ExpressionSecurityError, ExpressionValidationError)):
+        parser.evaluate_batch(expression, {'x': [1.0, 2.0]})
+
+
+@pytest.mark.parametrize("expression", BLOCKED_EXPRESSIONS)
+def test_blocked_constructs_are_reported_unsafe(expression):
+    assert not is_expression_safe(expression)
+
+
+@pytest.mark.parametrize("expression, expected", SAMPLE_EXPRESSIONS.items())
+def test_evaluate_matches_decimal_baseline(parser, expression, expected):
+    assert parser.evaluate(expression, SAMPLE_VARIABLES) == expected
+
+
+@pytest.mark.parametrize("expression, expected", SAMPLE_EXPRESSIONS.items())
+def test_compiled_path_and_interpreter_agree(parser, expression, expected):
+    compiled = _compile_expression(expression)
+    assert compiled is not None
+    code, compiled_globals = compiled
+    assert eval(code, compiled_globals, dict(SAMPLE_VARIABLES)) == expected
+    assert parser._run(_opcodes(expression), dict(SAMPLE_VARIABLES)) == expected
+
+
+@pytest.mark.parametrize("expression, expected", SAMPLE_EXPRESSIONS.items())
+def test_float_paths_match_decimal_baseline(parser, expression, expected):
+    assert _float_function(expression) is not None
+    assert _numpy_function(expression) is not None
+
+    float_variables = {name: float(value) for name, value in SAMPLE_VARIABLES.items()}
+    assert parser.evaluate_float(expression, float_variables) == pytest.approx(float(expected))
+
+    doubled = {name: value * 2 for name, value in SAMPLE_VARIABLES.items()}
+    columns = {name: [float(value), float(doubled[name])] for name, value in SAMPLE_VARIABLES.items()}
+    expected_column = [float(expected), float(parser.evaluate(expression, doubled))]
+    np.testing.assert_allclose(parser.evaluate_batch(expression, columns), expected_column)
+
+
+def test_interpreter_handles_expressions_outside_compiled_subset(parser):
+    expression = "salary * rate >= bonus and bonus > 0"
+    assert _compile_expression(expression) is None
+    expected = Decimal('1') if Decimal('85000') * Decimal('0.15') >= Decimal('12500.50') else Decimal('0')
+    assert parser.evaluate(expression, SAMPLE_VARIABLES) == expected
+
+
+def test_evaluate_float_raises_like_evaluate_on_invalid_operations(parser):
+    variables = {'a': -8.0, 'b': 0.5}
+    with pytest.raises(ExpressionEvaluationError):
+        parser.evaluate('pow(a, b)', variables)
+    with pytest.raises(ExpressionEvaluationError):
+        parser.evaluate_float('pow(a, b)', variables)
+    assert parser.evaluate_float('pow(a, b)', {'a': 4.0, 'b': 0.5}) == 2.0
+
+
+@pytest.mark.parametrize("column", [
+    [1.0, None, 3.0],
+    [1.0, float('nan'), 3.0],
+    np.array([1.0, np.inf, 3.0]),
+])
+def test_evaluate_batch_rejects_missing_and_non_finite_inputs(parser, column):
+    with pytest.raises(ExpressionEvaluationError):
+        parser.evaluate_batch('a * 2', {'a': column})
+
+
+def test_evaluate_batch_rejects_non_finite_results(parser):
+    with pytest.raises(ExpressionEvaluationError):
+        parser.evaluate_batch('pow(a, b)', {'a': [-8.0, 4.0], 'b': [0.5, 0.5]})
+    with pytest.raises(ExpressionEvaluationError):
+        parser.evaluate_batch('a * 1e308 * 10', {'a': [1.0]})
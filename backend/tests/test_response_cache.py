@@ -0,0 +1,156 @@
+"""
+Tests for the Redis response cache middleware.
+"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.middleware import response_cache
+from app.middleware.response_cache import ResponseCacheMiddleware
+
+
+class FakeRedis:
+    """The slice of the redis-py client the middleware uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(response_cache, "get_redis", lambda: redis)
+    return redis
+
+
+@pytest.fixture
+def calls():
+    """How many times each route handler ran."""
+    return {"get": 0}
+
+
+@pytest.fixture
+def client(calls):
+    app = FastAPI()
+    plans = {"a": "draft", "b": "draft"}
+
+    @app.get("/plans/{plan_id}")
+    def read_plan(plan_id: str):
+        calls["get"] += 1
+        if plan_id not in plans:
+            raise HTTPException(status_code=404)
+        return {"id": plan_id, "status": plans[plan_id]}
+
+    @app.put("/plans/{plan_id}")
+    def update_plan(plan_id: str, status: str):
+        if status == "invalid":
+            raise HTTPException(status_code=400)
+        plans[plan_id] = status
+        return {"id": plan_id, "status": status}
+
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        routes={"/plans/{plan_id}": 60},
+        invalidations={"/plans/{plan_id}": "/plans/{plan_id}"},
+    )
+    return TestClient(app)
+
+
+def test_repeat_get_is_served_from_the_cache(redis, client, calls):
+    first = client.get("/plans/a")
+    second = client.get("/plans/a")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json() == {"id": "a", "status": "draft"}
+    assert second.headers["content-type"] == "application/json"
+    assert calls["get"] == 1
+
+
+def test_query_strings_are_cached_separately(redis, client, calls):
+    client.get("/plans/a?view=full")
+    assert client.get("/plans/a").headers["x-cache"] == "MISS"
+    assert client.get("/plans/a?view=full").headers["x-cache"] == "HIT"
+    assert calls["get"] == 2
+
+
+def test_error_responses_are_not_cached(redis, client, calls):
+    client.get("/plans/missing")
+    response = client.get("/plans/missing")
+
+    assert response.status_code == 404
+    assert response.headers["x-cache"] == "MISS"
+    assert calls["get"] == 2
+
+
+def test_write_drops_every_variant_of_its_path_only(redis, client, calls):
+    client.get("/plans/a")
+    client.get("/plans/a?view=full")
+    client.get("/plans/b")
+
+    assert client.put("/plans/a", params={"status": "locked"}).status_code == 200
+
+    response = client.get("/plans/a")
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["status"] == "locked"
+    assert client.get("/plans/a?view=full").headers["x-cache"] == "MISS"
+    assert client.get("/plans/b").headers["x-cache"] == "HIT"
+
+
+def test_invalidation_removes_the_variant_set(redis, client):
+    client.get("/plans/a")
+    variants_key = ResponseCacheMiddleware._variants_key("/plans/a")
+    assert len(redis.smembers(variants_key)) == 1
+
+    client.put("/plans/a", params={"status": "locked"})
+    assert redis.data == {}
+
+
+def test_failed_write_keeps_the_cache(redis, client):
+    client.get("/plans/a")
+
+    assert client.put("/plans/a", params={"status": "invalid"}).status_code == 400
+    assert client.get("/plans/a").headers["x-cache"] == "HIT"
+
+
+def test_requests_pass_through_without_redis(monkeypatch, client, calls):
+    monkeypatch.setattr(response_cache, "get_redis", lambda: None)
+
+    client.get("/plans/a")
+    response = client.get("/plans/a")
+    assert "x-cache" not in response.headers
+    assert client.put("/plans/a", params={"status": "locked"}).status_code == 200
+    assert calls["get"] == 2
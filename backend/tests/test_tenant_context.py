@@ -0,0 +1,94 @@
+"""
+Tests for the per-transaction RLS tenant context.
+"""
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import _apply_tenant_context
+
+
+@pytest.fixture
+def set_config_calls(engine):
+    """
+    (setting, value, is_local) of every set_config() call, recorded by a
+    SQLite stand-in for PostgreSQL's function.
+    """
+    calls = []
+
+    def set_config(setting, value, is_local):
+        calls.append((setting, value, is_local))
+        return value
+
+    def register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("set_config", 3, set_config)
+
+    event.listen(engine, "connect", register)
+    # StaticPool hands out the connection it already opened, so register there too
+    with engine.connect() as conn:
+        register(conn.connection.dbapi_connection, None)
+    return calls
+
+
+@pytest.fixture
+def make_session(engine, set_config_calls):
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    event.listen(factory, "after_begin", _apply_tenant_context)
+
+    def make(tenant_id=None):
+        session = factory()
+        if tenant_id is not None:
+            session.info['tenant_id'] = tenant_id
+        return session
+
+    yield make
+    event.remove(factory, "after_begin", _apply_tenant_context)
+
+
+def test_each_transaction_sets_a_transaction_local_tenant(make_session, set_config_calls):
+    session = make_session("tenant-1")
+
+    session.execute(text("SELECT 1"))
+    assert set_config_calls == [
+        ("app.tenant_id", "tenant-1", 1),
+        ("app.current_tenant_id", "tenant-1", 1),
+    ]
+
+    # Later statements in the same transaction reuse it
+    session.execute(text("SELECT 1"))
+    assert len(set_config_calls) == 2
+
+    session.commit()
+    session.execute(text("SELECT 1"))
+    assert len(set_config_calls) == 4
+    session.close()
+
+
+def test_context_is_set_again_after_a_rollback(make_session, set_config_calls):
+    session = make_session("tenant-1")
+    session.execute(text("SELECT 1"))
+    session.rollback()
+    set_config_calls.clear()
+
+    session.execute(text("SELECT 1"))
+    assert [value for _, value, _ in set_config_calls] == ["tenant-1", "tenant-1"]
+    session.close()
+
+
+def test_sessions_on_one_connection_get_their_own_tenant(make_session, set_config_calls):
+    first = make_session("tenant-1")
+    first.execute(text("SELECT 1"))
+    first.close()
+
+    second = make_session("tenant-2")
+    second.execute(text("SELECT 1"))
+    second.close()
+
+    assert [value for _, value, _ in set_config_calls] == ["tenant-1"] * 2 + ["tenant-2"] * 2
+
+
+def test_session_without_a_tenant_sets_an_empty_context(make_session, set_config_calls):
+    session = make_session()
+    session.execute(text("SELECT 1"))
+    assert [value for _, value, _ in set_config_calls] == ["", ""]
+    session.close()
@@ -11,7 +11,6 @@ export interface Team {
 }
 
 export interface TeamRevenueHistoryRow {
-  id: string
   team_id: string
   fiscal_year: number
   revenue: number